@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Data Pipeline Benchmarks
+Times each pipeline stage on seeded synthetic catalogs and flags regressions
+
+Stages (run in order, each on the previous stage's output):
+
+    collection      ComprehensiveMCPCollector._add_server for every entry
+    dedup           MCPDataCollector._add_server with 20% repeated sightings
+    categorization  generate_categories_with_counts()
+    ranking         CatalogIndex build + top-by-score page + popular servers
+    export          render_artifacts() (JSON, columnar, binary, trigram, critical)
+    validation      data_validation.check_servers()
+
+Each stage is timed without tracing (best of --repeat runs), then run once
+more under tracemalloc for its peak allocation. Results go to a JSON file;
+with --baseline, every (size, stage) is compared and the run fails when time
+or peak memory grows beyond --threshold (relative, ignoring changes below
+the absolute noise floors).
+
+Usage:
+    python benchmarks/run_benchmarks.py                          # 1k and 100k
+    python benchmarks/run_benchmarks.py --sizes 1k,100k,1m       # 1M needs several GB of RAM
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --sizes 1k,100k --output benchmarks/baseline.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCHMARK_DIR), 'code'))
+
+from catalog_index import CatalogIndex
+from comprehensive_mcp_collector import ComprehensiveMCPCollector
+from data_validation import check_servers
+from mcp_data_collector import MCPDataCollector
+from profiling import add_profile_arguments, run_profiled
+from synthetic_catalog import generate_catalog, generate_duplicates
+
+RESULTS_FORMAT = 'mcp-benchmark'
+RESULTS_VERSION = 1
+DEFAULT_SIZES = '1k,100k'
+DEFAULT_OUTPUT = os.path.join(BENCHMARK_DIR, 'results.json')
+DEFAULT_THRESHOLD = 0.25
+
+# Differences below these are treated as noise regardless of the ratio
+MIN_SECONDS_DELTA = 0.005
+MIN_BYTES_DELTA = 1024 * 1024
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().lower()
+    multiplier = {'k': 1000, 'm': 1000000}.get(text[-1:], 1)
+    return int(text.rstrip('km')) * multiplier
+
+
+def size_label(count: int) -> str:
+    if count % 1000000 == 0:
+        return f'{count // 1000000}m'
+    if count % 1000 == 0:
+        return f'{count // 1000}k'
+    return str(count)
+
+
+def _collection(state: Dict):
+    collector = ComprehensiveMCPCollector()
+    for entry in state['entries']:
+        collector._add_server(entry)
+    return collector
+
+
+def _dedup(state: Dict):
+    collector = MCPDataCollector()
+    for entry in state['entries'] + state['duplicates']:
+        collector._add_server(
+            name=entry['name'],
+            description=entry['description'],
+            category=entry['category'],
+            repository_link=entry['repository_link'],
+            source=entry.get('source', 'synthetic'),
+        )
+    return collector
+
+
+def _categorization(state: Dict):
+    return state['collection'].generate_categories_with_counts()
+
+
+def _ranking(state: Dict):
+    collector = state['collection']
+    index = CatalogIndex(collector.mcp_servers)
+    return index.query(sort='score', descending=True, limit=20), collector._get_popular_servers()
+
+
+def _export(state: Dict):
+    return state['collection'].render_artifacts()
+
+
+def _validation(state: Dict):
+    return check_servers(list(state['collection'].mcp_servers.values()))
+
+
+STAGES: List[tuple] = [
+    ('collection', _collection),
+    ('dedup', _dedup),
+    ('categorization', _categorization),
+    ('ranking', _ranking),
+    ('export', _export),
+    ('validation', _validation),
+]
+
+
+def _measure(stage: Callable[[Dict], object], state: Dict, repeat: int, memory: bool) -> tuple:
+    best = None
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        result = stage(state)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            stage(state)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result, best, peak
+
+
+def run_size(count: int, seed: int, repeat: int, memory: bool, log=print) -> Dict:
+    """Run every stage on a ``count``-server catalog; returns per-stage metrics"""
+    state = {'entries': generate_catalog(count, seed)}
+    state['duplicates'] = generate_duplicates(state['entries'], seed=seed)
+
+    stages = {}
+    for name, stage in STAGES:
+        result, seconds, peak = _measure(stage, state, repeat, memory)
+        state[name] = result
+        stages[name] = {'seconds': round(seconds, 6), 'peak_bytes': peak}
+        peak_text = f'{peak / 1024 / 1024:9.1f} MB' if peak is not None else ''
+        log(f'  {name:<15} {seconds * 1000:10.1f} ms {peak_text}')
+    return {'servers': count, 'stages': stages}
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Human-readable regressions of ``results`` against ``baseline``"""
+    regressions = []
+    for label, current in results['results'].items():
+        previous = baseline.get('results', {}).get(label)
+        if previous is None:
+            continue
+        for stage, metrics in current['stages'].items():
+            before = previous['stages'].get(stage)
+            if before is None:
+                continue
+            checks = [('seconds', MIN_SECONDS_DELTA, 's'), ('peak_bytes', MIN_BYTES_DELTA, 'B')]
+            for metric, floor, unit in checks:
+                old, new = before.get(metric), metrics.get(metric)
+                if old is None or new is None:
+                    continue
+                if new > old * (1 + threshold) and new - old > floor:
+                    regressions.append(
+                        f'{label}/{stage} {metric}: {old:g}{unit} -> {new:g}{unit} '
+                        f'(+{(new / old - 1) * 100 if old else float("inf"):.0f}%)')
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the MCP data pipeline on synthetic catalogs')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help='comma-separated, e.g. 1k,100k,1m')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=1, help='timed runs per stage (best is kept)')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc pass')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='results JSON file')
+    parser.add_argument('--baseline', help='results file to compare against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='allowed relative growth before a stage counts as regressed')
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    results = {
+        'format': RESULTS_FORMAT,
+        'version': RESULTS_VERSION,
+        'seed': args.seed,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': {},
+    }
+    for count in [parse_size(size) for size in args.sizes.split(',')]:
+        label = size_label(count)
+        print(f'{label} servers (seed {args.seed})')
+        results['results'][label] = run_size(count, args.seed, args.repeat, not args.no_memory)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    print(f'Results written to {args.output}')
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f'❌ {len(regressions)} regression(s) over {args.threshold:.0%} vs {args.baseline}:')
+        for line in regressions:
+            print(f'  {line}')
+        return 1
+    print(f'✅ No regressions over {args.threshold:.0%} vs {args.baseline}')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_profiled(main))
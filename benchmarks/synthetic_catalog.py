@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Synthetic Catalog Generator
+Seeded, reproducible server lists in the collectors' raw input format
+
+generate_catalog(count, seed) returns source entries shaped like the lists in
+ComprehensiveMCPCollector.source_server_list(); the same (count, seed) pair
+always yields the same entries, on any machine and Python version, so timings
+from different runs are comparable.
+
+generate_duplicates() returns extra sightings of existing servers (same name,
+different source/description), for the merge path in
+MCPDataCollector._add_server.
+"""
+
+import random
+from typing import Dict, List
+
+CATEGORIES = [
+    'File Systems', 'Databases', 'Development Tools', 'Web Scraping', 'AI Services',
+    'Communication', 'Cloud Services', 'Search & Web', 'Productivity', 'Finance',
+    'Media', 'Note Taking', 'DevOps', 'Security', 'Analytics', 'Cloud Storage',
+]
+
+# Skewed like the real catalog: few popular servers, many obscure ones
+POPULARITY_WEIGHTS = [('high', 1), ('medium', 3), ('low', 6)]
+
+_PREFIXES = ['Open', 'Quick', 'Smart', 'Cloud', 'Deep', 'Meta', 'Hyper', 'Micro', 'Auto', 'Data']
+_NOUNS = ['Postgres', 'Redis', 'Slack', 'GitHub', 'Notion', 'Stripe', 'Docker', 'Jira',
+          'Figma', 'Spotify', 'Kafka', 'Mongo', 'Drive', 'Search', 'Vector', 'Browser']
+_VERBS = ['Query', 'Manage', 'Automate', 'Search', 'Inspect', 'Sync', 'Monitor', 'Analyze']
+_OBJECTS = ['databases', 'repositories', 'messages', 'documents', 'payments', 'files',
+            'pipelines', 'dashboards', 'issues', 'playlists', 'embeddings', 'web pages']
+_CREATORS = ['Anthropic', 'Community', 'Microsoft', 'Google', 'Cloudflare', 'Stripe',
+             'Independent', 'Open Source Collective']
+_INSTALLS = ['npx -y @{scope}/{slug}', 'pip install {slug}', 'uvx {slug}',
+             'git clone https://github.com/{scope}/{slug}', 'go install github.com/{scope}/{slug}@latest']
+
+
+def _base36(number: int) -> str:
+    digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+    text = ''
+    while True:
+        number, remainder = divmod(number, 36)
+        text = digits[remainder] + text
+        if not number:
+            return text
+
+
+def generate_catalog(count: int, seed: int = 0) -> List[Dict]:
+    """``count`` raw server entries with unique names"""
+    rng = random.Random(seed)
+    levels = [level for level, weight in POPULARITY_WEIGHTS for _ in range(weight)]
+    entries = []
+    for number in range(count):
+        name = f'{rng.choice(_PREFIXES)} {rng.choice(_NOUNS)} {_base36(number)}'
+        slug = name.lower().replace(' ', '-')
+        scope = rng.choice(_CREATORS).lower().replace(' ', '-')
+        description = (f'{rng.choice(_VERBS)} {rng.choice(_OBJECTS)} and '
+                       f'{rng.choice(_VERBS).lower()} {rng.choice(_OBJECTS)} through {name}')
+        entries.append({
+            'name': name,
+            'description': description,
+            'category': rng.choice(CATEGORIES),
+            'repository_link': f'https://github.com/{scope}/{slug}',
+            'creator': rng.choice(_CREATORS),
+            'installation': rng.choice(_INSTALLS).format(scope=scope, slug=slug),
+            'documentation': f'https://github.com/{scope}/{slug}#readme',
+            'popularity': rng.choice(levels),
+        })
+    return entries
+
+
+def generate_duplicates(entries: List[Dict], rate: float = 0.2, seed: int = 0) -> List[Dict]:
+    """Re-sightings of ``rate`` of the entries from another source, some with longer descriptions"""
+    rng = random.Random(seed + 1)
+    duplicates = []
+    for entry in rng.sample(entries, int(len(entries) * rate)):
+        duplicates.append(dict(
+            entry,
+            description=entry['description'] + (' with extended documentation' if rng.random() < 0.5 else ''),
+            source=rng.choice(['awesome-mcp-servers', 'modelcontextprotocol.io/examples', 'community']),
+        ))
+    return duplicates
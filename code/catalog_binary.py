@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Binary Catalog Index
+Memory-mapped catalog file for fast single-record lookups from Python tools
+
+Reading one server out of comprehensive_mcp_directory.json means parsing the
+whole document. The binary catalog instead keeps every record as its own
+compact JSON blob, with a sorted key index and a category index in front of
+it, so a reader can mmap the file and decode only the record it asks for.
+
+File layout (all integers little-endian):
+
+    header          fixed HEADER_STRUCT, see below
+    offset table    count x (record offset u32, record length u32,
+                    key offset u32, key length u32), one per record in
+                    export order
+    key index       count x (key offset u32, key length u32, record no u32),
+                    sorted by UTF-8 key bytes
+    category index  categories x (name offset u32, name length u32,
+                    first posting u32, posting count u32), sorted by name
+    postings        record numbers (u32) grouped by category
+    string blob     packed UTF-8: keys, category names, record JSON
+
+Blob offsets are relative to the start of the string blob.
+"""
+
+import json
+import mmap
+import os
+import struct
+from typing import Dict, Iterator, List, Optional
+
+MAGIC = b'MCPB'
+# Version 2 added the key offset/length to each offset table entry
+FORMAT_VERSION = 2
+
+# magic, version, reserved, record count, category count, posting count,
+# offset table, key index, category index, postings, blob start, blob size
+HEADER_STRUCT = struct.Struct('<4sHHIIIQQQQQQ')
+OFFSET_ENTRY = struct.Struct('<IIII')
+KEY_ENTRY = struct.Struct('<III')
+CATEGORY_ENTRY = struct.Struct('<IIII')
+POSTING = struct.Struct('<I')
+
+
+class BinaryCatalogError(Exception):
+    """Raised when a file is not a readable binary catalog"""
+
+
+def encode_binary_catalog(servers: Dict[str, Dict]) -> bytes:
+    """Encode ``servers`` as binary catalog bytes"""
+    keys = list(servers)
+    blob = bytearray()
+
+    def pack(data: bytes):
+        offset = len(blob)
+        blob.extend(data)
+        return offset, len(data)
+
+    key_slots = [pack(key.encode('utf-8')) for key in keys]
+    record_slots = [
+        pack(json.dumps(servers[key], separators=(',', ':'), ensure_ascii=False).encode('utf-8'))
+        for key in keys
+    ]
+
+    postings_by_category: Dict[str, List[int]] = {}
+    for record_no, key in enumerate(keys):
+        category = servers[key].get('category') or ''
+        postings_by_category.setdefault(category, []).append(record_no)
+
+    category_names = sorted(postings_by_category, key=lambda name: name.encode('utf-8'))
+    category_slots = [pack(name.encode('utf-8')) for name in category_names]
+
+    key_order = sorted(range(len(keys)), key=lambda i: keys[i].encode('utf-8'))
+
+    offset_table = b''.join(OFFSET_ENTRY.pack(*record_slots[i], *key_slots[i]) for i in range(len(keys)))
+    key_index = b''.join(KEY_ENTRY.pack(*key_slots[i], i) for i in key_order)
+
+    category_index = bytearray()
+    postings = bytearray()
+    posting_count = 0
+    for name, slot in zip(category_names, category_slots):
+        members = postings_by_category[name]
+        category_index += CATEGORY_ENTRY.pack(slot[0], slot[1], posting_count, len(members))
+        for record_no in members:
+            postings += POSTING.pack(record_no)
+        posting_count += len(members)
+
+    offset_table_at = HEADER_STRUCT.size
+    key_index_at = offset_table_at + len(offset_table)
+    category_index_at = key_index_at + len(key_index)
+    postings_at = category_index_at + len(category_index)
+    blob_at = postings_at + len(postings)
+
+    header = HEADER_STRUCT.pack(
+        MAGIC, FORMAT_VERSION, 0,
+        len(keys), len(category_names), posting_count,
+        offset_table_at, key_index_at, category_index_at, postings_at,
+        blob_at, len(blob)
+    )
+
+    return b''.join((header, offset_table, key_index, bytes(category_index), bytes(postings), bytes(blob)))
+
+
+def write_binary_catalog(servers: Dict[str, Dict], output_file: str) -> int:
+    """Write ``servers`` as a binary catalog and return the file size"""
+    data = encode_binary_catalog(servers)
+    with open(output_file, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+
+class BinaryCatalog:
+    """mmap-backed reader; lookups are binary searches over the mapped file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise BinaryCatalogError(f'Empty catalog file: {path}')
+
+        if len(self._map) < HEADER_STRUCT.size:
+            self.close()
+            raise BinaryCatalogError(f'Truncated catalog header: {path}')
+
+        (magic, version, _reserved,
+         self.count, self.category_count, self._posting_count,
+         self._offset_table_at, self._key_index_at, self._category_index_at,
+         self._postings_at, self._blob_at, blob_size) = HEADER_STRUCT.unpack_from(self._map, 0)
+
+        if magic != MAGIC:
+            self.close()
+            raise BinaryCatalogError(f'Not a binary catalog: {path}')
+        if version != FORMAT_VERSION:
+            self.close()
+            raise BinaryCatalogError(f'Unsupported catalog version {version}: {path}')
+        if self._blob_at + blob_size > len(self._map):
+            self.close()
+            raise BinaryCatalogError(f'Truncated catalog blob: {path}')
+
+        self._view = memoryview(self._map)
+
+    def close(self) -> None:
+        """Unmap the file; views returned by raw() must be released first"""
+        view = getattr(self, '_view', None)
+        if view is not None:
+            view.release()
+            self._view = None
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, key: str) -> bool:
+        return self._find(key) is not None
+
+    def __getitem__(self, key: str) -> Dict:
+        record_no = self._find(key)
+        if record_no is None:
+            raise KeyError(key)
+        return self.record_at(record_no)
+
+    def _blob(self, offset: int, length: int) -> memoryview:
+        start = self._blob_at + offset
+        return self._view[start:start + length]
+
+    def _key_entry(self, position: int):
+        return KEY_ENTRY.unpack_from(self._map, self._key_index_at + position * KEY_ENTRY.size)
+
+    def _find(self, key: str) -> Optional[int]:
+        target = key.encode('utf-8')
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            key_offset, key_length, record_no = self._key_entry(middle)
+            probe = bytes(self._blob(key_offset, key_length))
+            if probe == target:
+                return record_no
+            if probe < target:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def raw(self, key: str) -> Optional[memoryview]:
+        """Zero-copy view of a record's JSON bytes, or None if absent"""
+        record_no = self._find(key)
+        if record_no is None:
+            return None
+        offset, length, _, _ = self._offset_entry(record_no)
+        return self._blob(offset, length)
+
+    def _offset_entry(self, record_no: int):
+        if not 0 <= record_no < self.count:
+            raise IndexError(record_no)
+        return OFFSET_ENTRY.unpack_from(self._map, self._offset_table_at + record_no * OFFSET_ENTRY.size)
+
+    def record_at(self, record_no: int) -> Dict:
+        offset, length, _, _ = self._offset_entry(record_no)
+        return json.loads(bytes(self._blob(offset, length)))
+
+    def key_at(self, record_no: int) -> str:
+        _, _, key_offset, key_length = self._offset_entry(record_no)
+        return str(self._blob(key_offset, key_length), 'utf-8')
+
+    def get(self, key: str, default=None):
+        record_no = self._find(key)
+        return default if record_no is None else self.record_at(record_no)
+
+    def keys(self) -> Iterator[str]:
+        """Keys in sorted order"""
+        for position in range(self.count):
+            key_offset, key_length, _ = self._key_entry(position)
+            yield str(self._blob(key_offset, key_length), 'utf-8')
+
+    def categories(self) -> List[str]:
+        names = []
+        for position in range(self.category_count):
+            name_offset, name_length, _, _ = CATEGORY_ENTRY.unpack_from(
+                self._map, self._category_index_at + position * CATEGORY_ENTRY.size)
+            names.append(str(self._blob(name_offset, name_length), 'utf-8'))
+        return names
+
+    def category_counts(self) -> Dict[str, int]:
+        """Server count per category, read from the index without decoding records"""
+        counts = {}
+        for position in range(self.category_count):
+            name_offset, name_length, _, count = CATEGORY_ENTRY.unpack_from(
+                self._map, self._category_index_at + position * CATEGORY_ENTRY.size)
+            counts[str(self._blob(name_offset, name_length), 'utf-8')] = count
+        return counts
+
+    def _category_postings(self, category: str) -> List[int]:
+        target = category.encode('utf-8')
+        low, high = 0, self.category_count
+        while low < high:
+            middle = (low + high) // 2
+            name_offset, name_length, first, count = CATEGORY_ENTRY.unpack_from(
+                self._map, self._category_index_at + middle * CATEGORY_ENTRY.size)
+            probe = bytes(self._blob(name_offset, name_length))
+            if probe == target:
+                start = self._postings_at + first * POSTING.size
+                return [POSTING.unpack_from(self._map, start + i * POSTING.size)[0]
+                        for i in range(count)]
+            if probe < target:
+                low = middle + 1
+            else:
+                high = middle
+        return []
+
+    def by_category(self, category: str) -> List[Dict]:
+        """All records in ``category``, in export order"""
+        return [self.record_at(record_no) for record_no in self._category_postings(category)]
+
+    def keys_in_category(self, category: str) -> List[str]:
+        """Keys in ``category``, in export order, without decoding any record"""
+        return [self.key_at(record_no) for record_no in self._category_postings(category)]
+
+
+def open_catalog(path: str) -> Optional[BinaryCatalog]:
+    """Open ``path`` if it exists, returning None when there is no usable catalog
+
+    A file from another format version (or a damaged one) also yields None, so
+    callers fall back to the JSON directory until the collector rebuilds it.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        return BinaryCatalog(path)
+    except BinaryCatalogError:
+        return None
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Columnar Catalog Format
+Column-oriented encoding of the MCP server directory with a shared string table
+
+The row-oriented ``servers`` dict repeats every field name and the same
+category, creator, source and date strings once per server. The columnar
+layout stores one array per field instead; low-cardinality fields hold
+integer references into a single string table.
+
+Layout:
+    {
+        "format": "mcp-columnar",
+        "version": 1,
+        "count": 46,
+        "keys": ["aws_kb_retrieval", ...],
+        "strings": ["Cloud Services", "Anthropic", ...],
+        "interned": ["category", "creator_maintainer", ...],
+        "columns": {"name": [...], "category": [0, 0, 3, ...], ...},
+        "absent": {"sources": [0, 1, 2, ...]}
+    }
+
+Nested dicts (``popularity_indicators``) are flattened into dotted column
+names; an empty nested dict is kept whole under its own name. ``absent``
+lists the rows that do not carry a field at all, so that missing fields and
+explicit ``None`` values survive a round trip.
+
+A field is listed in ``interned`` only when every value it holds is a string
+(or, for list fields, a list of strings), so an integer in an interned column
+is always a string table reference and never a stored number.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional
+
+FORMAT_NAME = 'mcp-columnar'
+FORMAT_VERSION = 1
+
+# Scalar fields whose values repeat across servers and are stored as references
+INTERNED_FIELDS = {
+    'category',
+    'creator_maintainer',
+    'source',
+    'last_updated',
+    'installation_method',
+    'popularity_indicators.level',
+}
+
+# List-of-string fields whose items are stored as references
+INTERNED_LIST_FIELDS = {
+    'use_cases',
+    'documentation_links',
+    'sources',
+}
+
+
+def _flatten(record: Dict) -> Dict[str, Any]:
+    """Flatten one level of nested dicts into dotted field names"""
+    flat = {}
+    for field, value in record.items():
+        if isinstance(value, dict) and value:
+            for sub_field, sub_value in value.items():
+                flat[f'{field}.{sub_field}'] = sub_value
+        else:
+            flat[field] = value
+    return flat
+
+
+def _internable(field: str, values: List[Any]) -> bool:
+    """Whether every value of ``field`` can be replaced by a string reference"""
+    if field in INTERNED_FIELDS:
+        return all(value is None or isinstance(value, str) for value in values)
+    if field in INTERNED_LIST_FIELDS:
+        return all(value is None or (isinstance(value, list) and
+                                     all(isinstance(item, str) for item in value))
+                   for value in values)
+    return False
+
+
+def encode_columnar(servers: Dict[str, Dict]) -> Dict:
+    """Encode a row-oriented servers dict into the columnar layout"""
+    keys = list(servers)
+    rows = [_flatten(servers[key]) for key in keys]
+
+    # Column order follows first appearance so decoded records keep field order
+    fields: List[str] = []
+    seen = set()
+    for row in rows:
+        for field in row:
+            if field not in seen:
+                seen.add(field)
+                fields.append(field)
+
+    strings: List[str] = []
+    string_ids: Dict[str, int] = {}
+
+    def intern(value):
+        if value is None:
+            return None
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value)
+        return string_ids[value]
+
+    columns: Dict[str, List] = {}
+    absent: Dict[str, List[int]] = {}
+    interned = []
+
+    for field in fields:
+        column = []
+        missing = []
+        for index, row in enumerate(rows):
+            if field not in row:
+                missing.append(index)
+                column.append(None)
+            else:
+                column.append(row[field])
+
+        # A column holding any non-string value is stored as is
+        if _internable(field, column):
+            if field in INTERNED_FIELDS:
+                column = [intern(value) for value in column]
+            else:
+                column = [None if value is None else [intern(item) for item in value]
+                          for value in column]
+            interned.append(field)
+
+        columns[field] = column
+        if missing:
+            absent[field] = missing
+
+    return {
+        'format': FORMAT_NAME,
+        'version': FORMAT_VERSION,
+        'count': len(keys),
+        'keys': keys,
+        'strings': strings,
+        'interned': interned,
+        'columns': columns,
+        'absent': absent,
+    }
+
+
+class ColumnarCatalog:
+    """Read-only view over a columnar block that rebuilds records on demand"""
+
+    def __init__(self, block: Dict):
+        if block.get('format') != FORMAT_NAME:
+            raise ValueError(f"Not a columnar catalog: {block.get('format')!r}")
+        if block.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported columnar version: {block.get('version')!r}")
+
+        self._keys: List[str] = block['keys']
+        self._strings: List[str] = block['strings']
+        self._columns: Dict[str, List] = block['columns']
+        self._interned = set(block.get('interned', []))
+        self._absent = {field: set(rows) for field, rows in block.get('absent', {}).items()}
+        self._rows: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._row_index()
+
+    def __getitem__(self, key: str) -> Dict:
+        return self.record_at(self._row_index()[key])
+
+    def _row_index(self) -> Dict[str, int]:
+        if self._rows is None:
+            self._rows = {key: index for index, key in enumerate(self._keys)}
+        return self._rows
+
+    def keys(self) -> List[str]:
+        return list(self._keys)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        index = self._row_index().get(key)
+        return default if index is None else self.record_at(index)
+
+    def column(self, field: str) -> List:
+        """Return one decoded column without materialising any record"""
+        values = self._columns[field]
+        if field not in self._interned:
+            return list(values)
+        return [self._resolve(value) for value in values]
+
+    def _resolve(self, value: Any) -> Any:
+        if isinstance(value, int) and not isinstance(value, bool):
+            return self._strings[value]
+        if isinstance(value, list):
+            return [self._strings[item] for item in value]
+        return value
+
+    def record_at(self, index: int) -> Dict:
+        """Rebuild the row-oriented record stored at ``index``"""
+        record: Dict[str, Any] = {}
+        for field, values in self._columns.items():
+            absent = self._absent.get(field)
+            if absent and index in absent:
+                continue
+            value = values[index]
+            if field in self._interned:
+                value = self._resolve(value)
+
+            if '.' in field:
+                parent, child = field.split('.', 1)
+                record.setdefault(parent, {})[child] = value
+            else:
+                record[field] = value
+        return record
+
+    def items(self) -> Iterator:
+        for index, key in enumerate(self._keys):
+            yield key, self.record_at(index)
+
+    def to_servers(self) -> Dict[str, Dict]:
+        """Rebuild the full row-oriented servers dict"""
+        return dict(self.items())
+
+
+def decode_columnar(block: Dict) -> ColumnarCatalog:
+    """Wrap a columnar block (or a whole exported document) in a decoder"""
+    if 'servers' in block and isinstance(block['servers'], dict) and 'columns' in block['servers']:
+        block = block['servers']
+    return ColumnarCatalog(block)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Catalog Index
+Shared in-memory query path over the MCP server directory
+
+Loads the directory once and builds hash indexes on category, popularity
+level, installation method and creator, plus presorted orders by name and by
+popularity score. Combined filter + sort + paginate queries intersect the
+index buckets and order the survivors by precomputed rank, so they never
+walk the full server list.
+
+Usage:
+    from catalog_index import CatalogIndex
+
+    index = CatalogIndex.from_file('data/comprehensive_mcp_directory.json')
+    page = index.query(category='Databases', sort='score', descending=True, limit=10)
+    for key, server in page.items:
+        print(key, server['name'])
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+POPULARITY_SCORES = {'high': 3, 'medium': 2, 'low': 1}
+
+INDEXED_FIELDS = ('category', 'popularity', 'installation_method', 'creator')
+
+# 'name' is alphabetical; 'score' is by popularity score (descending puts the
+# most popular servers first); ties are always broken by ascending name, then key
+SORT_ORDERS = ('name', 'score')
+
+
+def popularity_level(server: Dict) -> str:
+    """Popularity level of a record, 'unknown' when not rated"""
+    indicators = server.get('popularity_indicators') or {}
+    return indicators.get('level') or 'unknown'
+
+
+def popularity_score(server: Dict) -> int:
+    return POPULARITY_SCORES.get(popularity_level(server), 0)
+
+
+def installation_method(server: Dict) -> str:
+    """Installation method, derived from the install command when not stored"""
+    method = server.get('installation_method')
+    if method:
+        return method
+
+    command = (server.get('installation_instructions') or '').strip().lower()
+    if command.startswith(('npm ', 'npx ')):
+        return 'npm'
+    if command.startswith('pip '):
+        return 'pip'
+    if command.startswith('git clone'):
+        return 'git'
+    if command.startswith('go install'):
+        return 'go'
+    return 'manual' if command else 'unknown'
+
+
+def creator(server: Dict) -> str:
+    return server.get('creator_maintainer') or 'unknown'
+
+
+_EXTRACTORS = {
+    'category': lambda server: server.get('category') or 'Uncategorized',
+    'popularity': popularity_level,
+    'installation_method': installation_method,
+    'creator': creator,
+}
+
+
+@dataclass
+class QueryResult:
+    """One page of query results plus the total match count"""
+    total: int
+    offset: int
+    limit: Optional[int]
+    items: List[Tuple[str, Dict]] = field(default_factory=list)
+
+    @property
+    def keys(self) -> List[str]:
+        return [key for key, _ in self.items]
+
+
+class CatalogIndex:
+    """Hash-indexed, presorted view over a servers dict"""
+
+    def __init__(self, servers: Dict[str, Dict], metadata: Optional[Dict] = None,
+                 categories: Optional[List[Dict]] = None):
+        self.servers = servers
+        self.metadata = metadata or {}
+        self.category_info = categories or []
+
+        self._indexes: Dict[str, Dict[str, Set[str]]] = {name: {} for name in INDEXED_FIELDS}
+        for key, server in servers.items():
+            for name, extract in _EXTRACTORS.items():
+                self._indexes[name].setdefault(extract(server), set()).add(key)
+
+        def name_key(k: str) -> str:
+            return (servers[k].get('name') or k).casefold()
+
+        by_name = sorted(servers, key=lambda k: (name_key(k), k))
+
+        # Both directions are precomputed from by_name with stable sorts, so ties
+        # (equal names, equal scores) stay in ascending key order either way
+        self._orders: Dict[Tuple[str, bool], List[str]] = {
+            ('name', False): by_name,
+            ('name', True): sorted(by_name, key=name_key, reverse=True),
+            ('score', False): sorted(by_name, key=lambda k: popularity_score(servers[k])),
+            ('score', True): sorted(by_name, key=lambda k: -popularity_score(servers[k])),
+        }
+        self._ranks: Dict[Tuple[str, bool], Dict[str, int]] = {
+            order: {key: rank for rank, key in enumerate(keys)}
+            for order, keys in self._orders.items()
+        }
+
+    @classmethod
+    def from_data(cls, data: Dict) -> 'CatalogIndex':
+        """Build from an exported directory document"""
+        servers = data.get('servers', {})
+        if isinstance(servers, dict) and 'columns' in servers:
+            from catalog_columnar import decode_columnar
+            servers = decode_columnar(servers).to_servers()
+        return cls(servers, data.get('metadata'), data.get('categories'))
+
+    @classmethod
+    def from_file(cls, path: str) -> 'CatalogIndex':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_data(json.load(f))
+
+    def __len__(self) -> int:
+        return len(self.servers)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.servers
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self.servers.get(key)
+
+    def values(self, field_name: str) -> List[str]:
+        """Distinct values of an indexed field"""
+        return sorted(self._indexes[field_name])
+
+    def facet(self, field_name: str) -> Dict[str, int]:
+        """Server count per value of an indexed field"""
+        return {value: len(keys) for value, keys in sorted(self._indexes[field_name].items())}
+
+    def keys_for(self, field_name: str, value: str) -> Set[str]:
+        return self._indexes[field_name].get(value, set())
+
+    def ordered(self, sort: str = 'name', descending: bool = False) -> List[str]:
+        """All keys in a precomputed order"""
+        return list(self._orders[sort, descending])
+
+    def query(self, category: Optional[str] = None, popularity: Optional[str] = None,
+              installation_method: Optional[str] = None, creator: Optional[str] = None,
+              sort: str = 'name', descending: bool = False,
+              offset: int = 0, limit: Optional[int] = None) -> QueryResult:
+        """Filter on any indexed fields, order by a presorted order and paginate"""
+        if sort not in SORT_ORDERS:
+            raise ValueError(f"Unknown sort order: {sort!r} (expected one of {SORT_ORDERS})")
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError('offset and limit must be non-negative')
+
+        filters = {
+            'category': category,
+            'popularity': popularity,
+            'installation_method': installation_method,
+            'creator': creator,
+        }
+        buckets = [self.keys_for(name, value) for name, value in filters.items() if value is not None]
+
+        if buckets:
+            buckets.sort(key=len)
+            matched = set(buckets[0])
+            for bucket in buckets[1:]:
+                matched &= bucket
+                if not matched:
+                    break
+            keys = sorted(matched, key=self._ranks[sort, descending].__getitem__)
+        else:
+            keys = self._orders[sort, descending]
+
+        end = None if limit is None else offset + limit
+        page = keys[offset:end]
+        return QueryResult(
+            total=len(keys),
+            offset=offset,
+            limit=limit,
+            items=[(key, self.servers[key]) for key in page],
+        )
+
+    def items(self, sort: str = 'name', descending: bool = False) -> Iterator[Tuple[str, Dict]]:
+        for key in self._orders[sort, descending]:
+            yield key, self.servers[key]
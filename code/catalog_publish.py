@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Catalog Publish
+Content-hashed, immutable data files plus a small manifest
+
+The site used to fetch fixed filenames (data/comprehensive_mcp_directory.json),
+so no cache could keep them for long. publish_artifacts() writes each
+artifact under a name that embeds its content hash,
+
+    comprehensive_mcp_directory.json  ->  comprehensive_mcp_directory.3f9c2a1b7e04.json
+
+and a manifest.json that maps logical names to the current hashed files:
+
+    {"files": {"comprehensive_mcp_directory.json":
+                  {"path": "comprehensive_mcp_directory.3f9c2a1b7e04.json",
+                   "sha256": "...", "size": 123456}},
+     "format": "mcp-manifest", "version": 1}
+
+Hashed files never change once written, so they can be served with
+``Cache-Control: public, max-age=31536000, immutable``; only manifest.json
+needs revalidating. The fixed filenames are still written for the Python tools
+that read them directly.
+
+Every output directory (data/ and mcp-navigator/public/data/) receives the
+same bytes. All data files are staged in every directory first; the
+manifests are swapped in last, each with an atomic rename. The guarantee is
+per directory: a reader of one directory sees a complete generation before
+or after the publish, never a mix. The directories are switched one after
+another, so a crash between the renames can leave them on different
+generations until the next publish. Hashed files referenced by neither the
+new nor the previous manifest are removed.
+"""
+
+import hashlib
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Optional
+
+from catalog_watch import atomic_write
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_FORMAT = 'mcp-manifest'
+MANIFEST_VERSION = 1
+HASH_LENGTH = 12
+
+OUTPUT_DIRS = ['data', os.path.join('mcp-navigator', 'public', 'data')]
+
+
+def canonical_json(data, indent: Optional[int] = None) -> bytes:
+    """Reproducible JSON bytes: fixed separators, UTF-8, keys in insertion order
+
+    Keys are not sorted. Insertion order is part of the output contract
+    (servers in collection order, categories by count), so callers must build
+    their dicts in a fixed order; the same dicts always give the same bytes.
+    """
+    separators = (',', ': ') if indent is not None else (',', ':')
+    return json.dumps(data, indent=indent, separators=separators,
+                      ensure_ascii=False).encode('utf-8')
+
+
+def hashed_name(name: str, digest: str) -> str:
+    """Insert the content hash before the final extension"""
+    stem, extension = os.path.splitext(name)
+    return f'{stem}.{digest[:HASH_LENGTH]}{extension}'
+
+
+def _hashed_pattern(name: str) -> 're.Pattern':
+    stem, extension = os.path.splitext(name)
+    return re.compile(re.escape(stem) + r'\.[0-9a-f]{%d}' % HASH_LENGTH + re.escape(extension) + '$')
+
+
+def read_manifest(directory: str) -> Dict:
+    """Current manifest of ``directory``; an empty one if missing or unreadable"""
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    if manifest.get('format') != MANIFEST_FORMAT:
+        manifest = {}
+    manifest.setdefault('files', {})
+    return manifest
+
+
+def _write_if_changed(path: str, data: bytes) -> bool:
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    atomic_write(path, data)
+    return True
+
+
+def publish_artifacts(artifacts: Dict[str, bytes], output_dirs: Iterable[str] = OUTPUT_DIRS,
+                      keep_plain_names: bool = True) -> Dict:
+    """Publish ``artifacts`` (logical name -> bytes) to every directory; returns the new manifest
+
+    Entries for artifacts not in this call are carried over from the existing
+    manifest, so several exporters can share one data directory.
+    """
+    output_dirs = list(output_dirs)
+    entries = {}
+    for name, data in sorted(artifacts.items()):
+        digest = hashlib.sha256(data).hexdigest()
+        entries[name] = {'path': hashed_name(name, digest), 'sha256': digest, 'size': len(data)}
+
+    # Stage: hashed files are immutable, so writing them cannot disturb readers
+    previous = {}
+    for directory in output_dirs:
+        os.makedirs(directory, exist_ok=True)
+        previous[directory] = read_manifest(directory)
+        for name, data in artifacts.items():
+            path = os.path.join(directory, entries[name]['path'])
+            if not os.path.exists(path):
+                atomic_write(path, data)
+            if keep_plain_names:
+                _write_if_changed(os.path.join(directory, name), data)
+
+    # Commit: swap each directory's manifest with its own atomic rename
+    manifests = {}
+    for directory in output_dirs:
+        files = dict(previous[directory]['files'])
+        files.update(entries)
+        manifests[directory] = {'files': dict(sorted(files.items())),
+                                'format': MANIFEST_FORMAT, 'version': MANIFEST_VERSION}
+    for directory, manifest in manifests.items():
+        _write_if_changed(os.path.join(directory, MANIFEST_NAME), canonical_json(manifest, indent=2))
+
+    for directory in output_dirs:
+        _prune(directory, artifacts, previous[directory], manifests[directory])
+
+    return manifests[output_dirs[0]] if output_dirs else {'files': entries}
+
+
+def _prune(directory: str, artifacts: Iterable[str], previous: Dict, current: Dict) -> List[str]:
+    """Delete hashed copies of ``artifacts`` that neither manifest references"""
+    # The previous generation stays for clients that fetched the old manifest
+    # moments before the swap
+    keep = {entry['path'] for manifest in (previous, current) for entry in manifest['files'].values()}
+    removed = []
+    patterns = [_hashed_pattern(name) for name in artifacts]
+    for entry in os.listdir(directory):
+        if entry not in keep and any(pattern.match(entry) for pattern in patterns):
+            os.unlink(os.path.join(directory, entry))
+            removed.append(entry)
+    return removed
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Catalog API Server
+Local read-only HTTP API over the MCP server directory (stdlib asyncio only)
+
+Endpoints (GET/HEAD, JSON responses):
+    /servers            paginated listing; filters: category, popularity,
+                        installation_method, creator; sort=name|score,
+                        order=asc|desc (default asc for name, desc for
+                        score, i.e. most popular first), offset, limit
+    /servers/{key}      one server
+    /categories         categories with counts
+    /search?q=...       typo-tolerant search (limit)
+    /health             catalog version and size
+
+The directory is loaded once into a CatalogIndex plus a TrigramIndex.
+Responses are rendered once per catalog version and cached with a strong
+ETag (SHA-256 of the body); requests carrying a matching If-None-Match get
+``304 Not Modified``. A background task watches the data file's mtime and
+swaps in a freshly built index without dropping in-flight requests.
+
+Request handling (CatalogService.handle) is independent of the socket
+layer, so it can be exercised fully offline:
+
+    service = CatalogService('data/comprehensive_mcp_directory.json')
+    status, headers, body = service.handle('GET', '/servers?limit=5', {})
+
+Usage:
+    python code/catalog_server.py --port 8765
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from catalog_index import CatalogIndex, SORT_ORDERS
+from profiling import add_profile_arguments, run_profiled
+from trigram_index import TrigramIndex
+
+DEFAULT_DATA_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'comprehensive_mcp_directory.json')
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 200
+RESPONSE_CACHE_SIZE = 1024
+MAX_HEADER_BYTES = 16 * 1024
+
+STATUS_TEXT = {
+    200: 'OK',
+    304: 'Not Modified',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    431: 'Request Header Fields Too Large',
+    500: 'Internal Server Error',
+}
+
+Response = Tuple[int, Dict[str, str], bytes]
+
+
+class BadRequest(Exception):
+    """Raised for malformed query parameters"""
+
+
+class CatalogSnapshot:
+    """One immutable generation of the loaded catalog"""
+
+    def __init__(self, data: Dict, version: str):
+        self.version = version
+        self.index = CatalogIndex.from_data(data)
+        self.search = TrigramIndex.build(self.index.servers)
+        self.responses: 'OrderedDict[str, Tuple[bytes, str]]' = OrderedDict()
+
+    @classmethod
+    def load(cls, path: str) -> 'CatalogSnapshot':
+        with open(path, 'rb') as f:
+            raw = f.read()
+        return cls(json.loads(raw), hashlib.sha256(raw).hexdigest()[:16])
+
+
+def _int_param(params: Dict, name: str, default: int, maximum: Optional[int] = None) -> int:
+    value = params.get(name, [str(default)])[-1]
+    try:
+        number = int(value)
+    except ValueError:
+        raise BadRequest(f'{name} must be an integer')
+    if number < 0:
+        raise BadRequest(f'{name} must be non-negative')
+    return min(number, maximum) if maximum is not None else number
+
+
+def _param(params: Dict, name: str) -> Optional[str]:
+    values = params.get(name)
+    return values[-1] if values else None
+
+
+class CatalogService:
+    """Routes requests against the current catalog snapshot"""
+
+    def __init__(self, data_file: str = DEFAULT_DATA_FILE):
+        self.data_file = data_file
+        self._mtime = os.stat(data_file).st_mtime_ns
+        self.snapshot = CatalogSnapshot.load(data_file)
+
+    def reload_if_changed(self) -> bool:
+        """Rebuild the snapshot when the data file changed; returns True on swap"""
+        try:
+            mtime = os.stat(self.data_file).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime == self._mtime:
+            return False
+
+        snapshot = CatalogSnapshot.load(self.data_file)
+        self._mtime = mtime
+        if snapshot.version == self.snapshot.version:
+            return False
+        # Single reference assignment: readers see either the old or the new snapshot
+        self.snapshot = snapshot
+        return True
+
+    def handle(self, method: str, target: str, headers: Dict[str, str]) -> Response:
+        if method not in ('GET', 'HEAD'):
+            return self._error(405, 'Only GET and HEAD are supported', {'Allow': 'GET, HEAD'})
+
+        snapshot = self.snapshot
+        cache_key = target
+        cached = snapshot.responses.get(cache_key)
+        if cached is None:
+            try:
+                status, payload = self._route(snapshot, target)
+            except BadRequest as e:
+                return self._error(400, str(e))
+            if status != 200:
+                return self._error(status, payload)
+            body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+            cached = (body, etag)
+            snapshot.responses[cache_key] = cached
+            if len(snapshot.responses) > RESPONSE_CACHE_SIZE:
+                snapshot.responses.popitem(last=False)
+        else:
+            snapshot.responses.move_to_end(cache_key)
+
+        body, etag = cached
+        response_headers = {
+            'Content-Type': 'application/json; charset=utf-8',
+            'ETag': etag,
+            'Cache-Control': 'no-cache',
+            'X-Catalog-Version': snapshot.version,
+        }
+
+        if_none_match = headers.get('if-none-match')
+        if if_none_match and (if_none_match.strip() == '*' or
+                              etag in [tag.strip() for tag in if_none_match.split(',')]):
+            return 304, response_headers, b''
+
+        return 200, response_headers, body
+
+    def _error(self, status: int, message: str, extra: Optional[Dict[str, str]] = None) -> Response:
+        body = json.dumps({'error': message}).encode('utf-8')
+        headers = {'Content-Type': 'application/json; charset=utf-8'}
+        headers.update(extra or {})
+        return status, headers, body
+
+    def _route(self, snapshot: CatalogSnapshot, target: str):
+        parts = urlsplit(target)
+        path = parts.path.rstrip('/') or '/'
+        params = parse_qs(parts.query)
+        index = snapshot.index
+
+        if path == '/servers':
+            sort = _param(params, 'sort') or 'name'
+            if sort not in SORT_ORDERS:
+                raise BadRequest(f'sort must be one of {", ".join(SORT_ORDERS)}')
+            order = _param(params, 'order') or ('desc' if sort == 'score' else 'asc')
+            if order not in ('asc', 'desc'):
+                raise BadRequest('order must be asc or desc')
+            page = index.query(
+                category=_param(params, 'category'),
+                popularity=_param(params, 'popularity'),
+                installation_method=_param(params, 'installation_method'),
+                creator=_param(params, 'creator'),
+                sort=sort,
+                descending=order == 'desc',
+                offset=_int_param(params, 'offset', 0),
+                limit=_int_param(params, 'limit', DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE),
+            )
+            return 200, {
+                'total': page.total,
+                'offset': page.offset,
+                'limit': page.limit,
+                'items': [dict(server, key=key) for key, server in page.items],
+            }
+
+        if path.startswith('/servers/'):
+            key = unquote(path[len('/servers/'):])
+            server = index.get(key)
+            if server is None:
+                return 404, f'Unknown server: {key}'
+            return 200, dict(server, key=key)
+
+        if path == '/categories':
+            counts = index.facet('category')
+            info = {category['name']: category for category in index.category_info}
+            return 200, {
+                'total': len(counts),
+                'items': [
+                    {
+                        'name': name,
+                        'count': count,
+                        'description': info.get(name, {}).get('description', ''),
+                        'icon': info.get(name, {}).get('icon', ''),
+                    }
+                    for name, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+                ],
+            }
+
+        if path == '/search':
+            query = _param(params, 'q')
+            if not query:
+                raise BadRequest('q is required')
+            hits = snapshot.search.search(query, limit=_int_param(params, 'limit', 10, MAX_PAGE_SIZE))
+            return 200, {
+                'query': query,
+                'total': len(hits),
+                'items': [
+                    {'key': hit.key, 'name': hit.name, 'distance': hit.distance,
+                     'category': index.servers[hit.key].get('category')}
+                    for hit in hits
+                ],
+            }
+
+        if path == '/health':
+            return 200, {'status': 'ok', 'version': snapshot.version, 'servers': len(index)}
+
+        return 404, f'No route for {path}'
+
+
+def _render(status: int, headers: Dict[str, str], body: bytes, head_only: bool, keep_alive: bool) -> bytes:
+    lines = [f'HTTP/1.1 {status} {STATUS_TEXT.get(status, "Unknown")}']
+    headers = dict(headers)
+    headers['Content-Length'] = str(len(body))
+    headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+    lines.extend(f'{name}: {value}' for name, value in headers.items())
+    head = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+    return head if head_only or status == 304 else head + body
+
+
+async def _serve_connection(service: CatalogService, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            try:
+                raw = await reader.readuntil(b'\r\n\r\n')
+            except asyncio.LimitOverrunError:
+                writer.write(_render(*service._error(431, 'Request headers too large'), False, False))
+                break
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+
+            lines = raw.decode('latin-1').split('\r\n')
+            try:
+                method, target, version = lines[0].split(' ', 2)
+            except ValueError:
+                writer.write(_render(*service._error(400, 'Malformed request line'), False, False))
+                break
+
+            headers = {}
+            for line in lines[1:]:
+                if ':' in line:
+                    name, value = line.split(':', 1)
+                    headers[name.strip().lower()] = value.strip()
+
+            connection = headers.get('connection', '').lower()
+            keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+            # Request bodies are not used by any endpoint; drain them to keep framing intact
+            length = int(headers.get('content-length', '0') or 0)
+            if length:
+                await reader.readexactly(length)
+
+            try:
+                status, response_headers, body = service.handle(method, target, headers)
+            except Exception as e:
+                status, response_headers, body = service._error(500, str(e))
+            writer.write(_render(status, response_headers, body, method == 'HEAD', keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _watch(service: CatalogService, interval: float) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            # Rebuilding the indexes is CPU work; keep the event loop serving meanwhile
+            swapped = await loop.run_in_executor(None, service.reload_if_changed)
+        except (OSError, ValueError) as e:
+            print(f"Reload failed, keeping catalog {service.snapshot.version}: {e}", file=sys.stderr)
+            continue
+        if swapped:
+            print(f"Catalog reloaded: version {service.snapshot.version}, "
+                  f"{len(service.snapshot.index)} servers")
+
+
+async def serve(service: CatalogService, host: str, port: int, poll_interval: float) -> None:
+    server = await asyncio.start_server(
+        lambda reader, writer: _serve_connection(service, reader, writer),
+        host, port, limit=MAX_HEADER_BYTES)
+    watcher = asyncio.ensure_future(_watch(service, poll_interval)) if poll_interval > 0 else None
+
+    print(f"🚀 Serving {len(service.snapshot.index)} MCP servers on http://{host}:{port} "
+          f"(version {service.snapshot.version})")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if watcher:
+            watcher.cancel()
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Local HTTP API for the MCP server directory')
+    parser.add_argument('--data-file', default=DEFAULT_DATA_FILE, help='exported directory JSON')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--poll-interval', type=float, default=1.0,
+                        help='seconds between data file checks (0 disables hot reload)')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    service = CatalogService(args.data_file)
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.poll_interval))
+    except KeyboardInterrupt:
+        print("\nServer stopped")
+
+
+if __name__ == "__main__":
+    run_profiled(main)
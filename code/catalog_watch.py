@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Catalog Watch
+Rebuild-on-save support shared by the collectors' ``--watch`` mode
+
+Three pieces:
+
+    FileWatcher     blocks until one of a set of input files changes; uses
+                    inotify (via ctypes, Linux only) on the files' parent
+                    directories so editor save-by-rename is seen, and falls
+                    back to mtime polling elsewhere or for missing directories
+    atomic_write    temp file + os.replace, so readers never see a partial file
+    run_watch       debounce loop: waits for a change, keeps collecting events
+                    until the inputs have been quiet for ``debounce`` seconds,
+                    then calls the rebuild callback once
+
+Collectors keep their own notion of what to rebuild; writing the results to
+data/ and mcp-navigator/public/data/ is catalog_publish.py's job.
+
+Usage:
+    watcher = FileWatcher(['code/comprehensive_mcp_collector.py'])
+    run_watch(watcher, lambda changed: publish_artifacts(render()))
+"""
+
+import ast
+import ctypes
+import ctypes.util
+import hashlib
+import importlib.util
+import os
+import select
+import struct
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+DEFAULT_DEBOUNCE = 0.15
+MAX_DEBOUNCE = 0.5
+POLL_INTERVAL = 0.2
+
+# <sys/inotify.h>
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_WATCH_MASK = (_IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM |
+                  _IN_MOVED_TO | _IN_CREATE | _IN_DELETE)
+_INOTIFY_EVENT = struct.Struct('iIII')
+
+
+class _Inotify:
+    """Minimal inotify binding: directory watches, non-blocking reads"""
+
+    def __init__(self, fd: int, libc):
+        self.fd = fd
+        self._libc = libc
+        self._dirs: Dict[int, str] = {}
+
+    @classmethod
+    def create(cls) -> Optional['_Inotify']:
+        if not sys.platform.startswith('linux'):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        return cls(fd, libc) if fd >= 0 else None
+
+    def add_directory(self, path: str) -> bool:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), _IN_WATCH_MASK)
+        if wd < 0:
+            return False
+        self._dirs[wd] = path
+        return True
+
+    def read(self, timeout: Optional[float]) -> Set[str]:
+        """Paths touched since the last read, waiting up to ``timeout`` seconds"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        touched = set()
+        while True:
+            try:
+                buffer = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            position = 0
+            while position + _INOTIFY_EVENT.size <= len(buffer):
+                wd, _mask, _cookie, length = _INOTIFY_EVENT.unpack_from(buffer, position)
+                position += _INOTIFY_EVENT.size
+                name = buffer[position:position + length].rstrip(b'\0')
+                position += length
+                directory = self._dirs.get(wd)
+                if directory is not None and name:
+                    touched.add(os.path.join(directory, os.fsdecode(name)))
+        return touched
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def _stat_signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class FileWatcher:
+    """Waits for changes to a fixed set of files"""
+
+    def __init__(self, paths: Iterable[str], poll_interval: float = POLL_INTERVAL,
+                 use_inotify: bool = True):
+        self.paths = sorted({os.path.abspath(path) for path in paths})
+        self.poll_interval = poll_interval
+        self._inotify = _Inotify.create() if use_inotify else None
+
+        # Files whose directory could not be watched are polled instead
+        self._polled: List[str] = []
+        watched_dirs: Set[str] = set()
+        for path in self.paths:
+            directory = os.path.dirname(path)
+            if self._inotify is not None and (directory in watched_dirs or
+                                              (os.path.isdir(directory) and
+                                               self._inotify.add_directory(directory))):
+                watched_dirs.add(directory)
+            else:
+                self._polled.append(path)
+        self._signatures = {path: _stat_signature(path) for path in self._polled}
+
+    @property
+    def backend(self) -> str:
+        if self._inotify is None:
+            return 'polling'
+        return 'inotify+polling' if self._polled else 'inotify'
+
+    def _poll(self) -> Set[str]:
+        changed = set()
+        for path in self._polled:
+            signature = _stat_signature(path)
+            if signature != self._signatures[path]:
+                self._signatures[path] = signature
+                changed.add(path)
+        return changed
+
+    def wait(self, timeout: Optional[float] = None) -> Set[str]:
+        """Block until a watched file changes (or ``timeout`` expires); returns changed paths"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            step = self.poll_interval if remaining is None else min(self.poll_interval, remaining)
+
+            changed = self._poll()
+            if self._inotify is not None:
+                changed |= {path for path in self._inotify.read(0 if changed else step)
+                            if path in self.paths}
+            elif not changed:
+                time.sleep(step)
+                changed = self._poll()
+
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+
+def atomic_write(path: str, data: bytes) -> None:
+    """Replace ``path`` with ``data`` so readers see either the old or the new file"""
+    directory = os.path.dirname(path) or '.'
+    fd, temp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates 0600 files; published data must stay world-readable
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def load_module_from(path: str, name: str):
+    """Import a fresh copy of the module at ``path`` without touching sys.modules"""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _code_signature(code) -> Tuple:
+    # Bytecode, names and constants only: line numbers shift whenever a data
+    # literal above the function grows, which must not count as a code change
+    return (code.co_code, code.co_names, tuple(
+        _code_signature(const) if hasattr(const, 'co_code') else repr(const)
+        for const in code.co_consts
+    ))
+
+
+def _assignment_signatures(path: str, class_name: str, skipped: Set[str]) -> List[str]:
+    """Module-level and class-body assignments in ``path`` as AST dumps
+
+    ast.dump leaves out positions, so moving a constant or reformatting it does
+    not count as a change, while a new value does.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read(), path)
+    except (OSError, SyntaxError, ValueError):
+        return []
+    bodies = [tree.body] + [node.body for node in tree.body
+                            if isinstance(node, ast.ClassDef) and node.name == class_name]
+    signatures = []
+    for body in bodies:
+        for node in body:
+            if isinstance(node, ast.Assign):
+                targets = node.targets
+            elif isinstance(node, (ast.AnnAssign, ast.AugAssign)):
+                targets = [node.target]
+            else:
+                continue
+            if any(isinstance(target, ast.Name) and target.id in skipped for target in targets):
+                continue
+            signatures.append(ast.dump(node))
+    return signatures
+
+
+def code_fingerprint(cls, exclude: Iterable[str] = ()) -> str:
+    """Hash of a class's method bodies and of the constants they read
+
+    Covers every method of ``cls`` plus the module-level and class-level
+    assignments of the file it is defined in, so editing a constant such as a
+    size limit triggers a full rebuild too. Names in ``exclude`` are ignored.
+    """
+    skipped = set(exclude)
+    parts = []
+    source_file = None
+    for name, member in sorted(vars(cls).items()):
+        if isinstance(member, (staticmethod, classmethod)):
+            member = member.__func__
+        elif isinstance(member, property):
+            member = member.fget
+        code = getattr(member, '__code__', None)
+        if code is not None:
+            # The class may come from load_module_from, so it is not in sys.modules
+            source_file = source_file or code.co_filename
+            if name not in skipped:
+                parts.append((name, _code_signature(code)))
+    if source_file is not None:
+        parts.append(('<assignments>', _assignment_signatures(source_file, cls.__name__, skipped)))
+    return hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()
+
+
+def run_watch(watcher: FileWatcher, rebuild: Callable[[Set[str]], None],
+              debounce: float = DEFAULT_DEBOUNCE) -> None:
+    """Call ``rebuild(changed_paths)`` after each debounced burst of edits until interrupted"""
+    try:
+        while True:
+            changed = watcher.wait()
+            burst_end = time.monotonic() + MAX_DEBOUNCE
+            while time.monotonic() < burst_end:
+                more = watcher.wait(timeout=debounce)
+                if not more:
+                    break
+                changed |= more
+
+            try:
+                rebuild(changed)
+            except Exception as e:
+                # A half-saved source file must not end the session; keep the last good artifacts
+                print(f"⚠️ Rebuild failed, keeping previous artifacts: {e}", file=sys.stderr)
+    except KeyboardInterrupt:
+        print("\nWatch stopped")
+    finally:
+        watcher.close()
@@ -42,15 +42,34 @@
         "categories": [...],         # 分類列表和計數
         "servers": {...}             # 服務器詳細資訊
     }
+    另輸出列式版本 comprehensive_mcp_directory.columnar.json：servers 改為
+    每欄位一個陣列，分類/作者/來源等字串存入共用字串表（見 catalog_columnar.py）
+    以及二進位索引 comprehensive_mcp_directory.mcpb，供 Python 工具以 mmap
+    按鍵或分類查詢單筆記錄（見 catalog_binary.py）
+    以及容錯搜尋用的三元組索引 comprehensive_mcp_directory.trigram.json
+    （見 trigram_index.py）
+    以及首頁首次繪製用的精簡資料 comprehensive_mcp_directory.critical.json
+    （僅含元數據、分類計數與熱門服務器，大小不隨服務器數量增長）
 
 使用範例：
     # 基本使用
     python comprehensive_mcp_collector.py
     
+    # 記憶體分析：各階段 tracemalloc 峰值、配置位置排行與快照差異
+    python comprehensive_mcp_collector.py --memprofile
+    
+    # 監看模式：編輯本檔的服務器清單後，只重新整理新增或修改的服務器記錄，
+    # 再以原子方式寫入 data/ 與 mcp-navigator/public/data/（Linux 用 inotify，
+    # 其他平台輪詢 mtime）。JSON、列式、二進位、三元組與首屏等衍生檔案仍由完整
+    # 記錄重新產生（數十筆記錄只需數毫秒），內容未變的檔案不會重寫
+    python comprehensive_mcp_collector.py --watch
+    
     # 程式化使用
     from comprehensive_mcp_collector import ComprehensiveMCPCollector
     collector = ComprehensiveMCPCollector()
-    data = collector.export_comprehensive_data('output.json')
+    collector.load_comprehensive_server_list()
+    data = collector.build_export_data()
+    artifacts = collector.render_artifacts()   # 檔名 -> 位元組，交給 publish_artifacts 寫出
 
 作者：MCP Navigator 專案團隊
 版本：1.0.0
@@ -58,19 +77,40 @@
 =============================================================================
 """
 
-import json
+import argparse
 import os
+import time
 from pathlib import Path
 from typing import Dict, List, Set, Any
 import re
 
+from catalog_binary import encode_binary_catalog
+from catalog_columnar import encode_columnar
+from catalog_publish import OUTPUT_DIRS, canonical_json, publish_artifacts
+from catalog_watch import DEFAULT_DEBOUNCE, FileWatcher, code_fingerprint, load_module_from, run_watch
+from profiling import MemoryProfiler, add_profile_arguments, run_profiled
+from trigram_index import TrigramIndex
+
+# First-paint payload for the landing page; its size depends on the number of
+# categories only, never on the number of servers
+CRITICAL_POPULAR_COUNT = 6
+CRITICAL_DESCRIPTION_LENGTH = 100
+CRITICAL_PAYLOAD_BUDGET = 4 * 1024
+
 class ComprehensiveMCPCollector:
     def __init__(self):
         self.mcp_servers = {}
         self.categories = set()
+        # Raw source entry per key, so watch mode can tell which records changed
+        self.source_entries = {}
         
     def load_comprehensive_server_list(self):
         """Load comprehensive list of MCP servers"""
+        for server in self.source_server_list():
+            self._add_server(server)
+    
+    def source_server_list(self) -> List[Dict]:
+        """Raw server entries, before enrichment"""
         
         # Official Reference Servers (from Anthropic)
         official_servers = [
@@ -549,14 +589,35 @@ class ComprehensiveMCPCollector:
         ]
         
         # Combine all servers
-        all_servers = official_servers + company_servers + community_servers + ai_ml_servers
+        return official_servers + company_servers + community_servers + ai_ml_servers
+    
+    @staticmethod
+    def _server_key(name: str) -> str:
+        return name.lower().replace(' ', '_').replace('-', '_')
+    
+    def apply_source_changes(self, source_servers: List[Dict]) -> Set[str]:
+        """Re-enrich only added or edited entries, drop removed ones; returns affected keys"""
+        entries = {self._server_key(server['name']): server for server in source_servers}
+        affected = {key for key in self.source_entries if key not in entries}
+        affected.update(key for key, server in entries.items() if self.source_entries.get(key) != server)
         
-        for server in all_servers:
-            self._add_server(server)
+        for key in affected:
+            if key in entries:
+                self._add_server(entries[key])
+            else:
+                del self.mcp_servers[key]
+                del self.source_entries[key]
+        
+        # Keep export order identical to a full run
+        self.mcp_servers = {key: self.mcp_servers[key] for key in entries}
+        self.source_entries = {key: self.source_entries[key] for key in entries}
+        self.categories = {server['category'] for server in self.mcp_servers.values()}
+        return affected
     
     def _add_server(self, server_data: dict):
         """Add a server to the collection"""
-        key = server_data['name'].lower().replace(' ', '_').replace('-', '_')
+        key = self._server_key(server_data['name'])
+        self.source_entries[key] = server_data
         
         # Add category to categories set
         self.categories.add(server_data['category'])
@@ -723,13 +784,14 @@ class ComprehensiveMCPCollector:
                 'servers': [server['name'] for server in servers_in_category[:5]]  # Top 5 servers
             })
         
-        return sorted(categories, key=lambda x: x['count'], reverse=True)
+        # Ties broken by name so repeated exports are byte-identical
+        return sorted(categories, key=lambda x: (-x['count'], x['name']))
     
-    def export_comprehensive_data(self, output_file: str) -> Dict:
-        """Export comprehensive MCP data"""
+    def build_export_data(self) -> Dict:
+        """Build the row-oriented export document"""
         categories = self.generate_categories_with_counts()
         
-        export_data = {
+        return {
             'metadata': {
                 'title': 'Comprehensive MCP Server Directory',
                 'description': 'A curated collection of 50+ Model Context Protocol servers',
@@ -752,12 +814,70 @@ class ComprehensiveMCPCollector:
                 'documentation': 'https://modelcontextprotocol.io/introduction'
             }
         }
+    
+    def export_comprehensive_data(self, output_file: str) -> Dict:
+        """Export comprehensive MCP data to a single JSON file
+        
+        Kept for existing callers; the collector itself publishes every
+        artifact through render_artifacts() and publish_artifacts().
+        """
+        export_data = self.build_export_data()
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
+        with open(output_file, 'wb') as f:
+            f.write(canonical_json(export_data, indent=2))
         
         return export_data
     
+    def build_critical_payload(self, export_data: Dict = None) -> Dict:
+        """Exactly what HomePage renders: metadata, category tiles and featured servers"""
+        export_data = export_data or self.build_export_data()
+        popular_keys = [
+            key for key, server in self.mcp_servers.items()
+            if server['popularity_indicators']['level'] == 'high'
+        ][:CRITICAL_POPULAR_COUNT]
+        
+        popular = []
+        for key in popular_keys:
+            server = self.mcp_servers[key]
+            description = server['description']
+            if len(description) > CRITICAL_DESCRIPTION_LENGTH:
+                description = description[:CRITICAL_DESCRIPTION_LENGTH] + '...'
+            popular.append({
+                'key': key,
+                'name': server['name'],
+                'description': description,
+                'category': server['category'],
+                'level': server['popularity_indicators']['level']
+            })
+        
+        return {
+            'metadata': export_data['metadata'],
+            'categories': [
+                {field: category[field] for field in ('name', 'count', 'icon', 'color')}
+                for category in export_data['categories']
+            ],
+            'popular_servers': popular
+        }
+    
+    def render_artifacts(self, base_name: str = 'comprehensive_mcp_directory') -> Dict[str, bytes]:
+        """All exported files as deterministic bytes, keyed by file name (see catalog_publish)"""
+        export_data = self.build_export_data()
+        columnar_data = dict(export_data, servers=encode_columnar(self.mcp_servers))
+        search_index = TrigramIndex.build(self.mcp_servers)
+        
+        critical = canonical_json(self.build_critical_payload(export_data))
+        if len(critical) > CRITICAL_PAYLOAD_BUDGET:
+            print(f"⚠️ Critical payload is {len(critical)} bytes, over the "
+                  f"{CRITICAL_PAYLOAD_BUDGET}-byte first-paint budget")
+        
+        return {
+            f'{base_name}.json': canonical_json(export_data, indent=2),
+            f'{base_name}.critical.json': critical,
+            f'{base_name}.columnar.json': canonical_json(columnar_data),
+            f'{base_name}.mcpb': encode_binary_catalog(self.mcp_servers),
+            f'{base_name}.trigram.json': canonical_json(search_index.to_dict()),
+        }
+    
     def _get_popular_servers(self) -> List[Dict]:
         """Get list of most popular servers"""
         popular = []
@@ -772,25 +892,84 @@ class ComprehensiveMCPCollector:
         
         return popular[:10]  # Top 10 popular servers
 
+def watch(output_dirs: List[str] = OUTPUT_DIRS, debounce: float = DEFAULT_DEBOUNCE):
+    """Rebuild the exported directory whenever this file's server lists are edited"""
+    source_file = os.path.abspath(__file__)
+    collector = ComprehensiveMCPCollector()
+    collector.load_comprehensive_server_list()
+    fingerprint = code_fingerprint(ComprehensiveMCPCollector, exclude=['source_server_list'])
+    
+    publish_artifacts(collector.render_artifacts(), output_dirs)
+    watcher = FileWatcher([source_file])
+    print(f"👀 Watching {source_file} ({watcher.backend})")
+    
+    def rebuild(changed):
+        nonlocal collector, fingerprint
+        started = time.perf_counter()
+        fresh = load_module_from(source_file, '_comprehensive_mcp_collector_watch')
+        fresh_fingerprint = code_fingerprint(fresh.ComprehensiveMCPCollector, exclude=['source_server_list'])
+        source_servers = fresh.ComprehensiveMCPCollector().source_server_list()
+        
+        if fresh_fingerprint != fingerprint:
+            # Enrichment logic itself changed: every record may differ
+            collector = fresh.ComprehensiveMCPCollector()
+            collector.load_comprehensive_server_list()
+            fingerprint = fresh_fingerprint
+            affected = set(collector.mcp_servers)
+        else:
+            affected = collector.apply_source_changes(source_servers)
+        
+        if not affected:
+            print("  no server entries changed")
+            return
+        # Derived views (JSON, columnar, binary, trigram, critical) are re-rendered
+        # from all records; publish only rewrites the files whose bytes changed
+        manifest = publish_artifacts(collector.render_artifacts(), output_dirs)
+        elapsed = (time.perf_counter() - started) * 1000
+        current = manifest['files']['comprehensive_mcp_directory.json']['path']
+        print(f"🔄 {len(affected)} record(s) rebuilt, published {current} in {elapsed:.0f} ms")
+    
+    run_watch(watcher, rebuild, debounce)
+
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description='Build the comprehensive MCP server directory')
+    parser.add_argument('--watch', action='store_true',
+                        help='keep running and rebuild data/ and mcp-navigator/public/data/ on every edit')
+    parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE,
+                        help='seconds of quiet before a watch rebuild (default: %(default)s)')
+    parser.add_argument('--memprofile', action='store_true',
+                        help='report tracemalloc peak usage and top allocation sites per stage')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    
+    if args.watch:
+        return watch(debounce=args.debounce)
+    
+    profiler = MemoryProfiler(enabled=args.memprofile)
     print("🚀 Starting Comprehensive MCP Collection...")
     
     collector = ComprehensiveMCPCollector()
     
     print("📚 Loading comprehensive server list...")
-    collector.load_comprehensive_server_list()
-    
-    print("💾 Exporting data...")
-    output_file = 'data/comprehensive_mcp_directory.json'
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    with profiler.stage('load'):
+        collector.load_comprehensive_server_list()
     
-    export_data = collector.export_comprehensive_data(output_file)
+    print("💾 Publishing data...")
+    with profiler.stage('categorize'):
+        export_data = collector.build_export_data()
+    with profiler.stage('render'):
+        artifacts = collector.render_artifacts()
+    with profiler.stage('publish'):
+        manifest = publish_artifacts(artifacts, OUTPUT_DIRS)
     
     print(f"\n✅ Collection Complete!")
     print(f"📊 Total Servers: {len(collector.mcp_servers)}")
     print(f"🏷️ Categories: {len(collector.categories)}")
-    print(f"💾 Exported to: {output_file}")
+    print(f"💾 Published to: {', '.join(OUTPUT_DIRS)}")
+    for name, entry in sorted(manifest['files'].items()):
+        if name.startswith('comprehensive_mcp_directory.'):
+            print(f"   {name} -> {entry['path']} ({entry['size']} bytes)")
     
     print(f"\n📈 Category Breakdown:")
     categories = collector.generate_categories_with_counts()
@@ -802,7 +981,8 @@ def main():
     for i, server in enumerate(popular[:5]):
         print(f"  {i+1}. {server['name']} - {server['category']}")
     
+    profiler.report()
     return export_data
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_profiled(main)
\ No newline at end of file
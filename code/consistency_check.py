@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Cross-Artifact Consistency Check
+Verifies that every file describing the MCP servers agrees with the others
+
+Artifacts:
+    directory   data/comprehensive_mcp_directory.json          (reference)
+    database    data/mcp_servers_database.json                 (subset, own category taxonomy)
+    installer   <installer dir>/mcp-servers-config.json
+    vscode      <installer dir>/vscode-mcp-settings-template.json
+
+Every server record is reduced to the same shape (name, package, category,
+repository) and joined in one pass through a hash index of identity tokens:
+the normalized key and display name ('google_drive', 'Google Drive' and
+'google-drive' all become 'googledrive') and, failing those, the package.
+A record joins the first server any of its tokens already points to;
+otherwise it starts a new one. Each joined server is then compared field by
+field, so the whole check is linear in the number of records.
+
+Reported:
+    names, packages, categories, repositories that differ between artifacts
+    servers missing from an artifact that should list all of them
+    servers listed twice in one artifact
+    declared counts (metadata totals, per-category counts) that are wrong
+
+Exits with status 1 when anything is reported, for use in a commit hook/CI:
+    python code/consistency_check.py
+    python code/consistency_check.py --json
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from profiling import add_profile_arguments, run_profiled
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INSTALLER_DIR = os.path.join(REPO_ROOT, 'how to set up 46 MCP servers in 1 clicks')
+
+DEFAULT_ARTIFACTS = {
+    'directory': os.path.join(REPO_ROOT, 'data', 'comprehensive_mcp_directory.json'),
+    'database': os.path.join(REPO_ROOT, 'data', 'mcp_servers_database.json'),
+    'installer': os.path.join(INSTALLER_DIR, 'mcp-servers-config.json'),
+    'vscode': os.path.join(INSTALLER_DIR, 'vscode-mcp-settings-template.json'),
+}
+
+REFERENCE = 'directory'
+# Artifacts expected to list every server in the reference; the database is a partial collection
+COMPLETE_ARTIFACTS = ('installer', 'vscode')
+FIELDS = ('name', 'package', 'category', 'repository')
+# Artifacts whose categories[].servers list member keys (a multi-label taxonomy); elsewhere that list
+# only names a few examples and membership comes from each server's own 'category'
+MEMBERSHIP_LISTS = ('database',)
+
+_INSTALL_PACKAGE = re.compile(r'^(?:npm install(?: -g)?|pip install|npx(?: -y)?|uvx|go install)\s+(\S+)')
+
+
+def identity(text: str) -> str:
+    """Normalized server identity: casefolded, punctuation and spaces removed"""
+    return re.sub(r'[^0-9a-z]', '', text.casefold())
+
+
+def canonical_repository(url: Optional[str]) -> Optional[str]:
+    if not url:
+        return None
+    url = url.strip().casefold()
+    url = re.sub(r'^https?://(www\.)?', '', url).rstrip('/')
+    return url[:-4] if url.endswith('.git') else url
+
+
+def _package_from_command(command: Optional[str]) -> Optional[str]:
+    match = _INSTALL_PACKAGE.match(command or '')
+    return match.group(1) if match else None
+
+
+def _launch_package(entry: Dict) -> Optional[str]:
+    """Package a VS Code launch entry runs; None for commands naming a module, not a package"""
+    args = entry.get('args', [])
+    if entry.get('command') == 'npx':
+        return next((arg for arg in args if not arg.startswith('-')), None)
+    if entry.get('command') == 'go' and len(args) > 1 and args[0] == 'run':
+        return args[1].split('@')[0]
+    return None
+
+
+# Each reader yields (key, record) with record fields from FIELDS; None means "not described here"
+
+def _read_directory(data: Dict) -> Iterator[Tuple[str, Dict]]:
+    for key, server in data['servers'].items():
+        yield key, {
+            'name': server.get('name'),
+            'package': _package_from_command(server.get('installation_instructions')),
+            'category': server.get('category'),
+            'repository': server.get('repository_link'),
+        }
+
+
+def _read_database(data: Dict) -> Iterator[Tuple[str, Dict]]:
+    for key, server in data['servers'].items():
+        # Categories come from a different taxonomy and are not compared
+        yield key, {'name': server.get('name'), 'package': None, 'category': None,
+                    'repository': server.get('repository_link')}
+
+
+def _read_installer(data: Dict) -> Iterator[Tuple[str, Dict]]:
+    for key, server in data['servers'].items():
+        yield key, {
+            'name': server.get('name'),
+            'package': server.get('package'),
+            'category': server.get('category'),
+            'repository': server.get('repository'),
+        }
+
+
+def _read_vscode(data: Dict) -> Iterator[Tuple[str, Dict]]:
+    for key, entry in data['mcpServers'].items():
+        if key.startswith('//'):
+            continue
+        yield key, {'name': None, 'package': _launch_package(entry), 'category': None, 'repository': None}
+
+
+READERS = {
+    'directory': _read_directory,
+    'database': _read_database,
+    'installer': _read_installer,
+    'vscode': _read_vscode,
+}
+
+
+def declared_count_issues(artifact: str, data: Dict) -> List[str]:
+    """Metadata totals and per-category counts that disagree with the records"""
+    issues = []
+    servers = data.get('servers') if artifact != 'vscode' else None
+    if not isinstance(servers, dict):
+        return issues
+
+    metadata = data.get('metadata', {})
+    declared = metadata.get('total_servers')
+    if declared is not None and declared != len(servers):
+        issues.append(f'{artifact}: metadata.total_servers is {declared}, {len(servers)} servers listed')
+
+    categories = data.get('categories')
+    if isinstance(categories, list):
+        declared = metadata.get('total_categories')
+        if declared is not None and declared != len(categories):
+            issues.append(f'{artifact}: metadata.total_categories is {declared}, {len(categories)} categories listed')
+        actual = {}
+        if artifact not in MEMBERSHIP_LISTS:
+            for server in servers.values():
+                actual[server.get('category')] = actual.get(server.get('category'), 0) + 1
+        for category in categories:
+            if artifact in MEMBERSHIP_LISTS:
+                members = category.get('servers') or []
+                count = len(members)
+                unknown = [key for key in members if key not in servers]
+                if unknown:
+                    issues.append(f"{artifact}: category '{category.get('name')}' lists unknown "
+                                  f"server(s) {', '.join(unknown)}")
+            else:
+                count = actual.get(category.get('name'), 0)
+            if category.get('count') != count:
+                issues.append(f"{artifact}: category '{category.get('name')}' declares "
+                              f"{category.get('count')} servers, {count} listed")
+    return issues
+
+
+class JoinedIndex:
+    """Servers from all artifacts, joined on normalized identity tokens"""
+
+    def __init__(self):
+        self.servers: List[Dict[str, List[Tuple[str, Dict]]]] = []
+        self._tokens: Dict[Tuple[str, str], int] = {}
+
+    def add(self, artifact: str, key: str, record: Dict) -> None:
+        tokens = [('id', identity(key))]
+        if record['name']:
+            tokens.append(('id', identity(record['name'])))
+        if record['package']:
+            tokens.append(('package', record['package'].casefold()))
+
+        slot = next((self._tokens[token] for token in tokens if token in self._tokens), None)
+        if slot is None:
+            slot = len(self.servers)
+            self.servers.append({})
+        for token in tokens:
+            self._tokens.setdefault(token, slot)
+        self.servers[slot].setdefault(artifact, []).append((key, record))
+
+    def label(self, server: Dict[str, List[Tuple[str, Dict]]]) -> str:
+        for artifact in (REFERENCE,) + tuple(READERS):
+            if artifact in server:
+                return server[artifact][0][0]
+        return '?'
+
+
+def _comparable(field: str, value: str) -> str:
+    if field == 'repository':
+        return canonical_repository(value)
+    if field == 'name':
+        return ' '.join(value.split()).casefold()
+    return value.strip()
+
+
+def check_consistency(documents: Dict[str, Dict]) -> Dict[str, List[str]]:
+    """Every reported problem, grouped by kind"""
+    report = {'counts': [], 'coverage': [], 'duplicates': [], **{field: [] for field in FIELDS}}
+
+    index = JoinedIndex()
+    for artifact, data in documents.items():
+        report['counts'].extend(declared_count_issues(artifact, data))
+        for key, record in READERS[artifact](data):
+            index.add(artifact, key, record)
+
+    for server in index.servers:
+        label = index.label(server)
+        for artifact, records in server.items():
+            if len(records) > 1:
+                keys = ', '.join(key for key, _ in records)
+                report['duplicates'].append(f'{label}: listed {len(records)} times in {artifact} ({keys})')
+
+        if REFERENCE in documents:
+            if REFERENCE in server:
+                missing = [a for a in COMPLETE_ARTIFACTS if a in documents and a not in server]
+                if missing:
+                    report['coverage'].append(f"{label}: missing from {', '.join(missing)}")
+            else:
+                report['coverage'].append(f"{label}: in {', '.join(server)} but not in {REFERENCE}")
+
+        for field in FIELDS:
+            values = {}
+            for artifact, records in server.items():
+                value = records[0][1][field]
+                if value:
+                    values[artifact] = value
+            if len({_comparable(field, value) for value in values.values()}) > 1:
+                detail = ', '.join(f'{artifact}={value!r}' for artifact, value in values.items())
+                report[field].append(f'{label}: {detail}')
+
+    return report
+
+
+def load_documents(paths: Dict[str, str]) -> Dict[str, Dict]:
+    documents = {}
+    for artifact, path in paths.items():
+        if not os.path.exists(path):
+            print(f'⚠️  {artifact}: {path} not found, skipped', file=sys.stderr)
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            documents[artifact] = json.load(f)
+    return documents
+
+
+def print_report(report: Dict[str, List[str]], documents: Dict[str, Dict]):
+    print('=== CROSS-ARTIFACT CONSISTENCY REPORT ===')
+    print(f"Artifacts checked: {', '.join(documents)}")
+
+    sections = [
+        ('counts', 'DECLARED COUNTS'),
+        ('coverage', 'SERVER COVERAGE'),
+        ('duplicates', 'DUPLICATE ENTRIES'),
+        ('name', 'NAMES'),
+        ('package', 'PACKAGES'),
+        ('category', 'CATEGORIES'),
+        ('repository', 'REPOSITORIES'),
+    ]
+    for kind, title in sections:
+        print(f'\n=== {title} ===')
+        if report[kind]:
+            print(f'{len(report[kind])} mismatch(es):')
+            for line in report[kind]:
+                print(f'  {line}')
+        else:
+            print('✅ Consistent')
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Check that all MCP server artifacts agree with each other')
+    for artifact, path in DEFAULT_ARTIFACTS.items():
+        parser.add_argument(f'--{artifact}', default=path, metavar='PATH', help=f'{artifact} artifact')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    documents = load_documents({artifact: getattr(args, artifact) for artifact in DEFAULT_ARTIFACTS})
+    report = check_consistency(documents)
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print_report(report, documents)
+
+    total = sum(len(lines) for lines in report.values())
+    if not args.json:
+        print('\n' + (f'❌ {total} inconsistencies found' if total else '✅ All artifacts consistent'))
+    return 1 if total else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_profiled(main))
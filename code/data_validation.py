@@ -1,62 +1,97 @@
 #!/usr/bin/env python3
 
-import json
+import argparse
+from typing import Dict, List, Tuple
 
-def validate_mcp_data():
-    # Load and analyze the comprehensive MCP directory
-    with open('/workspace/data/comprehensive_mcp_directory.json', 'r') as f:
-        data = json.load(f)
+from profiling import MemoryProfiler, add_profile_arguments, run_profiled
+from validation_cache import DEFAULT_CACHE_FILE, ValidationCache
 
-    print('=== DATA VALIDATION REPORT ===')
-    print(f'Total MCP servers in database: {len(data)}')
+DEFAULT_DATA_FILE = '/workspace/data/comprehensive_mcp_directory.json'
+
+REQUIRED_FIELDS = ['name', 'description', 'category', 'github_url', 'installation_command']
+
+# Bump whenever a check changes so cached results from the old rules are ignored
+RULESET_VERSION = 2
+RULESET = f"data_validation:{RULESET_VERSION}:{','.join(REQUIRED_FIELDS)}"
+
+def check_server(server: Dict, required_fields: List[str] = REQUIRED_FIELDS) -> Dict:
+    """Missing/empty required fields and GitHub URL issue of a single server"""
+    github_url = server.get('github_url', '')
+    return {
+        'name': server.get('name', 'Unknown'),
+        'category': server.get('category') or 'Uncategorized',
+        'missing': [field for field in required_fields if field not in server or not server[field]],
+        'github_issue': (f"{server.get('name', 'Unknown')}: {github_url}"
+                         if github_url and not github_url.startswith('https://github.com/') else None),
+    }
+
+def collect_issues(results: List[Dict]) -> Tuple[Dict[str, List[str]], List[str]]:
+    """Fold per-server results into (field -> server names, GitHub URL issues)"""
+    missing_fields = {}
+    github_issues = []
+    for result in results:
+        for field in result['missing']:
+            missing_fields.setdefault(field, []).append(result['name'])
+        if result['github_issue']:
+            github_issues.append(result['github_issue'])
+    return missing_fields, github_issues
+
+def check_servers(servers: List[Dict], required_fields: List[str] = REQUIRED_FIELDS) -> Tuple[Dict[str, List[str]], List[str]]:
+    """Missing/empty required fields (field -> server names) and malformed GitHub URLs"""
+    return collect_issues([check_server(server, required_fields) for server in servers])
 
-    # Count categories
+def _check_record(key: str, server: Dict) -> Dict:
+    result = check_server(server)
+    result['sample'] = {field: server.get(field, 'N/A')
+                        for field in ('category', 'github_url', 'installation_command')}
+    return result
+
+def _summarize(document: Dict, results: Dict[str, Dict]) -> Dict:
+    records = list(results.values())
     categories = {}
-    for server in data:
-        category = server.get('category', 'Unknown')
-        categories[category] = categories.get(category, 0) + 1
+    for result in records:
+        categories[result['category']] = categories.get(result['category'], 0) + 1
+    missing_fields, github_issues = collect_issues(records)
+    return {
+        'total_servers': len(records),
+        'categories': dict(sorted(categories.items())),
+        'missing_fields': missing_fields,
+        'github_issues': github_issues,
+        'samples': [dict(result['sample'], name=result['name']) for result in records[:3]],
+    }
+
+def print_report(report: Dict):
+    print('=== DATA VALIDATION REPORT ===')
+    print(f"Total MCP servers in database: {report['total_servers']}")
 
+    categories = report['categories']
     print(f'Total categories: {len(categories)}')
     print('\nCategory breakdown:')
-    for category, count in sorted(categories.items()):
+    for category, count in categories.items():
         print(f'  {category}: {count} servers')
 
     # Validate required fields
     print('\n=== FIELD VALIDATION ===')
-    required_fields = ['name', 'description', 'category', 'github_url', 'installation_command']
-    missing_fields = {}
-
-    for server in data:
-        for field in required_fields:
-            if field not in server or not server[field]:
-                if field not in missing_fields:
-                    missing_fields[field] = []
-                missing_fields[field].append(server.get('name', 'Unknown'))
-
+    missing_fields = report['missing_fields']
     if missing_fields:
         print('Missing or empty fields found:')
-        for field, servers in missing_fields.items():
-            print(f'  {field}: {len(servers)} servers affected - {servers[:3]}...')
+        for field, servers_missing in missing_fields.items():
+            print(f'  {field}: {len(servers_missing)} servers affected - {servers_missing[:3]}...')
     else:
         print('✅ All required fields present and populated')
 
     # Sample few servers for verification
     print('\n=== SAMPLE SERVERS ===')
-    for i, server in enumerate(data[:3]):
+    for i, server in enumerate(report['samples']):
         print(f'{i+1}. {server["name"]}')
-        print(f'   Category: {server.get("category", "N/A")}')
-        print(f'   GitHub: {server.get("github_url", "N/A")}')
-        print(f'   Install: {server.get("installation_command", "N/A")}')
+        print(f'   Category: {server["category"]}')
+        print(f'   GitHub: {server["github_url"]}')
+        print(f'   Install: {server["installation_command"]}')
         print()
 
     # Verify GitHub URL format
     print('\n=== GITHUB URL VALIDATION ===')
-    github_issues = []
-    for server in data:
-        github_url = server.get('github_url', '')
-        if github_url and not github_url.startswith('https://github.com/'):
-            github_issues.append(f"{server['name']}: {github_url}")
-    
+    github_issues = report['github_issues']
     if github_issues:
         print(f'GitHub URL format issues: {len(github_issues)}')
         for issue in github_issues[:3]:
@@ -64,7 +99,41 @@ def validate_mcp_data():
     else:
         print('✅ All GitHub URLs properly formatted')
 
-    return len(data), len(categories)
+def validate_mcp_data(profiler: MemoryProfiler = None, data_file: str = DEFAULT_DATA_FILE,
+                      cache: ValidationCache = None):
+    profiler = profiler or MemoryProfiler()
+    cache = cache or ValidationCache(enabled=False)
+
+    # Unchanged file: stored report; changed file: only changed records are rechecked.
+    # The cache opens the 'load' and 'field checks' stages itself.
+    report, stats = cache.validate(data_file, RULESET, _check_record, _summarize,
+                                   stage=profiler.stage)
+
+    print_report(report)
+    if cache.enabled:
+        if stats.file_hit:
+            print(f'\n(cached report, {data_file} unchanged)')
+        else:
+            print(f'\n(checked {stats.records_checked} servers, reused {stats.records_reused} cached results)')
+
+    return report['total_servers'], len(report['categories'])
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate the comprehensive MCP directory')
+    parser.add_argument('--data-file', default=DEFAULT_DATA_FILE, help='directory JSON to validate')
+    parser.add_argument('--cache-file', default=DEFAULT_CACHE_FILE,
+                        help='validation cache location (env MCP_VALIDATION_CACHE)')
+    parser.add_argument('--no-cache', action='store_true', help='validate every server from scratch')
+    parser.add_argument('--memprofile', action='store_true',
+                        help='report tracemalloc peak usage and top allocation sites per stage')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    profiler = MemoryProfiler(enabled=args.memprofile)
+    cache = ValidationCache(args.cache_file, enabled=not args.no_cache)
+    result = validate_mcp_data(profiler, args.data_file, cache)
+    profiler.report()
+    return result
 
 if __name__ == "__main__":
-    total_servers, total_categories = validate_mcp_data()
\ No newline at end of file
+    total_servers, total_categories = run_profiled(main)
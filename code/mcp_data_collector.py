@@ -2,14 +2,33 @@
 """
 MCP Data Collector
 Systematically collects and organizes MCP server information from multiple sources
+
+Run with --watch to rebuild the database whenever the browser extract, the
+examples document or this file changes (see catalog_watch.py). Entries from
+different sources merge into one record, so every rebuild re-parses all
+sources and re-renders the derived files from the full record set; nothing is
+published when no record changed, and unchanged files are not rewritten.
 """
 
+import argparse
 import json
 import os
+import time
 from pathlib import Path
 from typing import Dict, List, Set, Any
 import re
 
+from catalog_binary import encode_binary_catalog
+from catalog_columnar import encode_columnar
+from catalog_publish import canonical_json, publish_artifacts
+from catalog_watch import DEFAULT_DEBOUNCE, FileWatcher, load_module_from, run_watch
+from profiling import MemoryProfiler, add_profile_arguments, run_profiled
+from trigram_index import TrigramIndex
+
+BROWSER_FILE = "/workspace/browser/extracted_content/mcp_servers_complete_list.md"
+EXAMPLES_FILE = "/workspace/docs/mcp_examples.md"
+OUTPUT_DIRS = ['/workspace/data', '/workspace/mcp-navigator/public/data']
+
 class MCPDataCollector:
     def __init__(self):
         self.mcp_servers = {}
@@ -18,7 +37,7 @@ class MCPDataCollector:
         
     def load_browser_extracted_data(self):
         """Load data from browser extracted content"""
-        browser_file = "/workspace/browser/extracted_content/mcp_servers_complete_list.md"
+        browser_file = BROWSER_FILE
         if os.path.exists(browser_file):
             with open(browser_file, 'r', encoding='utf-8') as f:
                 content = f.read()
@@ -27,7 +46,7 @@ class MCPDataCollector:
                 
     def load_examples_data(self):
         """Load official examples data"""
-        examples_file = "/workspace/docs/mcp_examples.md"
+        examples_file = EXAMPLES_FILE
         if os.path.exists(examples_file):
             try:
                 with open(examples_file, 'r', encoding='utf-8') as f:
@@ -207,7 +226,7 @@ class MCPDataCollector:
                 'servers': servers[:10]  # Top 10 for preview
             })
         
-        return sorted(categories, key=lambda x: x['count'], reverse=True)
+        return sorted(categories, key=lambda x: (-x['count'], x['name']))
     
     def _get_category_icon(self, category_name: str) -> str:
         """Get icon suggestion for category"""
@@ -270,38 +289,64 @@ class MCPDataCollector:
         for server in popular_servers:
             self._add_server(**server)
     
-    def export_to_json(self, output_file: str):
-        """Export collected data to JSON"""
-        export_data = {
+    def build_export_data(self) -> Dict:
+        """Build the row-oriented export document"""
+        return {
             'metadata': {
                 'total_servers': len(self.mcp_servers),
-                'categories': list(self.categories),
+                'categories': sorted(self.categories),
                 'collection_date': '2025-05-26',
-                'sources': list(set(server.get('source', '') for server in self.mcp_servers.values()))
+                'sources': sorted(set(server.get('source', '') for server in self.mcp_servers.values()))
             },
             'categories': self.generate_categories(),
             'servers': self.mcp_servers
         }
+    
+    def export_to_json(self, output_file: str):
+        """Export collected data to JSON
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
+        Kept for existing callers; the collector itself publishes every
+        artifact through render_artifacts() and publish_artifacts().
+        """
+        export_data = self.build_export_data()
+        
+        with open(output_file, 'wb') as f:
+            f.write(canonical_json(export_data, indent=2))
         
         print(f"Exported {len(self.mcp_servers)} servers to {output_file}")
         return export_data
-
-def main():
-    """Main execution function"""
+    
+    def render_artifacts(self, base_name: str = 'mcp_servers_database') -> Dict[str, bytes]:
+        """All exported files as deterministic bytes, keyed by file name (see catalog_publish)"""
+        export_data = self.build_export_data()
+        columnar_data = dict(export_data, servers=encode_columnar(self.mcp_servers))
+        search_index = TrigramIndex.build(self.mcp_servers)
+        
+        return {
+            f'{base_name}.json': canonical_json(export_data, indent=2),
+            f'{base_name}.columnar.json': canonical_json(columnar_data),
+            f'{base_name}.mcpb': encode_binary_catalog(self.mcp_servers),
+            f'{base_name}.trigram.json': canonical_json(search_index.to_dict()),
+        }
+    
+def collect(verbose: bool = True, profiler: MemoryProfiler = None) -> MCPDataCollector:
+    """Run every source loader and return the populated collector"""
     collector = MCPDataCollector()
+    log = print if verbose else (lambda *args: None)
+    profiler = profiler or MemoryProfiler()
     
     # Load data from various sources
-    print("Loading browser extracted data...")
-    collector.load_browser_extracted_data()
+    log("Loading browser extracted data...")
+    with profiler.stage('browser data'):
+        collector.load_browser_extracted_data()
     
-    print("Loading examples data...")
-    collector.load_examples_data()
+    log("Loading examples data...")
+    with profiler.stage('examples data'):
+        collector.load_examples_data()
     
-    print("Adding manually curated servers...")
-    collector.add_manual_servers()
+    log("Adding manually curated servers...")
+    with profiler.stage('manual servers'):
+        collector.add_manual_servers()
     
     # Add some well-known servers manually to ensure completeness
     well_known_servers = [
@@ -342,14 +387,70 @@ def main():
         }
     ]
     
-    for server in well_known_servers:
-        collector._add_server(**server)
+    with profiler.stage('well-known servers'):
+        for server in well_known_servers:
+            collector._add_server(**server)
+    
+    return collector
+
+def watch(output_dirs: List[str] = OUTPUT_DIRS, debounce: float = DEFAULT_DEBOUNCE):
+    """Rebuild the database whenever a source file (or this collector) changes"""
+    collector_file = os.path.abspath(__file__)
+    collector = collect(verbose=False)
+    
+    publish_artifacts(collector.render_artifacts(), output_dirs)
+    watcher = FileWatcher([BROWSER_FILE, EXAMPLES_FILE, collector_file])
+    print(f"Watching {len(watcher.paths)} source files ({watcher.backend})")
+    
+    def rebuild(changed):
+        nonlocal collector
+        started = time.perf_counter()
+        # Entries from different sources merge into one record, so re-parse all
+        # sources (cheap) and only re-render when a record actually differs
+        fresh = load_module_from(collector_file, '_mcp_data_collector_watch').collect(verbose=False)
+        previous = collector.mcp_servers
+        affected = {key for key in previous.keys() | fresh.mcp_servers.keys()
+                    if previous.get(key) != fresh.mcp_servers.get(key)}
+        collector = fresh
+        
+        if not affected:
+            print("No server records changed")
+            return
+        manifest = publish_artifacts(collector.render_artifacts(), output_dirs)
+        elapsed = (time.perf_counter() - started) * 1000
+        current = manifest['files']['mcp_servers_database.json']['path']
+        print(f"{len(affected)} record(s) changed, published {current} in {elapsed:.0f} ms")
+    
+    run_watch(watcher, rebuild, debounce)
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description='Collect MCP server information from all sources')
+    parser.add_argument('--watch', action='store_true',
+                        help='keep running and rebuild both data directories when a source changes')
+    parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE,
+                        help='seconds of quiet before a watch rebuild (default: %(default)s)')
+    parser.add_argument('--memprofile', action='store_true',
+                        help='report tracemalloc peak usage and top allocation sites per stage')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    
+    if args.watch:
+        return watch(debounce=args.debounce)
     
-    # Export data
-    output_file = '/workspace/data/mcp_servers_database.json'
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    profiler = MemoryProfiler(enabled=args.memprofile)
+    collector = collect(profiler=profiler)
     
-    export_data = collector.export_to_json(output_file)
+    # Export data: hashed files + manifest.json in both data directories
+    with profiler.stage('categorize'):
+        export_data = collector.build_export_data()
+    with profiler.stage('render'):
+        artifacts = collector.render_artifacts()
+    with profiler.stage('publish'):
+        manifest = publish_artifacts(artifacts, OUTPUT_DIRS)
+    for name, entry in sorted(manifest['files'].items()):
+        if name.startswith('mcp_servers_database.'):
+            print(f"Published {name} -> {entry['path']} ({entry['size']} bytes)")
     
     # Generate summary report
     print(f"\n=== MCP Collection Summary ===")
@@ -361,7 +462,8 @@ def main():
     for i, cat in enumerate(categories[:10]):
         print(f"  {i+1}. {cat['name']}: {cat['count']} servers")
     
+    profiler.report()
     return export_data
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_profiled(main)
\ No newline at end of file
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+mcp-nav
+Command-line lookup for the MCP server directory
+
+Subcommands:
+    mcp-nav search <query>           typo-tolerant search over names/descriptions
+    mcp-nav show <key>               details of one server
+    mcp-nav list-category [name]     categories, or the servers in one category
+    mcp-nav stats                    directory totals
+
+The command is meant to be fast enough for shell completion and editor
+integrations, so it imports nothing beyond argparse at startup. Each
+subcommand imports only the reader it needs, and prefers the precompiled
+artifacts written by comprehensive_mcp_collector.py:
+
+    data/comprehensive_mcp_directory.mcpb           (show, list-category, stats)
+    data/comprehensive_mcp_directory.trigram.json   (search)
+
+and falls back to comprehensive_mcp_directory.json when they are missing.
+
+The shared --profile flags (see profiling.py) are accepted anywhere on the
+command line, before or after the subcommand; the profiling module is only
+imported when one of them is present.
+
+Usage:
+    python code/mcp_nav.py search postgress
+    alias mcp-nav='python /path/to/code/mcp_nav.py'
+"""
+
+import argparse
+import os
+import sys
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+DIRECTORY_NAME = 'comprehensive_mcp_directory'
+
+
+def _paths(data_dir: str):
+    base = os.path.join(data_dir, DIRECTORY_NAME)
+    return base + '.json', base + '.mcpb', base + '.trigram.json'
+
+
+def _load_servers(data_dir: str):
+    import json
+
+    json_path, _, _ = _paths(data_dir)
+    with open(json_path, 'r', encoding='utf-8') as f:
+        return json.load(f)['servers']
+
+
+def _open_binary(data_dir: str):
+    """Binary catalog when one has been exported, else None"""
+    from catalog_binary import open_catalog
+
+    return open_catalog(_paths(data_dir)[1])
+
+
+def cmd_search(args) -> int:
+    from trigram_index import TrigramIndex
+
+    index_path = _paths(args.data_dir)[2]
+    if os.path.exists(index_path):
+        index = TrigramIndex.load(index_path)
+    else:
+        index = TrigramIndex.build(_load_servers(args.data_dir))
+
+    hits = index.search(' '.join(args.query), limit=args.limit)
+    for hit in hits:
+        if args.keys:
+            print(hit.key)
+        else:
+            print(f'{hit.key}\t{hit.name}')
+    return 0 if hits else 1
+
+
+def cmd_show(args) -> int:
+    catalog = _open_binary(args.data_dir)
+    if catalog is not None:
+        with catalog:
+            server = catalog.get(args.key)
+    else:
+        server = _load_servers(args.data_dir).get(args.key)
+
+    if server is None:
+        print(f'Unknown server: {args.key}', file=sys.stderr)
+        return 1
+
+    if args.json:
+        import json
+        print(json.dumps(server, indent=2, ensure_ascii=False))
+        return 0
+
+    popularity = (server.get('popularity_indicators') or {}).get('level', 'unknown')
+    print(server.get('name', args.key))
+    print(f"  {server.get('description', '')}")
+    print(f"  Category:     {server.get('category', 'N/A')}")
+    print(f"  Maintainer:   {server.get('creator_maintainer', 'N/A')}")
+    print(f"  Popularity:   {popularity}")
+    print(f"  Repository:   {server.get('repository_link', 'N/A')}")
+    print(f"  Install:      {server.get('installation_instructions', 'N/A')}")
+    return 0
+
+
+def cmd_list_category(args) -> int:
+    catalog = _open_binary(args.data_dir)
+
+    if not args.category:
+        if catalog is not None:
+            with catalog:
+                counts = catalog.category_counts()
+        else:
+            counts = {}
+            for server in _load_servers(args.data_dir).values():
+                counts[server['category']] = counts.get(server['category'], 0) + 1
+        for name in sorted(counts):
+            print(name if args.keys else f'{name}\t{counts[name]}')
+        return 0
+
+    if catalog is not None:
+        with catalog:
+            keys = catalog.keys_in_category(args.category)
+            keyed = list(zip(keys, catalog.by_category(args.category)))
+    else:
+        keyed = [(key, server) for key, server in _load_servers(args.data_dir).items()
+                 if server.get('category') == args.category]
+
+    if not keyed:
+        print(f'Unknown or empty category: {args.category}', file=sys.stderr)
+        return 1
+
+    for key, server in keyed:
+        print(key if args.keys else f"{key}\t{server['name']}")
+    return 0
+
+
+def cmd_stats(args) -> int:
+    catalog = _open_binary(args.data_dir)
+    if catalog is not None:
+        with catalog:
+            total = len(catalog)
+            counts = catalog.category_counts()
+    else:
+        servers = _load_servers(args.data_dir)
+        total = len(servers)
+        counts = {}
+        for server in servers.values():
+            counts[server['category']] = counts.get(server['category'], 0) + 1
+
+    print(f'Servers:    {total}')
+    print(f'Categories: {len(counts)}')
+    for name, count in sorted(counts.items(), key=lambda item: (-item[1], item[0])):
+        print(f'  {count:4d}  {name}')
+    return 0
+
+
+class _HelpFormatter(argparse.HelpFormatter):
+    """HelpFormatter that finds the terminal width without importing shutil
+
+    argparse builds a formatter for every add_argument call, and the stock one
+    imports shutil (and with it bz2, lzma and fnmatch) to size the terminal,
+    which is about 5 ms of a cold start.
+    """
+
+    def __init__(self, prog, indent_increment=2, max_help_position=24, width=None):
+        if width is None:
+            try:
+                width = int(os.environ['COLUMNS'])
+            except (KeyError, ValueError):
+                try:
+                    width = os.get_terminal_size().columns
+                except OSError:
+                    width = 80
+            width -= 2
+        super().__init__(prog, indent_increment, max_help_position, width)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='mcp-nav', description='Query the MCP server directory',
+                                     formatter_class=_HelpFormatter)
+    parser.add_argument('--data-dir', default=os.environ.get('MCP_NAV_DATA', DEFAULT_DATA_DIR),
+                        help='directory holding the exported catalog (default: repository data/)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    search = subparsers.add_parser('search', help='fuzzy search by name or description',
+                                   formatter_class=_HelpFormatter)
+    search.add_argument('query', nargs='+')
+    search.add_argument('-n', '--limit', type=int, default=10)
+    search.add_argument('--keys', action='store_true', help='print keys only (for completion)')
+    search.set_defaults(handler=cmd_search)
+
+    show = subparsers.add_parser('show', help='show one server', formatter_class=_HelpFormatter)
+    show.add_argument('key')
+    show.add_argument('--json', action='store_true', help='print the raw record')
+    show.set_defaults(handler=cmd_show)
+
+    list_category = subparsers.add_parser('list-category', help='list categories or the servers in one',
+                                          formatter_class=_HelpFormatter)
+    list_category.add_argument('category', nargs='?')
+    list_category.add_argument('--keys', action='store_true', help='print names/keys only (for completion)')
+    list_category.set_defaults(handler=cmd_list_category)
+
+    stats = subparsers.add_parser('stats', help='directory totals', formatter_class=_HelpFormatter)
+    stats.set_defaults(handler=cmd_stats)
+
+    return parser
+
+
+def _run(args) -> int:
+    try:
+        return args.handler(args)
+    except FileNotFoundError as e:
+        print(f'Catalog not found: {e.filename}', file=sys.stderr)
+        return 2
+    except BrokenPipeError:
+        return 0
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    parser = build_parser()
+    if not any(arg.startswith('--profile') for arg in argv):
+        return _run(parser.parse_args(argv))
+
+    from profiling import add_profile_arguments, run_profiled
+
+    # Strip the profile flags first so they may follow the subcommand too
+    profile_parser = argparse.ArgumentParser(add_help=False)
+    add_profile_arguments(profile_parser)
+    _, rest = profile_parser.parse_known_args(argv)
+    args = parser.parse_args(rest)
+    return run_profiled(lambda: _run(args), argv, name='mcp-nav')
+
+
+if __name__ == "__main__":
+    sys.exit(main())
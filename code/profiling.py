@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Profiling
+Opt-in profiling hooks shared by the command-line tools
+
+MemoryProfiler (``--memprofile``) wraps pipeline stages in tracemalloc
+snapshots and reports, per stage:
+
+    peak      highest traced memory while the stage ran
+    net       memory still held when it finished
+    top       allocation sites that grew the most across the stage,
+              from a diff against the snapshot taken before it
+
+plus the largest live allocation sites at the end of the run.
+
+    profiler = MemoryProfiler(enabled=args.memprofile)
+    with profiler.stage('load'):
+        collector.load_comprehensive_server_list()
+    profiler.report()
+
+With ``enabled=False`` every call is a no-op, so the hooks can stay in place.
+
+run_profiled (``--profile``) runs a whole entry point under a CPU profiler:
+
+    deterministic   cProfile; writes PREFIX.pstats and PREFIX.collapsed (call
+                    graph unrolled into flamegraph.pl / speedscope stacks,
+                    in microseconds) and prints the top functions by
+                    cumulative time
+    sampling        a background thread samples every thread's stack each
+                    --profile-interval ms; writes PREFIX.sampled.collapsed
+                    with true stacks at a few percent overhead
+    both            both of the above
+
+Entry points opt in with two lines:
+
+    add_profile_arguments(parser)          # so --help and parse_args know the flags
+    ...
+    if __name__ == "__main__":
+        run_profiled(main)
+
+Output goes to profiles/<tool>-<timestamp>.* unless ``--profile-output PREFIX``
+is given.
+"""
+
+import argparse
+import linecache
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Dict, List, NamedTuple, Optional, TextIO
+
+DEFAULT_TOP = 8
+
+# Allocations made by the profiler itself or by the import machinery are noise
+_IGNORED_FILES = (__file__, tracemalloc.__file__, linecache.__file__, '<frozen importlib._bootstrap>',
+                  '<frozen importlib._bootstrap_external>', '<unknown>')
+
+
+class StageMemory(NamedTuple):
+    name: str
+    peak: int
+    net: int
+    top: List[tracemalloc.StatisticDiff]
+
+
+def _format_bytes(size: int) -> str:
+    sign = '-' if size < 0 else ''
+    size = abs(size)
+    for unit in ('B', 'KiB', 'MiB'):
+        if size < 1024:
+            return f'{sign}{size:.0f} {unit}' if unit == 'B' else f'{sign}{size:.1f} {unit}'
+        size /= 1024
+    return f'{sign}{size:.1f} GiB'
+
+
+def _site(traceback: tracemalloc.Traceback) -> str:
+    frame = traceback[0]
+    filename = frame.filename
+    if os.path.isabs(filename):
+        relative = os.path.relpath(filename)
+        filename = filename if relative.startswith('..') else relative
+    return f'{filename}:{frame.lineno}'
+
+
+class MemoryProfiler:
+    """tracemalloc snapshots at stage boundaries"""
+
+    def __init__(self, enabled: bool = False, top: int = DEFAULT_TOP, frames: int = 1):
+        self.enabled = enabled
+        self.top = top
+        self.frames = frames
+        self.stages: List[StageMemory] = []
+        self._final: Optional[tracemalloc.Snapshot] = None
+        self._started_here = False
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, pattern) for pattern in _IGNORED_FILES])
+
+    def start(self) -> None:
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_here = True
+
+    @contextmanager
+    def stage(self, name: str):
+        """Profile the enclosed block as one stage"""
+        if not self.enabled:
+            yield
+            return
+
+        self.start()
+        before = self._snapshot()
+        current_before = tracemalloc.get_traced_memory()[0]
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        # Before Python 3.9 the peak cannot be reset and is the run's high-water mark
+        try:
+            yield
+        finally:
+            current_after, peak = tracemalloc.get_traced_memory()
+            after = self._snapshot()
+            growth = [diff for diff in after.compare_to(before, 'lineno') if diff.size_diff > 0]
+            self.stages.append(StageMemory(name, peak - current_before, current_after - current_before,
+                                           growth[:self.top]))
+            self._final = after
+
+    def stop(self) -> None:
+        if self._started_here:
+            tracemalloc.stop()
+            self._started_here = False
+
+    def report(self, file: TextIO = None) -> None:
+        """Print per-stage peaks, diffs and the largest live sites; stops tracing"""
+        if not self.enabled or not self.stages:
+            return
+        file = file or sys.stderr
+
+        print('\n=== MEMORY PROFILE (tracemalloc) ===', file=file)
+        print(f"{'stage':<24}{'peak':>12}{'net':>12}", file=file)
+        for stage in self.stages:
+            print(f'{stage.name:<24}{_format_bytes(stage.peak):>12}{_format_bytes(stage.net):>12}', file=file)
+
+        for stage in self.stages:
+            if not stage.top:
+                continue
+            print(f'\n[{stage.name}] top allocation growth:', file=file)
+            for diff in stage.top:
+                print(f'  {_format_bytes(diff.size_diff):>12}  {diff.count_diff:+9d} blocks  '
+                      f'{_site(diff.traceback)}', file=file)
+
+        if self._final is not None:
+            print('\nLargest live allocation sites at end of run:', file=file)
+            for statistic in self._final.statistics('lineno')[:self.top]:
+                print(f'  {_format_bytes(statistic.size):>12}  {statistic.count:9d} blocks  '
+                      f'{_site(statistic.traceback)}', file=file)
+        self.stop()
+
+
+PROFILE_MODES = ('deterministic', 'sampling', 'both')
+DEFAULT_SAMPLE_INTERVAL_MS = 5.0
+DEFAULT_REPORT_TOP = 25
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the shared --profile flags on an entry point's parser"""
+    group = parser.add_argument_group('profiling')
+    group.add_argument('--profile', action='store_true',
+                       help='profile this run and write pstats / collapsed-stack files')
+    group.add_argument('--profile-output', metavar='PREFIX',
+                       help='output path prefix (default: profiles/<tool>-<timestamp>)')
+    group.add_argument('--profile-mode', choices=PROFILE_MODES, default='deterministic',
+                       help='cProfile, low-overhead stack sampling, or both (default: %(default)s)')
+    group.add_argument('--profile-interval', type=float, default=DEFAULT_SAMPLE_INTERVAL_MS,
+                       metavar='MS', help='sampling interval in milliseconds (default: %(default)s)')
+    group.add_argument('--profile-top', type=int, default=DEFAULT_REPORT_TOP, metavar='N',
+                       help='functions listed in the cumulative-time report (default: %(default)s)')
+
+
+def _frame_label(code) -> str:
+    return f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+
+
+class StackSampler:
+    """Samples the stacks of all other threads at a fixed interval"""
+
+    def __init__(self, interval: float, root_code=None):
+        self.interval = interval
+        # Frames above the profiled entry point (the profiler's own wrappers) are dropped
+        self.root_code = root_code
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+        self._caller: Optional[int] = None
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                if ident not in names:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    if frame.f_code is self.root_code:
+                        break
+                    frame = frame.f_back
+                # The profiled thread outside the entry point (already in stop()) is not part of the run
+                if frame is None and self.root_code is not None and ident == self._caller:
+                    continue
+                stack.append(names.get(ident, f'thread-{ident}'))
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        self._caller = threading.get_ident()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def write_collapsed(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.samples.items()):
+                f.write(f'{stack} {count}\n')
+
+    def top_functions(self, limit: int) -> List[tuple]:
+        """(inclusive samples, function) for the most frequently sampled functions"""
+        inclusive: Counter = Counter()
+        for stack, count in self.samples.items():
+            for label in set(stack.split(';')[1:]):
+                inclusive[label] += count
+        return [(count, label) for label, count in inclusive.most_common(limit)]
+
+
+def _pstats_label(function: tuple) -> str:
+    filename, line, name = function
+    if filename == '~':
+        return name
+    return f'{name} ({os.path.basename(filename)}:{line})'
+
+
+def collapse_pstats(stats) -> Dict[str, int]:
+    """Unroll a cProfile call graph into collapsed stacks (microseconds)
+
+    cProfile records caller -> callee edges, not full stacks, so each callee's
+    time is split across call paths in proportion to the edge's cumulative
+    time. Recursion is cut at the first repeated frame.
+    """
+    table = stats.stats
+    callees: Dict[tuple, Dict[tuple, float]] = {}
+    for function, (_, _, _, _, callers) in table.items():
+        for caller, (_, _, _, caller_cumulative) in callers.items():
+            callees.setdefault(caller, {})[function] = caller_cumulative
+
+    roots = [function for function, entry in table.items() if not entry[4]]
+    stacks: Counter = Counter()
+
+    def walk(function: tuple, share: float, path: tuple) -> None:
+        _, _, total, cumulative, _ = table[function]
+        if cumulative <= 0 or share <= 0:
+            return
+        scale = min(1.0, share / cumulative)
+        path = path + (_pstats_label(function),)
+        own = total * scale
+        if own > 0:
+            stacks[';'.join(path)] += own
+        for callee, edge in callees.get(function, {}).items():
+            if _pstats_label(callee) not in path:
+                walk(callee, edge * scale, path)
+
+    for root in roots:
+        walk(root, table[root][3], ())
+    return {stack: int(seconds * 1e6) for stack, seconds in stacks.items() if seconds * 1e6 >= 1}
+
+
+class ProfileSession:
+    """One profiled run of an entry point"""
+
+    def __init__(self, prefix: str, mode: str = 'deterministic',
+                 interval_ms: float = DEFAULT_SAMPLE_INTERVAL_MS, top: int = DEFAULT_REPORT_TOP):
+        self.prefix = prefix
+        self.mode = mode
+        self.interval = interval_ms / 1000.0
+        self.top = top
+
+    def run(self, main: Callable[[], object]):
+        import cProfile
+
+        directory = os.path.dirname(self.prefix)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        profiler = cProfile.Profile() if self.mode in ('deterministic', 'both') else None
+        sampler = (StackSampler(self.interval, getattr(main, '__code__', None))
+                   if self.mode in ('sampling', 'both') else None)
+
+        if sampler:
+            sampler.start()
+        started = time.perf_counter()
+        try:
+            return profiler.runcall(main) if profiler else main()
+        finally:
+            elapsed = time.perf_counter() - started
+            if sampler:
+                sampler.stop()
+            self._write(profiler, sampler, elapsed)
+
+    def _write(self, profiler, sampler: Optional[StackSampler], elapsed: float) -> None:
+        out = sys.stderr
+        print(f'\n=== PROFILE ({self.mode}, {elapsed:.3f} s wall) ===', file=out)
+
+        if profiler is not None:
+            import pstats
+
+            stats_path = self.prefix + '.pstats'
+            profiler.dump_stats(stats_path)
+            stats = pstats.Stats(stats_path, stream=out)
+            collapsed_path = self.prefix + '.collapsed'
+            with open(collapsed_path, 'w', encoding='utf-8') as f:
+                for stack, micros in sorted(collapse_pstats(stats).items()):
+                    f.write(f'{stack} {micros}\n')
+            stats.sort_stats('cumulative').print_stats(self.top)
+            print(f'pstats:           {stats_path}', file=out)
+            print(f'collapsed stacks: {collapsed_path}', file=out)
+
+        if sampler is not None:
+            sampled_path = self.prefix + '.sampled.collapsed'
+            sampler.write_collapsed(sampled_path)
+            total = sum(sampler.samples.values())
+            print(f'{total} samples every {self.interval * 1000:g} ms; top functions (inclusive):', file=out)
+            for count, label in sampler.top_functions(self.top):
+                print(f'  {count / total * 100 if total else 0:6.1f}%  {label}', file=out)
+            print(f'sampled stacks:   {sampled_path}', file=out)
+
+
+def run_profiled(main: Callable[[], object], argv: Optional[List[str]] = None, name: Optional[str] = None):
+    """Run ``main()``, under a profiler when the command line asks for one"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not any(arg.startswith('--profile') for arg in argv):
+        return main()
+
+    parser = argparse.ArgumentParser(add_help=False)
+    add_profile_arguments(parser)
+    options, _ = parser.parse_known_args(argv)
+    if not options.profile:
+        return main()
+
+    prefix = options.profile_output
+    if not prefix:
+        tool = name or os.path.splitext(os.path.basename(sys.argv[0]))[0] or 'python'
+        prefix = os.path.join('profiles', f"{tool}-{time.strftime('%Y%m%d-%H%M%S')}")
+    session = ProfileSession(prefix, options.profile_mode, options.profile_interval, options.profile_top)
+    return session.run(main)
@@ -1,19 +1,64 @@
 #!/usr/bin/env python3
 
-import json
+import argparse
+from typing import Dict
 
-# Quick data validation
-with open('/workspace/data/comprehensive_mcp_directory.json', 'r') as f:
-    data = json.load(f)
+from profiling import add_profile_arguments, run_profiled
+from validation_cache import DEFAULT_CACHE_FILE, ValidationCache
 
-print("=== QUICK DATA VALIDATION ===")
-print(f"Metadata shows: {data['metadata']['total_servers']} servers, {data['metadata']['total_categories']} categories")
-print(f"Servers array length: {len(data['servers'])}")
-print(f"Categories array length: {len(data['categories'])}")
+DEFAULT_DATA_FILE = '/workspace/data/comprehensive_mcp_directory.json'
 
-# Sample server check
-sample_server = data['servers'][0]
-print(f"\nSample server: {sample_server['name']}")
-print(f"Has required fields: {all(field in sample_server for field in ['name', 'description', 'category', 'github_url', 'installation_command'])}")
+REQUIRED_FIELDS = ['name', 'description', 'category', 'github_url', 'installation_command']
 
-print("\n✅ Data structure validation: PASSED")
\ No newline at end of file
+# Bump whenever a check changes so cached results from the old rules are ignored
+RULESET_VERSION = 1
+RULESET = f"quick_data_check:{RULESET_VERSION}:{','.join(REQUIRED_FIELDS)}"
+
+def _check_record(key: str, server: Dict) -> Dict:
+    return {
+        'name': server.get('name', key),
+        'has_required_fields': all(field in server for field in REQUIRED_FIELDS),
+    }
+
+def _summarize(document: Dict, results: Dict[str, Dict]) -> Dict:
+    sample = next(iter(results.values()), None)
+    return {
+        'metadata_servers': document['metadata']['total_servers'],
+        'metadata_categories': document['metadata']['total_categories'],
+        'servers': len(results),
+        'categories': len(document['categories']),
+        'sample': sample,
+        'all_have_required_fields': all(result['has_required_fields'] for result in results.values()),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Quick structural check of the MCP directory')
+    parser.add_argument('--data-file', default=DEFAULT_DATA_FILE, help='directory JSON to check')
+    parser.add_argument('--cache-file', default=DEFAULT_CACHE_FILE,
+                        help='validation cache location (env MCP_VALIDATION_CACHE)')
+    parser.add_argument('--no-cache', action='store_true', help='check every server from scratch')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    # Quick data validation
+    cache = ValidationCache(args.cache_file, enabled=not args.no_cache)
+    report, stats = cache.validate(args.data_file, RULESET, _check_record, _summarize)
+
+    print("=== QUICK DATA VALIDATION ===")
+    print(f"Metadata shows: {report['metadata_servers']} servers, {report['metadata_categories']} categories")
+    print(f"Servers array length: {report['servers']}")
+    print(f"Categories array length: {report['categories']}")
+
+    # Sample server check
+    sample = report['sample']
+    if sample:
+        print(f"\nSample server: {sample['name']}")
+        print(f"Has required fields: {sample['has_required_fields']}")
+    print(f"All servers have required fields: {report['all_have_required_fields']}")
+    if stats.file_hit:
+        print("(cached result, data file unchanged)")
+
+    print("\n✅ Data structure validation: PASSED")
+
+if __name__ == "__main__":
+    run_profiled(main)
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Trigram Search Index
+Typo-tolerant lookup over server names and descriptions
+
+Exact substring search finds nothing for "postgress" or "git hub". This
+index splits names and descriptions into terms, indexes every distinct term
+by its padded trigrams, and answers a query in two steps:
+
+    1. candidate generation: terms sharing enough trigrams with the query
+       (an edit distance of k can destroy at most 3k trigrams, which gives a
+       lower bound on the overlap of any term within reach)
+    2. ranking: Levenshtein distance on the surviving candidates only, using
+       a bit-parallel kernel, keeping matches within the typo budget
+
+Only the term vocabulary is scanned, never the full server list, and
+documents are collected best-score-first so a search stops as soon as it
+has ``limit`` results. Names are indexed both whole, with spaces removed
+("git hub" -> "github"), and word by word; description words rank below
+name matches of the same distance.
+
+The index is written next to the directory at export time and can be loaded
+back without re-tokenising:
+
+    index = TrigramIndex.load('data/comprehensive_mcp_directory.trigram.json')
+    index.search('postgress')   # -> [SearchHit(key='postgresql', ...)]
+"""
+
+import heapq
+import json
+import re
+from collections import Counter
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+FORMAT_NAME = 'mcp-trigram'
+FORMAT_VERSION = 1
+
+FIELD_NAME = 0
+FIELD_DESCRIPTION = 1
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+_MIN_DESCRIPTION_WORD = 3
+_MIN_PREFIX_QUERY = 3
+
+
+class SearchHit(NamedTuple):
+    key: str
+    name: str
+    distance: int
+    field: int
+
+
+def normalize(text: str) -> List[str]:
+    """Lowercase words with punctuation stripped"""
+    return _WORD_RE.findall(text.lower())
+
+
+def trigrams(term: str) -> List[str]:
+    """Distinct trigrams of ``term`` padded with two leading and one trailing space"""
+    padded = f'  {term} '
+    return list(dict.fromkeys(padded[i:i + 3] for i in range(len(padded) - 2)))
+
+
+def max_distance_for(term: str) -> int:
+    """Default typo budget: none for short queries, up to two for long ones"""
+    if len(term) <= 3:
+        return 0
+    if len(term) <= 5:
+        return 1
+    return 2
+
+
+class _Pattern:
+    """Bit-parallel edit distance (Myers/Hyyrö) against one fixed query term
+
+    The per-character match masks are built once per query, so scoring a
+    candidate is a single pass over its characters with a handful of integer
+    operations, independent of the query length for terms up to machine size.
+    """
+
+    def __init__(self, term: str):
+        self.length = len(term)
+        self.full = (1 << self.length) - 1
+        self.last = 1 << (self.length - 1) if term else 0
+        self.masks: Dict[str, int] = {}
+        for position, char in enumerate(term):
+            self.masks[char] = self.masks.get(char, 0) | (1 << position)
+
+    def distances(self, text: str) -> Tuple[int, int]:
+        """(distance to ``text``, smallest distance to any prefix of ``text``)"""
+        if not self.length:
+            return len(text), 0
+
+        full, last, masks = self.full, self.last, self.masks
+        positive, negative = full, 0
+        score = best_prefix = self.length
+        for char in text:
+            match = masks.get(char, 0)
+            vertical = match | negative
+            horizontal = (((match & positive) + positive) ^ positive) | match
+            plus = negative | (~(horizontal | positive) & full)
+            minus = positive & horizontal
+            if plus & last:
+                score += 1
+            elif minus & last:
+                score -= 1
+                if score < best_prefix:
+                    best_prefix = score
+            plus = ((plus << 1) | 1) & full
+            minus = (minus << 1) & full
+            positive = minus | (~(vertical | plus) & full)
+            negative = plus & vertical
+        return score, best_prefix
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance between ``a`` and ``b``"""
+    return _Pattern(a).distances(b)[0]
+
+
+def _document_terms(server: Dict) -> Iterable[Tuple[str, int]]:
+    name_words = normalize(server.get('name', ''))
+    if name_words:
+        yield ''.join(name_words), FIELD_NAME
+    for word in name_words:
+        yield word, FIELD_NAME
+    for word in normalize(server.get('description', '')):
+        if len(word) >= _MIN_DESCRIPTION_WORD:
+            yield word, FIELD_DESCRIPTION
+
+
+class TrigramIndex:
+    """Term-level trigram index with bounded edit-distance ranking"""
+
+    def __init__(self, keys: List[str], names: List[str], terms: List[str],
+                 term_docs: List[List[List[int]]], grams: Dict[str, List[int]]):
+        self.keys = keys
+        self.names = names
+        self.terms = terms
+        # Per term: [doc ids matched by name, doc ids matched by description]
+        self.term_docs = term_docs
+        self.grams = grams
+        self._sort_names = [name.casefold() for name in names]
+
+    @classmethod
+    def build(cls, servers: Dict[str, Dict]) -> 'TrigramIndex':
+        keys = list(servers)
+        names = [servers[key].get('name', key) for key in keys]
+        term_ids: Dict[str, int] = {}
+        terms: List[str] = []
+        term_docs: List[List[List[int]]] = []
+
+        for doc_id, key in enumerate(keys):
+            seen = set()
+            for term, field in _document_terms(servers[key]):
+                if (term, field) in seen:
+                    continue
+                seen.add((term, field))
+                term_id = term_ids.get(term)
+                if term_id is None:
+                    term_id = term_ids[term] = len(terms)
+                    terms.append(term)
+                    term_docs.append([[], []])
+                term_docs[term_id][field].append(doc_id)
+
+        grams: Dict[str, List[int]] = {}
+        for term_id, term in enumerate(terms):
+            for gram in trigrams(term):
+                grams.setdefault(gram, []).append(term_id)
+
+        return cls(keys, names, terms, term_docs, grams)
+
+    def to_dict(self) -> Dict:
+        return {
+            'format': FORMAT_NAME,
+            'version': FORMAT_VERSION,
+            'keys': self.keys,
+            'names': self.names,
+            'terms': self.terms,
+            'term_docs': self.term_docs,
+            'grams': self.grams,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'TrigramIndex':
+        if data.get('format') != FORMAT_NAME:
+            raise ValueError(f"Not a trigram index: {data.get('format')!r}")
+        if data.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported trigram index version: {data.get('version')!r}")
+        return cls(data['keys'], data['names'], data['terms'], data['term_docs'], data['grams'])
+
+    def save(self, output_file: str) -> None:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, separators=(',', ':'), ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str) -> 'TrigramIndex':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def match_terms(self, term: str, max_distance: Optional[int] = None) -> Dict[int, Tuple[int, int]]:
+        """Term ids within ``max_distance`` of ``term`` -> (distance, 1 if prefix match else 0)"""
+        bound = max_distance_for(term) if max_distance is None else max_distance
+        # Prefix matches get one typo less than whole-term matches
+        prefix_bound = bound - 1 if len(term) >= _MIN_PREFIX_QUERY else -1
+        query_grams = trigrams(term)
+
+        # Each edit destroys at most 3 trigrams; a prefix match also loses the
+        # trailing-pad gram
+        min_overlap = max(1, len(query_grams) - 3 * bound)
+        min_prefix_overlap = max(1, len(query_grams) - 1 - 3 * max(prefix_bound, 0))
+
+        counts: Counter = Counter()
+        for gram in query_grams:
+            postings = self.grams.get(gram)
+            if postings:
+                counts.update(postings)
+
+        pattern = _Pattern(term)
+        term_length = len(term)
+        matches = {}
+        for term_id, overlap in counts.items():
+            if overlap < min_overlap:
+                continue
+            candidate = self.terms[term_id]
+            whole_reachable = abs(len(candidate) - term_length) <= bound
+            prefix_reachable = (prefix_bound >= 0 and overlap >= min_prefix_overlap
+                                and len(candidate) > term_length)
+            if not whole_reachable and not prefix_reachable:
+                continue
+            distance, prefix_distance = pattern.distances(candidate)
+            if whole_reachable and distance <= bound:
+                matches[term_id] = (distance, 0)
+            elif prefix_reachable and prefix_distance <= prefix_bound:
+                matches[term_id] = (prefix_distance, 1)
+        return matches
+
+    def _top_documents(self, term: str, max_distance: Optional[int], limit: int,
+                       exclude: Set[int]) -> List[Tuple[Tuple[int, int, int], int]]:
+        """Best ``limit`` documents for one term as ((distance, field, prefix), doc_id)"""
+        units = []
+        for term_id, (distance, prefix) in self.match_terms(term, max_distance).items():
+            for field, docs in enumerate(self.term_docs[term_id]):
+                if docs:
+                    units.append(((distance, field, prefix), docs))
+        units.sort(key=itemgetter(0))
+
+        results = []
+        seen = set(exclude)
+        for score, group in groupby(units, key=itemgetter(0)):
+            docs = {doc_id for _, members in group for doc_id in members if doc_id not in seen}
+            chosen = heapq.nsmallest(limit - len(results), docs, key=self._sort_names.__getitem__)
+            results.extend((score, doc_id) for doc_id in chosen)
+            if len(results) >= limit:
+                break
+            seen.update(docs)
+        return results
+
+    def _word_matches(self, words: List[str], max_distance: Optional[int], limit: int,
+                      exclude: Set[int]) -> List[Tuple[Tuple[int, int, int, int], int]]:
+        """Documents matched word by word; fewer missed words rank first"""
+        per_doc: Dict[int, List[Tuple[int, int, int]]] = {}
+        for word in words:
+            best: Dict[int, Tuple[int, int, int]] = {}
+            for term_id, (distance, prefix) in self.match_terms(word, max_distance).items():
+                for field, docs in enumerate(self.term_docs[term_id]):
+                    score = (distance, field, prefix)
+                    for doc_id in docs:
+                        if doc_id not in exclude and (doc_id not in best or score < best[doc_id]):
+                            best[doc_id] = score
+            for doc_id, score in best.items():
+                per_doc.setdefault(doc_id, []).append(score)
+
+        ranked = []
+        for doc_id, scores in per_doc.items():
+            rank = (
+                len(words) - len(scores),
+                sum(score[0] for score in scores),
+                max(score[1] for score in scores),
+                max(score[2] for score in scores),
+            )
+            ranked.append((rank, self._sort_names[doc_id], doc_id))
+        return [(rank, doc_id) for rank, _, doc_id in heapq.nsmallest(limit, ranked)]
+
+    def search(self, query: str, limit: int = 10, max_distance: Optional[int] = None) -> List[SearchHit]:
+        """Ranked fuzzy matches for ``query``"""
+        words = normalize(query)
+        if not words or limit <= 0:
+            return []
+
+        ranked = [
+            (doc_id, distance, field)
+            for (distance, field, _), doc_id in self._top_documents(''.join(words), max_distance, limit, set())
+        ]
+
+        # Multi-word queries fall back to matching each word separately
+        if len(words) > 1 and len(ranked) < limit:
+            found = {doc_id for doc_id, _, _ in ranked}
+            ranked.extend(
+                (doc_id, distance, field)
+                for (_, distance, field, _), doc_id in self._word_matches(words, max_distance, limit - len(ranked), found)
+            )
+
+        return [SearchHit(self.keys[doc_id], self.names[doc_id], distance, field)
+                for doc_id, distance, field in ranked]
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Validation Cache
+Reuses validation results across runs of the data checks
+
+Validators describe themselves with a rule-set id (bump it whenever a rule
+changes) plus two functions:
+
+    check_record(key, server) -> dict     result for one server record
+    summarize(document, results) -> dict  report from all per-record results
+
+ValidationCache.validate() then works in two tiers:
+
+    file hit     the data file's SHA-256 and the rule-set id match the cache:
+                 the stored report is returned without parsing the file
+    record hit   the file changed: it is parsed, and only records whose
+                 canonical-JSON hash differs from the cached one are checked
+                 again; unchanged records reuse their stored result
+
+The cache lives in .cache/validation.json at the repository root (override
+with MCP_VALIDATION_CACHE), so CI can persist it between jobs.
+
+    cache = ValidationCache()
+    report, stats = cache.validate(path, 'data_validation:2', check_record, summarize)
+
+Pass ``stage=profiler.stage`` to have the read/hash/parse and the per-record
+checks measured as separate 'load' and 'field checks' stages.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+from typing import Callable, ContextManager, Dict, NamedTuple, Optional, Tuple
+
+from catalog_watch import atomic_write
+
+CACHE_FORMAT = 'mcp-validation-cache'
+CACHE_VERSION = 1
+DEFAULT_CACHE_FILE = os.environ.get('MCP_VALIDATION_CACHE') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'validation.json')
+
+RecordCheck = Callable[[str, Dict], Dict]
+Summarize = Callable[[Dict, Dict[str, Dict]], Dict]
+Stage = Callable[[str], ContextManager]
+
+
+class CacheStats(NamedTuple):
+    file_hit: bool
+    records_checked: int
+    records_reused: int
+
+
+def record_hash(record: Dict) -> str:
+    return hashlib.sha1(
+        json.dumps(record, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    ).hexdigest()
+
+
+def _no_stage(name: str) -> ContextManager:
+    return contextlib.nullcontext()
+
+
+def load_servers(document: Dict) -> Dict[str, Dict]:
+    """Server records of an exported directory, row- or column-oriented"""
+    servers = document.get('servers', {})
+    if isinstance(servers, dict) and 'columns' in servers:
+        from catalog_columnar import decode_columnar
+        return decode_columnar(servers).to_servers()
+    return servers
+
+
+class ValidationCache:
+    """File- and record-level validation results keyed by content hash"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_FILE, enabled: bool = True):
+        self.path = path
+        self.enabled = enabled
+        self._entries = self._load() if enabled else {}
+        self._dirty = False
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('format') != CACHE_FORMAT or data.get('version') != CACHE_VERSION:
+            return {}
+        return data.get('entries', {})
+
+    def save(self) -> None:
+        if not self.enabled or not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        payload = {'format': CACHE_FORMAT, 'version': CACHE_VERSION, 'entries': self._entries}
+        atomic_write(self.path, json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8'))
+        self._dirty = False
+
+    def validate(self, data_file: str, ruleset: str, check_record: RecordCheck,
+                 summarize: Summarize, stage: Optional[Stage] = None) -> Tuple[Dict, CacheStats]:
+        """Report for ``data_file`` under ``ruleset``, recomputing only what changed
+
+        ``stage(name)`` wraps the 'load' and 'field checks' phases, e.g. a
+        MemoryProfiler's ``stage`` method.
+        """
+        stage = stage or _no_stage
+        slot = f'{os.path.abspath(data_file)}|{ruleset}'
+        entry = self._entries.get(slot) if self.enabled else None
+
+        with stage('load'):
+            with open(data_file, 'rb') as f:
+                raw = f.read()
+            file_hash = hashlib.sha256(raw).hexdigest()
+            if entry and entry.get('file_sha256') == file_hash:
+                document = None
+            else:
+                document = json.loads(raw)
+                servers = load_servers(document)
+        if document is None:
+            return entry['report'], CacheStats(True, 0, len(entry.get('records', {})))
+
+        cached_records = entry.get('records', {}) if entry else {}
+        with stage('field checks'):
+            results: Dict[str, Dict] = {}
+            record_cache: Dict[str, Dict] = {}
+            checked = reused = 0
+            for key, server in servers.items():
+                digest = record_hash(server)
+                cached = cached_records.get(key)
+                if cached is not None and cached['hash'] == digest:
+                    result = cached['result']
+                    reused += 1
+                else:
+                    result = check_record(key, server)
+                    checked += 1
+                results[key] = result
+                record_cache[key] = {'hash': digest, 'result': result}
+
+            report = summarize(document, results)
+        if self.enabled:
+            self._entries[slot] = {'file_sha256': file_hash, 'report': report, 'records': record_cache}
+            self._dirty = True
+            self.save()
+        return report, CacheStats(False, checked, reused)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+共用倉庫快取與稀疏檢出
+同一倉庫（例如 modelcontextprotocol/servers monorepo）中的多個伺服器只克隆一次
+
+目錄結構（位於 ~/.mcp/servers）:
+    .repos/github.com/<owner>/<repo>/   每個倉庫一個 blobless 部分克隆（--filter=blob:none）
+    <server_key>/                       該倉庫的 git worktree，稀疏檢出伺服器所在的子目錄
+
+倉庫網址可指向子目錄，例如
+    https://github.com/modelcontextprotocol/servers/tree/main/src/fetch
+會解析為倉庫 https://github.com/modelcontextprotocol/servers.git、分支 main、子目錄 src/fetch。
+只有被檢出的子目錄會下載檔案內容，N 個伺服器的磁碟用量與克隆時間約等於一次克隆。
+
+git 指令經由可替換的 runner 執行（安裝腳本傳入 EventLog.run 以記錄事件與下載量）。
+同一倉庫的操作以鎖串行化，每次執行對每個倉庫最多 fetch 一次；不同倉庫可並行。
+離線模式下改從預取的 git bundle 克隆或 fetch（見 offline_cache.py）。
+
+作者: MCP Navigator Project
+"""
+
+import re
+import subprocess
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Set
+
+GIT_TIMEOUT = 300
+
+_TREE_URL = re.compile(
+    r"^https?://(?P<host>[^/]+)/(?P<owner>[^/]+)/(?P<repo>[^/]+?)(?:\.git)?"
+    r"(?:/tree/(?P<ref>[^/]+)(?:/(?P<subdir>.+?))?)?/?$"
+)
+
+
+class RepositoryLocation(NamedTuple):
+    """倉庫網址解析結果"""
+    clone_url: str
+    cache_path: str        # 相對於 .repos 的路徑，例如 github.com/owner/repo
+    ref: Optional[str]     # None 表示遠端的預設分支
+    subdir: Optional[str]  # None 表示檢出整個倉庫
+
+
+def parse_repository(url: str) -> Optional[RepositoryLocation]:
+    """解析 https://host/owner/repo[/tree/<ref>[/<subdir>]]；無法辨識時返回 None"""
+    match = _TREE_URL.match(url.strip())
+    if not match:
+        return None
+    host, owner, repo = match.group("host"), match.group("owner"), match.group("repo")
+    return RepositoryLocation(
+        clone_url=f"https://{host}/{owner}/{repo}.git",
+        cache_path=f"{host}/{owner}/{repo}".lower(),
+        ref=match.group("ref"),
+        subdir=match.group("subdir"),
+    )
+
+
+class GitError(Exception):
+    """git 指令失敗"""
+
+
+def _run(cmd: List[str], phase: str, timeout: float) -> subprocess.CompletedProcess:
+    return subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+
+
+def is_worktree(path: Path) -> bool:
+    """worktree 的 .git 是指向主倉庫的文件，而非目錄"""
+    return (path / ".git").is_file()
+
+
+class SharedCheckout:
+    """管理 .repos 下的共用克隆與各伺服器的 worktree"""
+
+    def __init__(self, servers_dir: Path,
+                 bundle_for: Optional[Callable[[RepositoryLocation], Path]] = None,
+                 runner: Optional[Callable[..., object]] = None):
+        self.servers_dir = Path(servers_dir)
+        self.bundle_for = bundle_for
+        self.runner = runner or _run
+        self.repos_dir = self.servers_dir / ".repos"
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._fetched: Set[str] = set()
+
+    def _git(self, *args: str) -> str:
+        try:
+            result = self.runner(["git", *args], phase="git", timeout=GIT_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            raise GitError(f"git {args[0]} 超時")
+        if result.returncode != 0:
+            raise GitError(result.stderr.strip() or f"git {args[0]} 失敗")
+        return result.stdout.strip()
+
+    def _lock_for(self, cache_path: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(cache_path, threading.Lock())
+
+    def _ensure_repository(self, location: RepositoryLocation) -> Path:
+        """建立或更新（每次執行一次）共用的部分克隆"""
+        repo_dir = self.repos_dir / location.cache_path
+        bundle = self.bundle_for(location) if self.bundle_for else None
+        if bundle is not None and not bundle.exists():
+            raise GitError(f"離線快取中沒有 {location.clone_url} 的 bundle")
+
+        if not (repo_dir / ".git").is_dir():
+            repo_dir.parent.mkdir(parents=True, exist_ok=True)
+            if bundle is not None:
+                self._git("clone", "--quiet", "--no-checkout", str(bundle), str(repo_dir))
+                # 之後恢復連線時仍可直接從原始倉庫 fetch
+                self._git("-C", str(repo_dir), "remote", "set-url", "origin", location.clone_url)
+            else:
+                self._git("clone", "--progress", "--filter=blob:none", "--no-checkout",
+                          location.clone_url, str(repo_dir))
+        elif location.cache_path not in self._fetched:
+            if bundle is not None:
+                self._git("-C", str(repo_dir), "fetch", "--quiet", "--prune", str(bundle),
+                          "+refs/heads/*:refs/remotes/origin/*")
+            else:
+                self._git("-C", str(repo_dir), "fetch", "--progress", "--prune", "origin")
+        self._fetched.add(location.cache_path)
+        return repo_dir
+
+    def checkout(self, location: RepositoryLocation, dest: Path) -> str:
+        """把 location 檢出到 dest（新建或更新 worktree），返回檢出的 commit"""
+        with self._lock_for(location.cache_path):
+            repo_dir = self._ensure_repository(location)
+            target = f"origin/{location.ref}" if location.ref else "origin/HEAD"
+
+            if not dest.exists():
+                self._git("-C", str(repo_dir), "worktree", "prune")
+                self._git("-C", str(repo_dir), "worktree", "add", "--quiet", "--no-checkout",
+                          "--detach", str(dest), target)
+
+            # 只檢出伺服器所在的子目錄；整個倉庫時停用稀疏檢出
+            if location.subdir:
+                self._git("-C", str(dest), "sparse-checkout", "set", "--cone", location.subdir)
+            else:
+                self._git("-C", str(dest), "sparse-checkout", "disable")
+            self._git("-C", str(dest), "checkout", "--quiet", "--detach", target)
+            return self._git("-C", str(dest), "rev-parse", "HEAD")
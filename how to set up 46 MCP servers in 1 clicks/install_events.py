@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MCP 伺服器安裝事件流
+以串流方式執行安裝子程序，記錄結構化事件並顯示即時進度
+
+- EventLog.run() 取代 subprocess.run(capture_output=True)：逐行讀取子程序的
+  stdout/stderr，只保留最後 RING_BUFFER_BYTES 位元組（環形緩衝），記憶體用量固定
+- 從 pip / git 的輸出解析已下載的位元組數（npm、go 不輸出大小，記為 null）
+- 所有事件以 JSONL 寫入 ~/.mcp/config/install-events.jsonl，每行一個事件:
+    {"ts": 1700000000.123, "event": "command_end", "server": "fetch", "phase": "npm",
+     "returncode": 0, "duration": 12.4, "bytes_downloaded": null, "output_bytes": 5321}
+  事件種類: session_start、server_start、command_start、progress、command_end、
+  server_end、session_end
+- 終端機為 TTY 時，在最後一行顯示進行中的伺服器與已完成數量
+
+目前的伺服器由執行緒區域的 EventLog.server() 設定，各安裝方法不需額外傳遞參數。
+
+作者: MCP Navigator Project
+"""
+
+import json
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+RING_BUFFER_BYTES = 64 * 1024
+PROGRESS_INTERVAL = 1.0
+DISPLAY_INTERVAL = 0.5
+READER_JOIN_TIMEOUT = 5
+
+_UNITS = {"b": 1, "kb": 1000, "mb": 1000 ** 2, "gb": 1000 ** 3,
+          "kib": 1024, "mib": 1024 ** 2, "gib": 1024 ** 3}
+
+# pip: "Downloading foo-1.0-py3-none-any.whl (12.3 MB)"；git: "Receiving objects: 100% (10/10), 1.23 MiB | ..."
+_PIP_DOWNLOAD = re.compile(r"Downloading \S+ \((\d+(?:\.\d+)?) ?([kKMG]?i?B)\)")
+_GIT_RECEIVING = re.compile(r"Receiving objects: .*?, (\d+(?:\.\d+)?) ([KMG]?i?B)")
+
+
+def _to_bytes(value: str, unit: str) -> int:
+    return int(float(value) * _UNITS.get(unit.lower(), 1))
+
+
+class RingBuffer:
+    """只保留最後 max_bytes 位元組的文字行"""
+
+    def __init__(self, max_bytes: int = RING_BUFFER_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._lines: deque = deque()
+        self._size = 0
+
+    def append(self, line: str) -> None:
+        size = len(line.encode("utf-8", "replace"))
+        self.total_bytes += size
+        self._lines.append(line)
+        self._size += size
+        while self._size > self.max_bytes and len(self._lines) > 1:
+            self._size -= len(self._lines.popleft().encode("utf-8", "replace"))
+
+    def text(self) -> str:
+        return "".join(self._lines)
+
+
+class StreamResult:
+    """與 subprocess.CompletedProcess 相容的結果；stdout/stderr 為環形緩衝中的尾端輸出"""
+
+    def __init__(self, args: List[str], returncode: int, stdout: str, stderr: str,
+                 duration: float, bytes_downloaded: Optional[int]):
+        self.args = args
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.duration = duration
+        self.bytes_downloaded = bytes_downloaded
+
+
+class ProgressDisplay:
+    """TTY 最後一行的即時進度；非 TTY 時不輸出"""
+
+    def __init__(self, stream=sys.stdout):
+        self.stream = stream
+        self.enabled = hasattr(stream, "isatty") and stream.isatty()
+        self.total = 0
+        self.done = 0
+        self.running: Dict[str, float] = {}
+        self._shown = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, total: int) -> None:
+        self.total = total
+        if self.enabled and not self._thread:
+            self._thread = threading.Thread(target=self._loop, name="mcp-progress", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.clear()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(DISPLAY_INTERVAL):
+            self.render()
+
+    def clear(self) -> None:
+        """在其他輸出前清除進度行（呼叫者須持有輸出鎖）"""
+        if self._shown:
+            self.stream.write("\r\033[K")
+            self.stream.flush()
+            self._shown = False
+
+    def render(self) -> None:
+        if not self.enabled or not self.running:
+            return
+        now = time.monotonic()
+        active = ", ".join(f"{name} {now - started:.0f}s"
+                           for name, started in sorted(self.running.items(), key=lambda item: item[1])[:4])
+        more = f" +{len(self.running) - 4}" if len(self.running) > 4 else ""
+        self.stream.write(f"\r\033[K[{self.done}/{self.total}] 進行中: {active}{more}")
+        self.stream.flush()
+        self._shown = True
+
+
+class EventLog:
+    """執行緒安全的 JSONL 事件記錄與進度顯示"""
+
+    def __init__(self, path: Optional[Path] = None, display: Optional[ProgressDisplay] = None,
+                 output_lock: Optional[threading.Lock] = None):
+        self.path = Path(path) if path else None
+        self.display = display or ProgressDisplay()
+        self.output_lock = output_lock or threading.Lock()
+        self._file = None
+        self._write_lock = threading.Lock()
+        self._local = threading.local()
+
+    def emit(self, event: str, **fields) -> None:
+        record = {"ts": round(time.time(), 3), "event": event}
+        server = getattr(self._local, "server", None)
+        if server and "server" not in fields:
+            record["server"] = server
+        record.update(fields)
+        if self._file:
+            with self._write_lock:
+                self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                self._file.flush()
+
+    @contextmanager
+    def server(self, name: str, count: int = 1):
+        """把這個執行緒接下來的事件歸屬於 name 並計時；批次安裝時 count 為其中的伺服器數"""
+        self._local.server = name
+        started = time.monotonic()
+        self.display.running[name] = started
+        self.emit("server_start")
+        outcome = {"success": False}
+        try:
+            yield outcome
+        finally:
+            self.emit("server_end", success=outcome["success"],
+                      duration=round(time.monotonic() - started, 3))
+            self.display.running.pop(name, None)
+            self.display.done += count
+            self._local.server = None
+
+    def start_session(self, total: int, **fields) -> None:
+        """開始新的事件檔（覆寫上一次的記錄）與進度顯示"""
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "w", encoding="utf-8")
+        self.emit("session_start", total=total, **fields)
+        self.display.start(total)
+
+    def end_session(self, **fields) -> None:
+        with self.output_lock:
+            self.display.stop()
+        self.emit("session_end", **fields)
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def run(self, cmd: List[str], phase: str, timeout: float, env: Optional[Dict[str, str]] = None,
+            cwd: Optional[str] = None) -> StreamResult:
+        """串流執行 cmd；逾時時終止子程序並拋出 subprocess.TimeoutExpired"""
+        self.emit("command_start", phase=phase, command=cmd)
+        started = time.monotonic()
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                                   errors="replace", env=env, cwd=cwd, bufsize=1)
+        buffers = {"stdout": RingBuffer(), "stderr": RingBuffer()}
+        downloaded = {"bytes": None, "reported": 0.0}
+        lock = threading.Lock()
+        # 讀取執行緒沒有呼叫者的執行緒區域狀態，伺服器名稱需明確傳入
+        owner = {"server": self._local.server} if getattr(self._local, "server", None) else {}
+
+        def pump(name: str, stream) -> None:
+            for line in stream:
+                buffers[name].append(line)
+                pip_match = _PIP_DOWNLOAD.search(line)
+                git_match = None if pip_match else _GIT_RECEIVING.search(line)
+                if not pip_match and not git_match:
+                    continue
+                with lock:
+                    # pip 每個檔案一行（累加）；git 回報的是累計值（取最大）
+                    if pip_match:
+                        downloaded["bytes"] = (downloaded["bytes"] or 0) + _to_bytes(*pip_match.groups())
+                    else:
+                        downloaded["bytes"] = max(downloaded["bytes"] or 0, _to_bytes(*git_match.groups()))
+                    now = time.monotonic()
+                    if now - downloaded["reported"] >= PROGRESS_INTERVAL:
+                        downloaded["reported"] = now
+                        self.emit("progress", phase=phase, bytes_downloaded=downloaded["bytes"],
+                                  elapsed=round(now - started, 3), **owner)
+
+        readers = [threading.Thread(target=pump, args=(name, getattr(process, name)), daemon=True)
+                   for name in ("stdout", "stderr")]
+        for reader in readers:
+            reader.start()
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            self.emit("command_end", phase=phase, returncode=None, timeout=True,
+                      duration=round(time.monotonic() - started, 3))
+            raise
+        finally:
+            # 子程序留下的背景程序可能仍持有管道，不無限等待
+            for reader in readers:
+                reader.join(READER_JOIN_TIMEOUT)
+
+        duration = time.monotonic() - started
+        result = StreamResult(cmd, process.returncode, buffers["stdout"].text(), buffers["stderr"].text(),
+                              duration, downloaded["bytes"])
+        fields = {"phase": phase, "returncode": process.returncode, "duration": round(duration, 3),
+                  "bytes_downloaded": downloaded["bytes"],
+                  "output_bytes": buffers["stdout"].total_bytes + buffers["stderr"].total_bytes}
+        if process.returncode != 0:
+            fields["stderr_tail"] = result.stderr[-2000:]
+        self.emit("command_end", **fields)
+        return result
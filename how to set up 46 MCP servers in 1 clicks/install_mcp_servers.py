@@ -15,12 +15,27 @@ import json
 import subprocess
 import platform
 import shutil
+import threading
+import time
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import argparse
 from dataclasses import dataclass
 from enum import Enum
 
+# --profile 時才載入專案 code/ 目錄中的共用 profiling 模組
+from profile_hooks import add_profile_arguments, run_profiled
+from install_scheduler import (DEFAULT_JOBS, InstallResults, InstallScheduler, InstallTask,
+                               parse_method_limits)
+from install_state import InstalledState
+from git_checkout import GitError, SharedCheckout, is_worktree, parse_repository
+from offline_cache import PackageCache
+from install_events import EventLog
+from install_session import DEFAULT_RETRIES, InstallSession, RetryPolicy
+from launch_commands import LaunchResolver
+from toolchain_probe import probe_toolchain
+from python_envs import DEFAULT_OPTIMIZE_LEVELS, ServerEnvironments, parse_optimize_levels
+
 
 class InstallMethod(Enum):
     """安裝方法枚舉"""
@@ -31,6 +46,15 @@ class InstallMethod(Enum):
     UNITY = "unity"
 
 
+# 批次模式下可一次安裝多個包的方法及其指令
+# （pip 伺服器各自安裝到獨立的虛擬環境，不合併為一次調用）
+BATCH_COMMANDS = {
+    InstallMethod.NPM: ["npm", "install", "-g"],
+}
+BATCH_TIMEOUT_BASE = 300
+BATCH_TIMEOUT_PER_PACKAGE = 60
+
+
 class Color:
     """終端顏色輸出類"""
     RED = '\033[91m'
@@ -62,14 +86,17 @@ class MCPServer:
 class MCPInstaller:
     """MCP 伺服器安裝器主類"""
     
-    def __init__(self, config_file: str = "mcp-servers-config.json"):
-        """初始化安裝器"""
+    def __init__(self, config_file: str = "mcp-servers-config.json",
+                 cache_dir: Optional[str] = None, offline: bool = False,
+                 retries: int = DEFAULT_RETRIES):
+        """初始化安裝器（offline 時只從預取的包快取安裝；暫時性錯誤最多重試 retries 次）"""
         self.config_file = config_file
+        self.offline = offline
+        self.retry = RetryPolicy(retries)
         self.servers: Dict[str, MCPServer] = {}
-        self.install_log: List[str] = []
-        self.failed_installs: List[str] = []
-        self.success_count = 0
+        self.results = InstallResults()
         self.total_count = 0
+        self._print_lock = threading.Lock()
         
         # 創建必要的目錄
         self.mcp_dir = Path.home() / ".mcp"
@@ -78,36 +105,59 @@ class MCPInstaller:
         
         for directory in [self.mcp_dir, self.servers_dir, self.config_dir]:
             directory.mkdir(exist_ok=True)
+        
+        # 已安裝伺服器的版本、位置與雜湊，用於略過未變更的伺服器
+        self.state = InstalledState(self.mcp_dir / "installed.json", self.servers_dir)
+        
+        # --prefetch 下載、--offline 安裝所用的內容定址包快取
+        self.cache = PackageCache(Path(cache_dir) if cache_dir else self.mcp_dir / "cache")
+        
+        # 每個 pip 伺服器一個虛擬環境，依賴從共用的解壓 wheel 快取以硬連結放入
+        self.envs = ServerEnvironments(self.servers_dir, self.mcp_dir / "wheels", runner=self._run_command)
+        
+        # VS Code 配置中的啟動指令直接指向已安裝的執行檔，不經過 npx
+        self.launchers = LaunchResolver(self.state)
+        
+        # 每個伺服器的安裝狀態檢查點，供 --resume 只執行未完成的部分
+        self.session = InstallSession(self.mcp_dir / "install-session.json")
+        
+        # 子程序輸出串流讀取，結構化事件寫入 install-events.jsonl，TTY 上顯示即時進度
+        self.events = EventLog(self.config_dir / "install-events.jsonl", output_lock=self._print_lock)
+        
+        # 同一倉庫的伺服器共用一個部分克隆，各自稀疏檢出子目錄；離線時從 git bundle 取得
+        self.checkouts = SharedCheckout(self.servers_dir,
+                                        bundle_for=self.cache.bundle_path if offline else None,
+                                        runner=self._run_command)
+    
+    @property
+    def success_count(self) -> int:
+        return self.results.success_count
+    
+    @property
+    def failed_installs(self) -> List[str]:
+        return self.results.failed_installs
+    
+    @property
+    def install_log(self) -> List[str]:
+        return self.results.install_log
     
     def print_colored(self, message: str, color: str = Color.WHITE, bold: bool = False) -> None:
-        """彩色輸出函數"""
+        """彩色輸出函數（並行安裝時避免多行輸出交錯）"""
         prefix = Color.BOLD if bold else ""
-        print(f"{prefix}{color}{message}{Color.RESET}")
+        with self._print_lock:
+            self.events.display.clear()
+            print(f"{prefix}{color}{message}{Color.RESET}")
     
-    def check_prerequisites(self) -> bool:
-        """檢查系統先決條件"""
+    def check_prerequisites(self, refresh: bool = False) -> bool:
+        """檢查系統先決條件（工具未變更時使用 ~/.mcp/toolchain.json 的快取結果）"""
         self.print_colored("檢查系統先決條件...", Color.YELLOW, True)
         
-        prerequisites = {
-            "Node.js": ["node", "--version"],
-            "npm": ["npm", "--version"],
-            "Python": ["python", "--version"],
-            "pip": ["pip", "--version"],
-            "Git": ["git", "--version"],
-            "Go": ["go", "version"]
-        }
-        
         missing = []
         
-        for tool, command in prerequisites.items():
-            try:
-                result = subprocess.run(command, capture_output=True, text=True, timeout=10)
-                if result.returncode == 0:
-                    version = result.stdout.strip().split('\n')[0]
-                    self.print_colored(f"✓ {tool}: {version}", Color.GREEN)
-                else:
-                    missing.append(tool)
-            except (subprocess.TimeoutExpired, FileNotFoundError, subprocess.SubprocessError):
+        for tool, info in probe_toolchain(cache_path=self.mcp_dir / "toolchain.json", refresh=refresh).items():
+            if info.version:
+                self.print_colored(f"✓ {tool}: {info.version}", Color.GREEN)
+            else:
                 missing.append(tool)
         
         if missing:
@@ -149,14 +199,35 @@ class MCPInstaller:
             self.print_colored(f"載入配置失敗: {e}", Color.RED)
             return False
     
+    def _source_options(self, method: InstallMethod) -> List[str]:
+        """離線模式下讓 npm/pip 只從本地快取取得包"""
+        if not self.offline:
+            return []
+        if method == InstallMethod.NPM:
+            return self.cache.npm_options()
+        if method == InstallMethod.PIP:
+            return self.cache.pip_options()
+        return []
+    
+    def _run_command(self, cmd: List[str], phase: str, timeout: float,
+                     env: Optional[Dict[str, str]] = None):
+        """執行安裝指令；網路類暫時性錯誤以指數退避重試"""
+        def on_retry(attempt: int, delay: float, reason: str) -> None:
+            self.print_colored(f"⟳ {cmd[0]} 暫時性錯誤（{reason}），{delay:.1f} 秒後第 {attempt} 次重試",
+                               Color.YELLOW)
+            self.events.emit("retry", phase=phase, attempt=attempt, delay=round(delay, 3), reason=reason)
+        
+        return self.retry.run(lambda: self.events.run(cmd, phase=phase, timeout=timeout, env=env),
+                              on_retry=on_retry)
+    
     def install_npm_package(self, server: MCPServer) -> bool:
         """安裝 npm 包"""
         try:
             self.print_colored(f"安裝 npm 包: {server.package}", Color.CYAN)
             
             # 使用全域安裝
-            cmd = ["npm", "install", "-g", server.package]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+            cmd = ["npm", "install", "-g", *self._source_options(InstallMethod.NPM), server.package]
+            result = self._run_command(cmd, phase="npm", timeout=300)
             
             if result.returncode == 0:
                 self.print_colored(f"✓ 成功安裝 {server.name}", Color.GREEN)
@@ -172,19 +243,19 @@ class MCPInstaller:
             self.print_colored(f"✗ 安裝異常 {server.name}: {e}", Color.RED)
             return False
     
-    def install_pip_package(self, server: MCPServer) -> bool:
-        """安裝 pip 包"""
+    def install_pip_package(self, server: MCPServer, server_key: str) -> bool:
+        """安裝 pip 包到伺服器自己的虛擬環境"""
         try:
             self.print_colored(f"安裝 pip 包: {server.package}", Color.CYAN)
             
-            cmd = ["pip", "install", server.package]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+            ok, message = self.envs.install(server_key, server.package,
+                                            self._source_options(InstallMethod.PIP))
             
-            if result.returncode == 0:
-                self.print_colored(f"✓ 成功安裝 {server.name}", Color.GREEN)
+            if ok:
+                self.print_colored(f"✓ 成功安裝 {server.name}: {message}", Color.GREEN)
                 return True
             else:
-                self.print_colored(f"✗ 安裝失敗 {server.name}: {result.stderr}", Color.RED)
+                self.print_colored(f"✗ 安裝失敗 {server.name}: {message}", Color.RED)
                 return False
                 
         except subprocess.TimeoutExpired:
@@ -195,19 +266,34 @@ class MCPInstaller:
             return False
     
     def install_git_repository(self, server: MCPServer, server_key: str) -> bool:
-        """克隆 Git 倉庫"""
+        """克隆 Git 倉庫（可辨識的倉庫網址經由共用快取稀疏檢出）"""
         try:
             self.print_colored(f"克隆 Git 倉庫: {server.repository}", Color.CYAN)
             
             clone_dir = self.servers_dir / server_key
+            location = parse_repository(server.repository)
+            
+            # 舊版建立的完整克隆沿用 git pull 更新（離線時保留原狀）
+            if location and (not clone_dir.exists() or is_worktree(clone_dir)):
+                commit = self.checkouts.checkout(location, clone_dir)
+                path = f" ({location.subdir})" if location.subdir else ""
+                self.print_colored(f"✓ 成功檢出 {server.name}{path} @ {commit[:12]}", Color.GREEN)
+                return True
+            
+            if self.offline:
+                if clone_dir.exists():
+                    self.print_colored(f"✓ 離線模式，沿用現有克隆 {server.name}", Color.YELLOW)
+                    return True
+                self.print_colored(f"✗ 離線模式無法克隆 {server.name}: 無法辨識的倉庫網址", Color.RED)
+                return False
             
             if clone_dir.exists():
                 self.print_colored("目錄已存在，更新倉庫...", Color.YELLOW)
-                cmd = ["git", "-C", str(clone_dir), "pull"]
+                cmd = ["git", "-C", str(clone_dir), "pull", "--progress"]
             else:
-                cmd = ["git", "clone", server.repository, str(clone_dir)]
+                cmd = ["git", "clone", "--progress", server.repository, str(clone_dir)]
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+            result = self._run_command(cmd, phase="git", timeout=300)
             
             if result.returncode == 0:
                 self.print_colored(f"✓ 成功克隆 {server.name}", Color.GREEN)
@@ -219,6 +305,9 @@ class MCPInstaller:
         except subprocess.TimeoutExpired:
             self.print_colored(f"✗ 克隆超時 {server.name}", Color.RED)
             return False
+        except GitError as e:
+            self.print_colored(f"✗ 克隆失敗 {server.name}: {e}", Color.RED)
+            return False
         except Exception as e:
             self.print_colored(f"✗ 克隆異常 {server.name}: {e}", Color.RED)
             return False
@@ -229,7 +318,8 @@ class MCPInstaller:
             self.print_colored(f"安裝 Go 包: {server.package}", Color.CYAN)
             
             cmd = ["go", "install", server.package]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+            env = self.cache.go_env() if self.offline else None
+            result = self._run_command(cmd, phase="go", timeout=300, env=env)
             
             if result.returncode == 0:
                 self.print_colored(f"✓ 成功安裝 {server.name}", Color.GREEN)
@@ -251,31 +341,90 @@ class MCPInstaller:
         self.print_colored(f"類別: {server.category}", Color.GRAY)
         self.print_colored(f"描述: {server.description}", Color.GRAY)
         
+        started = time.monotonic()
         success = False
         
-        if server.installation_method == InstallMethod.NPM:
-            success = self.install_npm_package(server)
-        elif server.installation_method == InstallMethod.PIP:
-            success = self.install_pip_package(server)
-        elif server.installation_method == InstallMethod.GIT:
-            success = self.install_git_repository(server, server_key)
-        elif server.installation_method == InstallMethod.GO:
-            success = self.install_go_package(server)
-        elif server.installation_method == InstallMethod.UNITY:
-            self.print_colored(f"Unity 包需要手動安裝: {server.repository}", Color.YELLOW)
-            success = True
-        else:
-            self.print_colored(f"不支援的安裝方法: {server.installation_method.value}", Color.RED)
-            success = False
-        
+        self.session.mark(server_key, "running")
+        with self.events.server(server_key) as outcome:
+            if server.installation_method == InstallMethod.NPM:
+                success = self.install_npm_package(server)
+            elif server.installation_method == InstallMethod.PIP:
+                success = self.install_pip_package(server, server_key)
+            elif server.installation_method == InstallMethod.GIT:
+                success = self.install_git_repository(server, server_key)
+            elif server.installation_method == InstallMethod.GO:
+                success = self.install_go_package(server)
+            elif server.installation_method == InstallMethod.UNITY:
+                self.print_colored(f"Unity 包需要手動安裝: {server.repository}", Color.YELLOW)
+                success = True
+            else:
+                self.print_colored(f"不支援的安裝方法: {server.installation_method.value}", Color.RED)
+                success = False
+            
+            self._update_state(server_key, server, success)
+            self.session.mark(server_key, "succeeded" if success else "failed")
+            outcome["success"] = success
+        self.results.record(server.name, success, time.monotonic() - started)
+        return success
+    
+    def _update_state(self, server_key: str, server: MCPServer, success: bool) -> None:
+        """成功時記錄實際安裝的版本與位置；失敗時清除舊記錄，下次必定重試"""
         if success:
-            self.success_count += 1
-            self.install_log.append(f"✓ {server.name}")
+            self.state.record_install(server_key, server)
         else:
-            self.failed_installs.append(server.name)
-            self.install_log.append(f"✗ {server.name}")
+            self.state.forget(server_key)
+    
+    def install_package_batch(self, method: InstallMethod, batch: List[Tuple[str, MCPServer]]) -> Dict[str, bool]:
+        """以一次 npm 調用安裝多個包；整批失敗時二分拆批，找出出錯的包"""
+        packages = [server.package for _, server in batch]
+        if len(batch) > 1:
+            self.print_colored(f"批次安裝 {len(batch)} 個 {method.value} 包: {' '.join(packages)}", Color.CYAN)
+        else:
+            self.print_colored(f"安裝 {method.value} 包: {packages[0]}", Color.CYAN)
         
-        return success
+        error = ""
+        try:
+            cmd = BATCH_COMMANDS[method] + self._source_options(method) + packages
+            timeout = BATCH_TIMEOUT_BASE + BATCH_TIMEOUT_PER_PACKAGE * (len(batch) - 1)
+            result = self._run_command(cmd, phase=f"{method.value}-batch", timeout=timeout)
+            if result.returncode == 0:
+                for _, server in batch:
+                    self.print_colored(f"✓ 成功安裝 {server.name}", Color.GREEN)
+                return {key: True for key, _ in batch}
+            error = result.stderr
+        except subprocess.TimeoutExpired:
+            error = "安裝超時"
+        except Exception as e:
+            error = str(e)
+        
+        if len(batch) == 1:
+            self.print_colored(f"✗ 安裝失敗 {batch[0][1].name}: {error}", Color.RED)
+            return {batch[0][0]: False}
+        
+        # npm 在任一包失敗時不會安裝整批，拆成兩半重試
+        middle = len(batch) // 2
+        self.print_colored(f"批次安裝失敗，拆分為 {middle} + {len(batch) - middle} 個包重試", Color.YELLOW)
+        outcome = self.install_package_batch(method, batch[:middle])
+        outcome.update(self.install_package_batch(method, batch[middle:]))
+        return outcome
+    
+    def install_batch(self, method: InstallMethod, batch: List[Tuple[str, MCPServer]]) -> bool:
+        """批次安裝並記錄每個伺服器的結果"""
+        self.print_colored(f"\n開始批次安裝: {len(batch)} 個 {method.value} 伺服器", Color.MAGENTA, True)
+        started = time.monotonic()
+        for key, _ in batch:
+            self.session.mark(key, "running")
+        with self.events.server(f"{method.value}-batch", count=len(batch)) as batch_outcome:
+            outcome = self.install_package_batch(method, batch)
+            duration = time.monotonic() - started
+            for key, server in batch:
+                self._update_state(key, server, outcome[key])
+                self.session.mark(key, "succeeded" if outcome[key] else "failed")
+                self.results.record(server.name, outcome[key], duration)
+                self.events.emit("server_end", server=key, success=outcome[key],
+                                 duration=round(duration, 3))
+            batch_outcome["success"] = all(outcome.values())
+        return batch_outcome["success"]
     
     def generate_vscode_config(self) -> None:
         """生成 VS Code MCP 配置文件"""
@@ -299,26 +448,32 @@ class MCPInstaller:
         
         self.print_colored(f"VS Code 配置已保存到: {config_file}", Color.GREEN)
     
+    def server_source_dir(self, server_key: str, server: MCPServer) -> Path:
+        """Git 伺服器的原始碼目錄；稀疏檢出時為 worktree 中的子目錄"""
+        clone_dir = self.servers_dir / server_key
+        location = parse_repository(server.repository)
+        if location and location.subdir and is_worktree(clone_dir):
+            return clone_dir / location.subdir
+        return clone_dir
+    
     def _generate_server_config(self, server_key: str, server: MCPServer) -> Optional[Dict]:
-        """為單個伺服器生成 VS Code 配置"""
+        """為單個伺服器生成 VS Code 配置（優先使用已安裝執行檔的絕對路徑）"""
         config = {}
         
-        if server.installation_method == InstallMethod.NPM:
+        if server.installation_method == InstallMethod.GIT:
+            resolved = self.launchers.resolve_source(self.server_source_dir(server_key, server))
+        else:
+            resolved = self.launchers.resolve(server_key, server)
+        
+        if resolved:
+            config["command"], config["args"] = resolved
+        elif server.installation_method == InstallMethod.NPM:
+            # 無法解析已安裝的包時退回 npx（每次啟動都會重新解析包）
             config["command"] = "npx"
             config["args"] = [server.package]
         elif server.installation_method == InstallMethod.PIP:
             config["command"] = "python"
             config["args"] = ["-m", server.package]
-        elif server.installation_method == InstallMethod.GIT:
-            server_dir = self.servers_dir / server_key
-            if (server_dir / "package.json").exists():
-                config["command"] = "node"
-                config["args"] = [str(server_dir / "index.js")]
-            elif (server_dir / "main.py").exists():
-                config["command"] = "python"
-                config["args"] = [str(server_dir / "main.py")]
-            else:
-                return None
         elif server.installation_method == InstallMethod.GO:
             # Go 安裝的包通常在 GOPATH/bin 中
             go_bin = shutil.which(server.package.split('/')[-1])
@@ -378,8 +533,56 @@ class MCPInstaller:
         self.print_colored(f"  Linux/Mac: {env_file}", Color.CYAN)
         self.print_colored(f"  Windows: {env_bat}", Color.CYAN)
     
-    def install_all(self, methods: List[InstallMethod] = None, server_list: List[str] = None) -> None:
-        """安裝所有或指定的 MCP 伺服器"""
+    def select_servers(self, methods: List[InstallMethod] = None,
+                       server_list: List[str] = None) -> List[Tuple[str, MCPServer]]:
+        """符合安裝方法與伺服器列表條件的伺服器"""
+        selected = []
+        for server_key, server in self.servers.items():
+            if methods and server.installation_method not in methods:
+                continue
+            if server_list and server_key not in server_list:
+                continue
+            selected.append((server_key, server))
+        return selected
+    
+    def prefetch(self, methods: List[InstallMethod] = None, server_list: List[str] = None,
+                 jobs: int = DEFAULT_JOBS, method_limits: Optional[Dict[str, int]] = None) -> bool:
+        """把選定伺服器所需的全部內容下載到包快取，供 --offline 安裝使用"""
+        self.print_colored(f"\n預取 MCP 伺服器到 {self.cache.root}...", Color.YELLOW, True)
+        
+        def prefetch_one(server_key: str, server: MCPServer) -> bool:
+            try:
+                ok, message = self.cache.prefetch(server_key, server)
+            except Exception as e:
+                ok, message = False, str(e)
+            if ok:
+                self.print_colored(f"✓ 已預取 {server.name}: {message}", Color.GREEN)
+            else:
+                self.print_colored(f"✗ 預取失敗 {server.name}: {message}", Color.RED)
+            self.results.record(server.name, ok)
+            return ok
+        
+        tasks = [InstallTask(key=server_key, method=server.installation_method.value,
+                             run=lambda key=server_key, srv=server: prefetch_one(key, srv))
+                 for server_key, server in self.select_servers(methods, server_list)]
+        self.total_count = len(tasks)
+        outcomes = InstallScheduler(jobs, method_limits).run(tasks)
+        self.cache.save()
+        
+        self.print_colored(f"\n預取完成: {self.success_count}/{self.total_count} 成功", Color.YELLOW, True)
+        for failed in self.failed_installs:
+            self.print_colored(f"  - {failed}", Color.RED)
+        return all(outcomes.values())
+    
+    def install_all(self, methods: List[InstallMethod] = None, server_list: List[str] = None,
+                    jobs: int = DEFAULT_JOBS, method_limits: Optional[Dict[str, int]] = None,
+                    batch: bool = False, force: bool = False, resume: bool = False,
+                    compile_levels: Optional[List[int]] = DEFAULT_OPTIMIZE_LEVELS) -> None:
+        """安裝所有或指定的 MCP 伺服器（最多同時執行 jobs 個；batch 時 npm 包合併為一次調用）
+
+        resume 時沿用上一次的工作階段檢查點，server_list 應為其中未完成的伺服器；
+        安裝後以 compile_levels 的最佳化等級預先編譯 Python 伺服器，為空時不編譯
+        """
         self.print_colored("\n開始安裝 MCP 伺服器...", Color.YELLOW, True)
         
         if methods:
@@ -387,16 +590,112 @@ class MCPInstaller:
         if server_list:
             self.print_colored(f"指定伺服器: {server_list}", Color.GRAY)
         
-        for server_key, server in self.servers.items():
-            # 檢查是否符合安裝條件
-            if methods and server.installation_method not in methods:
-                continue
+        candidates = self.select_servers(methods, server_list)
+        if resume:
+            self.session.resume()
+            self.print_colored(f"恢復上一次的安裝工作階段: 剩餘 {len(candidates)} 個伺服器", Color.GRAY)
+        else:
+            self.session.begin([key for key, _ in candidates], {
+                "method": [m.value for m in methods] if methods else None,
+                "servers": server_list,
+                "batch": batch,
+                "force": force,
+                "offline": self.offline,
+            })
+        
+        tasks = []
+        selected = []
+        batches: Dict[InstallMethod, List[Tuple[str, MCPServer]]] = {}
+        for server_key, server in candidates:
+            self.total_count += 1
+            selected.append((server_key, server))
             
-            if server_list and server_key not in server_list:
+            # 清單顯示已按目前配置安裝且未被改動（stat 比對，不啟動子程序）
+            if not force and self.state.is_current(server_key, server):
+                self.results.record_skipped(server.name)
+                self.session.mark(server_key, "skipped")
+                self.print_colored(f"= 已是最新，略過: {server.name}", Color.GRAY)
                 continue
             
-            self.total_count += 1
-            self.install_server(server_key, server)
+            # 離線模式下未預取或已過期的伺服器直接判定失敗，不嘗試連網
+            if self.offline and server.installation_method != InstallMethod.UNITY:
+                problem = self.cache.verify(server_key, server)
+                if problem:
+                    self.print_colored(f"✗ {server.name}: {problem}", Color.RED)
+                    self.results.record(server.name, False)
+                    self.session.mark(server_key, "failed", problem)
+                    continue
+            
+            if batch and server.installation_method in BATCH_COMMANDS:
+                batches.setdefault(server.installation_method, []).append((server_key, server))
+                continue
+            tasks.append(InstallTask(
+                key=server_key,
+                method=server.installation_method.value,
+                run=lambda key=server_key, srv=server: self.install_server(key, srv),
+            ))
+        
+        for method, items in batches.items():
+            tasks.append(InstallTask(
+                key=f"{method.value}-batch",
+                method=method.value,
+                run=lambda method=method, items=items: self.install_batch(method, items),
+            ))
+        
+        # 通常最慢的 go 編譯與 git 克隆先啟動，讓總耗時接近最慢的單一安裝
+        slow_first = {InstallMethod.GO.value: 0, InstallMethod.GIT.value: 1}
+        tasks.sort(key=lambda task: slow_first.get(task.method, 2))
+        
+        if jobs > 1:
+            self.print_colored(f"並行安裝: 最多 {jobs} 個同時進行", Color.GRAY)
+        
+        started = time.monotonic()
+        scheduler = InstallScheduler(jobs, method_limits,
+                                     log=lambda message: self.print_colored(message, Color.YELLOW))
+        self.events.start_session(len(tasks) + sum(len(items) for items in batches.values()) - len(batches),
+                                  jobs=jobs, batch=batch, offline=self.offline)
+        try:
+            scheduler.run(tasks)
+            if compile_levels:
+                self.precompile_environments(selected, compile_levels)
+        finally:
+            self.events.end_session(success=self.success_count, failed=len(self.failed_installs),
+                                    skipped=len(self.results.skipped),
+                                    duration=round(time.monotonic() - started, 3))
+            self.events.close()
+        self.state.save()
+        
+        # 安裝過程中拋出例外的任務已被排程器攔截，這裡補記為失敗
+        for server_key, server in selected:
+            if server.name not in self.results.outcomes:
+                self.results.record(server.name, False)
+                self.session.mark(server_key, "failed")
+        
+        self.print_colored(f"安裝耗時: {time.monotonic() - started:.1f} 秒", Color.GRAY)
+    
+    def precompile_environments(self, servers: List[Tuple[str, MCPServer]], levels: List[int]) -> None:
+        """為本次安裝成功的 pip 伺服器預先編譯 .pyc；每個環境的 compileall 使用所有 CPU 核心
+
+        在所有安裝結束後才執行，不與安裝爭用 CPU；編譯失敗只顯示警告，不影響安裝結果
+        """
+        installed = [(server_key, server) for server_key, server in servers
+                     if server.installation_method == InstallMethod.PIP
+                     and self.results.outcomes.get(server.name) and server.name not in self.results.skipped]
+        if not installed:
+            return
+        
+        self.print_colored(f"\n預先編譯 {len(installed)} 個 Python 伺服器的 .pyc...", Color.YELLOW)
+        for server_key, server in installed:
+            with self.events.server(server_key, count=0) as outcome:
+                try:
+                    ok, message = self.envs.compile(server_key, levels)
+                except subprocess.TimeoutExpired:
+                    ok, message = False, "編譯超時"
+                outcome["success"] = ok
+            if ok:
+                self.print_colored(f"✓ 已編譯 {server.name}: {message}", Color.GREEN)
+            else:
+                self.print_colored(f"⚠ 編譯不完整 {server.name}: {message}", Color.YELLOW)
     
     def print_summary(self) -> None:
         """打印安裝結果摘要"""
@@ -406,12 +705,21 @@ class MCPInstaller:
         
         self.print_colored(f"總計伺服器: {self.total_count}", Color.WHITE)
         self.print_colored(f"成功安裝: {self.success_count}", Color.GREEN)
+        if self.results.skipped:
+            self.print_colored(f"已是最新（略過）: {len(self.results.skipped)}", Color.GRAY)
         self.print_colored(f"安裝失敗: {len(self.failed_installs)}", Color.RED)
         
         if self.failed_installs:
             self.print_colored("\n失敗的伺服器:", Color.RED, True)
             for failed in self.failed_installs:
                 self.print_colored(f"  - {failed}", Color.RED)
+            self.print_colored("修正問題後可用 --resume 只重試未完成的伺服器", Color.YELLOW)
+        
+        slowest = sorted(self.results.durations.items(), key=lambda item: item[1], reverse=True)[:5]
+        if slowest:
+            self.print_colored("\n最耗時的伺服器:", Color.YELLOW, True)
+            for name, duration in slowest:
+                self.print_colored(f"  {duration:6.1f}s  {name}", Color.GRAY)
         
         self.print_colored("\n下一步:", Color.YELLOW, True)
         self.print_colored("1. 編輯環境變量模板文件設置必要的 API Keys", Color.WHITE)
@@ -424,6 +732,7 @@ class MCPInstaller:
             f.write('\n'.join(self.install_log))
         
         self.print_colored(f"\n安裝日誌已保存到: {log_file}", Color.CYAN)
+        self.print_colored(f"安裝事件（JSONL）已保存到: {self.events.path}", Color.CYAN)
 
 
 def main():
@@ -434,16 +743,42 @@ def main():
                        help="指定安裝方法")
     parser.add_argument("--servers", help="指定要安裝的伺服器列表，用逗號分隔")
     parser.add_argument("--skip-check", action="store_true", help="跳過先決條件檢查")
+    parser.add_argument("--refresh-check", action="store_true",
+                        help="忽略 ~/.mcp/toolchain.json 快取，重新查詢所有工具版本")
+    parser.add_argument("--jobs", "-j", type=int, default=DEFAULT_JOBS,
+                        help=f"同時進行的安裝數量（預設 {DEFAULT_JOBS}，1 為逐一安裝）")
+    parser.add_argument("--method-limit", metavar="METHOD=N[,...]",
+                        help="各安裝方法的並行上限，例如 npm=4,pip=4,git=6,go=2")
+    parser.add_argument("--batch", action="store_true",
+                        help="npm 包以一次調用安裝，失敗時二分找出出錯的包")
+    parser.add_argument("--force", action="store_true",
+                        help="忽略 ~/.mcp/installed.json，重新安裝（及更新）所有選定的伺服器")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--prefetch", action="store_true",
+                        help="只下載選定伺服器所需的包、wheel、git bundle 與 Go 模組到快取，不安裝")
+    source.add_argument("--offline", action="store_true",
+                        help="只從 --prefetch 建立的快取安裝，不連網")
+    parser.add_argument("--cache-dir", help="包快取目錄（預設 ~/.mcp/cache）")
+    parser.add_argument("--resume", action="store_true",
+                        help="繼續上一次的安裝工作階段，只安裝未完成或失敗的伺服器")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES,
+                        help=f"網路等暫時性錯誤的重試次數（預設 {DEFAULT_RETRIES}，0 為不重試）")
+    compile_group = parser.add_mutually_exclusive_group()
+    compile_group.add_argument("--optimize", metavar="LEVEL[,...]",
+                               help="預先編譯 Python 伺服器 .pyc 的最佳化等級，例如 0,1,2（預設 0）")
+    compile_group.add_argument("--no-compile", action="store_true",
+                               help="安裝後不預先編譯 Python 伺服器的 .pyc")
     
+    add_profile_arguments(parser)
     args = parser.parse_args()
     
     # 創建安裝器實例
-    installer = MCPInstaller(args.config)
+    installer = MCPInstaller(args.config, args.cache_dir, args.offline, args.retries)
     
     try:
         # 檢查先決條件
         if not args.skip_check:
-            if not installer.check_prerequisites():
+            if not installer.check_prerequisites(args.refresh_check):
                 sys.exit(1)
         
         # 載入配置
@@ -460,8 +795,30 @@ def main():
         if args.servers:
             server_list = [s.strip() for s in args.servers.split(",")]
         
+        try:
+            method_limits = parse_method_limits(args.method_limit)
+            compile_levels = [] if args.no_compile else parse_optimize_levels(args.optimize)
+        except ValueError as e:
+            installer.print_colored(str(e), Color.RED)
+            sys.exit(1)
+        
+        if args.prefetch:
+            sys.exit(0 if installer.prefetch(methods, server_list, args.jobs, method_limits) else 1)
+        
+        # 只保留上一次工作階段中未完成的伺服器（仍可用 --method / --servers 進一步篩選）
+        if args.resume:
+            pending = installer.session.pending()
+            if pending is None:
+                installer.print_colored("沒有可恢復的安裝工作階段", Color.RED)
+                sys.exit(1)
+            server_list = [key for key in pending if not server_list or key in server_list]
+            if not server_list:
+                installer.print_colored("上一次的安裝工作階段已全部完成", Color.GREEN)
+                sys.exit(0)
+        
         # 開始安裝
-        installer.install_all(methods, server_list)
+        installer.install_all(methods, server_list, args.jobs, method_limits, args.batch, args.force,
+                              args.resume, compile_levels)
         
         # 生成配置文件
         installer.generate_vscode_config()
@@ -479,4 +836,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_profiled(main)
\ No newline at end of file
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MCP 伺服器並行安裝排程器
+讓 install_all 同時執行多個安裝，總耗時取決於最慢的幾個包而非全部相加
+
+排程規則:
+- 最多同時執行 jobs 個安裝
+- 每種安裝方法各有並行上限（go 編譯佔用 CPU，預設最多兩個）
+- 系統負載或可用記憶體不足時暫停啟動新安裝，但至少保留一個在執行，避免卡死
+- 結果由 InstallResults 以鎖保護記錄，可從任何工作執行緒呼叫
+
+作者: MCP Navigator Project
+"""
+
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+# 各安裝方法的預設並行上限
+DEFAULT_METHOD_LIMITS = {
+    "npm": 4,    # npm 快取自帶鎖，不同包可同時全域安裝
+    "pip": 4,    # 每個伺服器各自的虛擬環境，解析與連結互不干擾
+    "git": 6,    # 以網路 I/O 為主
+    "go": 2,     # 編譯佔用大量 CPU
+    "unity": 1,
+}
+
+DEFAULT_JOBS = min(8, os.cpu_count() or 1)
+
+# 每個 CPU 核心的 1 分鐘平均負載上限，以及啟動新安裝前需保留的可用記憶體
+MAX_LOAD_PER_CPU = 1.5
+MIN_AVAILABLE_MEMORY_MB = 512
+
+THROTTLE_POLL_INTERVAL = 0.5
+
+
+def parse_method_limits(text: Optional[str]) -> Dict[str, int]:
+    """解析 "npm=4,pip=1" 形式的並行上限，未指定的方法沿用預設值"""
+    limits = dict(DEFAULT_METHOD_LIMITS)
+    if not text:
+        return limits
+    for item in text.split(","):
+        method, _, value = item.partition("=")
+        method = method.strip()
+        if method not in limits or not value.strip().isdigit() or int(value) < 1:
+            raise ValueError(f"無效的並行上限: {item!r}（格式如 npm=4,pip=1）")
+        limits[method] = int(value)
+    return limits
+
+
+class ResourceMonitor:
+    """讀取系統負載與可用記憶體；無法取得時視為資源充足"""
+
+    def __init__(self, max_load_per_cpu: float = MAX_LOAD_PER_CPU,
+                 min_available_mb: int = MIN_AVAILABLE_MEMORY_MB):
+        self.max_load = max_load_per_cpu * (os.cpu_count() or 1)
+        self.min_available_mb = min_available_mb
+
+    @staticmethod
+    def load_average() -> Optional[float]:
+        try:
+            return os.getloadavg()[0]
+        except (AttributeError, OSError):
+            return None
+
+    @staticmethod
+    def available_memory_mb() -> Optional[float]:
+        try:
+            with open("/proc/meminfo", "r", encoding="ascii") as f:
+                for line in f:
+                    if line.startswith("MemAvailable:"):
+                        return int(line.split()[1]) / 1024
+        except (OSError, ValueError, IndexError):
+            pass
+        return None
+
+    def throttle_reason(self) -> Optional[str]:
+        """資源不足時返回原因，否則返回 None"""
+        load = self.load_average()
+        if load is not None and load > self.max_load:
+            return f"系統負載 {load:.1f} 超過 {self.max_load:.1f}"
+        available = self.available_memory_mb()
+        if available is not None and available < self.min_available_mb:
+            return f"可用記憶體 {available:.0f} MB 低於 {self.min_available_mb} MB"
+        return None
+
+
+@dataclass
+class InstallResults:
+    """執行緒安全的安裝結果統計"""
+    success_count: int = 0
+    failed_installs: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    install_log: List[str] = field(default_factory=list)
+    outcomes: Dict[str, bool] = field(default_factory=dict)
+    durations: Dict[str, float] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, name: str, success: bool, duration: Optional[float] = None) -> None:
+        with self._lock:
+            self.outcomes[name] = success
+            if success:
+                self.success_count += 1
+                self.install_log.append(f"✓ {name}")
+            else:
+                self.failed_installs.append(name)
+                self.install_log.append(f"✗ {name}")
+            if duration is not None:
+                self.durations[name] = duration
+
+    def record_skipped(self, name: str) -> None:
+        """已是最新而略過的伺服器，視同可用"""
+        with self._lock:
+            self.outcomes[name] = True
+            self.skipped.append(name)
+            self.install_log.append(f"= {name}")
+
+
+@dataclass
+class InstallTask:
+    """一個待執行的安裝"""
+    key: str
+    method: str
+    run: Callable[[], bool]
+
+
+class InstallScheduler:
+    """依 jobs、方法上限與系統資源排程安裝任務"""
+
+    def __init__(self, jobs: int = DEFAULT_JOBS, method_limits: Optional[Dict[str, int]] = None,
+                 monitor: Optional[ResourceMonitor] = None,
+                 log: Optional[Callable[[str], None]] = None):
+        self.jobs = max(1, jobs)
+        self.method_limits = method_limits or dict(DEFAULT_METHOD_LIMITS)
+        self.monitor = monitor or ResourceMonitor()
+        self.log = log or (lambda message: None)
+
+    def run(self, tasks: List[InstallTask]) -> Dict[str, bool]:
+        """執行所有任務並返回 key -> 是否成功；任務本身的例外視為失敗"""
+        pending = list(tasks)
+        running: Dict[Future, InstallTask] = {}
+        active = {method: 0 for method in self.method_limits}
+        outcome: Dict[str, bool] = {}
+        throttled = False
+
+        with ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="mcp-install") as executor:
+            while pending or running:
+                # 依序啟動可啟動的任務；某方法已滿時略過，讓其他方法的任務先行
+                for task in list(pending):
+                    if len(running) >= self.jobs:
+                        break
+                    if active.get(task.method, 0) >= self.method_limits.get(task.method, self.jobs):
+                        continue
+                    if running:
+                        reason = self.monitor.throttle_reason()
+                        if reason:
+                            if reason != throttled:
+                                self.log(f"暫緩啟動新安裝: {reason}")
+                            throttled = reason
+                            break
+                    throttled = False
+                    pending.remove(task)
+                    active[task.method] = active.get(task.method, 0) + 1
+                    running[executor.submit(task.run)] = task
+
+                done, _ = wait(running, timeout=THROTTLE_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    active[task.method] -= 1
+                    try:
+                        outcome[task.key] = bool(future.result())
+                    except Exception as e:
+                        self.log(f"✗ {task.key} 安裝異常: {e}")
+                        outcome[task.key] = False
+
+        return outcome
+
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MCP 伺服器安裝工作階段
+以檢查點記錄每個伺服器的安裝狀態，中斷或部分失敗後可用 --resume 只執行剩下的工作
+
+檢查點位於 ~/.mcp/install-session.json，每次狀態變更後以原子寫入更新:
+    {"format": "mcp-install-session", "version": 1, "started_at": "...", "resumed": 1,
+     "options": {"method": null, "servers": null, "batch": false, ...},
+     "servers": {"fetch": {"status": "succeeded", "attempts": 2, "updated_at": "..."}, ...}}
+
+狀態: pending（尚未開始）、running（執行中；程序中斷時保留此狀態）、succeeded、
+skipped（已是最新）、failed。--resume 重新執行 pending、running 與 failed 的伺服器。
+
+暫時性錯誤（網路逾時、連線重設、DNS 失敗、HTTP 429/5xx）由 RetryPolicy 在指令層級重試，
+間隔為指數退避加上隨機抖動（full jitter），避免多個並行安裝同時重試。
+
+作者: MCP Navigator Project
+"""
+
+import json
+import os
+import random
+import re
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+SESSION_FORMAT = "mcp-install-session"
+SESSION_VERSION = 1
+
+DEFAULT_RETRIES = 3
+RETRY_BASE_DELAY = 2.0
+RETRY_MAX_DELAY = 60.0
+
+DONE_STATUSES = ("succeeded", "skipped")
+
+# npm、pip、git、go 的暫時性網路錯誤
+_TRANSIENT = re.compile(
+    r"ETIMEDOUT|ECONNRESET|ECONNREFUSED|EAI_AGAIN|ENOTFOUND|ESOCKETTIMEDOUT|socket hang up"
+    r"|Read timed out|ReadTimeoutError|Connection (?:reset|refused|aborted)|ConnectionError"
+    r"|Temporary failure in name resolution|Could not resolve host|Failed to establish a new connection"
+    r"|early EOF|RPC failed|unexpected disconnect|TLS handshake timeout|i/o timeout"
+    r"|Too Many Requests|Internal Server Error|Bad Gateway|Service Unavailable|Gateway Time-?out"
+    r"|HTTP error (?:429|5\d\d)|returned error: (?:429|5\d\d)",
+    re.IGNORECASE,
+)
+
+
+def is_transient(stderr: str) -> bool:
+    """失敗輸出是否像是重試可能成功的網路錯誤"""
+    return bool(stderr and _TRANSIENT.search(stderr))
+
+
+@dataclass
+class RetryPolicy:
+    """暫時性失敗的重試次數與指數退避"""
+    retries: int = DEFAULT_RETRIES
+    base_delay: float = RETRY_BASE_DELAY
+    max_delay: float = RETRY_MAX_DELAY
+
+    def delay(self, attempt: int) -> float:
+        """第 attempt 次重試（從 0 起算）前的等待秒數：0 到 base·2^attempt 之間的隨機值"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def run(self, call: Callable[[], object],
+            on_retry: Optional[Callable[[int, float, str], None]] = None,
+            sleep: Callable[[float], None] = time.sleep):
+        """執行 call（返回帶 returncode/stderr 的結果）；暫時性失敗或逾時時重試"""
+        attempt = 0
+        while True:
+            try:
+                result = call()
+            except subprocess.TimeoutExpired:
+                if attempt >= self.retries:
+                    raise
+                reason = "超時"
+            else:
+                if result.returncode == 0 or attempt >= self.retries or not is_transient(result.stderr):
+                    return result
+                reason = _TRANSIENT.search(result.stderr).group(0)
+            delay = self.delay(attempt)
+            attempt += 1
+            if on_retry:
+                on_retry(attempt, delay, reason)
+            sleep(delay)
+
+
+class InstallSession:
+    """安裝工作階段的檢查點；可從多個安裝執行緒同時呼叫"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.data: Optional[Dict] = None
+
+    def load(self) -> Optional[Dict]:
+        """讀取上一次的工作階段；不存在或格式不符時返回 None"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("format") != SESSION_FORMAT or data.get("version") != SESSION_VERSION:
+            return None
+        self.data = data
+        return data
+
+    def pending(self) -> Optional[List[str]]:
+        """上一次工作階段中尚未完成的伺服器；沒有工作階段時返回 None"""
+        if self.data is None and self.load() is None:
+            return None
+        return [key for key, entry in self.data["servers"].items()
+                if entry.get("status") not in DONE_STATUSES]
+
+    def begin(self, server_keys: List[str], options: Dict) -> None:
+        """開始新的工作階段，覆寫舊的檢查點"""
+        with self._lock:
+            self.data = {
+                "format": SESSION_FORMAT,
+                "version": SESSION_VERSION,
+                "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "resumed": 0,
+                "options": options,
+                "servers": {key: {"status": "pending", "attempts": 0} for key in server_keys},
+            }
+            self._save()
+
+    def resume(self) -> None:
+        """沿用已載入的工作階段繼續執行"""
+        with self._lock:
+            self.data["resumed"] = self.data.get("resumed", 0) + 1
+            self.data["resumed_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+            self._save()
+
+    def mark(self, server_key: str, status: str, error: Optional[str] = None) -> None:
+        with self._lock:
+            if self.data is None:
+                return
+            entry = self.data["servers"].setdefault(server_key, {"attempts": 0})
+            entry["status"] = status
+            entry["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+            if status == "running":
+                entry["attempts"] = entry.get("attempts", 0) + 1
+            if error:
+                entry["error"] = error[-500:]
+            else:
+                entry.pop("error", None)
+            self._save()
+
+    def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        with self._lock:
+            for entry in (self.data or {}).get("servers", {}).values():
+                counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+        return counts
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.path.with_name(self.path.name + ".tmp")
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, indent=2, ensure_ascii=False)
+        os.replace(temp, self.path)
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MCP 伺服器安裝狀態清單
+記錄已安裝的伺服器，重複執行安裝腳本時略過未變更的伺服器
+
+清單位於 ~/.mcp/installed.json，每個伺服器記錄：
+- package、method、spec_hash（配置中的包名、安裝方法與倉庫的雜湊）
+- version    安裝後解析出的實際版本（npm/pip 版本號、git commit、go 包路徑）
+- path       安裝位置（npm 包目錄、伺服器虛擬環境中的 pip dist-info、git 克隆目錄、go 執行檔）
+- marker     用來快速驗證的文件及其 stat（大小、mtime）：npm 的 package.json、
+             pip 的 METADATA、git 的 .git/index、go 的執行檔
+- sha256     marker 內容的 SHA-256
+
+驗證順序由快到慢：
+1. 配置未變更，且 marker 的 stat 與記錄相同 → 視為最新，不啟動任何子程序
+2. stat 不同時讀取版本（package.json / METADATA / git HEAD），並重新計算 marker 的
+   SHA-256；版本與內容都相同則更新 stat 記錄
+3. 其他情況（包括 marker 被改動或損壞）重新安裝
+
+作者: MCP Navigator Project
+"""
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from python_envs import environment_paths
+
+MANIFEST_FORMAT = "mcp-installed"
+MANIFEST_VERSION = 1
+PROBE_TIMEOUT = 30
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def marker_sha256(path: Path) -> Optional[str]:
+    try:
+        return file_sha256(path)
+    except OSError:
+        return None
+
+
+def stat_signature(path: Path) -> Optional[list]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def spec_hash(server) -> str:
+    """配置中會影響安裝結果的欄位雜湊；任何一項變更都會觸發重新安裝"""
+    spec = f"{server.installation_method.value}\0{server.package}\0{server.repository}"
+    return hashlib.sha256(spec.encode("utf-8")).hexdigest()[:16]
+
+
+def npm_package_name(spec: str) -> str:
+    """去掉版本：@scope/pkg@1.2 -> @scope/pkg"""
+    at = spec.find("@", 1)
+    return spec if at == -1 else spec[:at]
+
+
+def pip_distribution_name(spec: str) -> str:
+    """去掉版本與 extras：pkg[extra]>=1.0 -> pkg"""
+    return re.split(r"[\[<>=!~;\s]", spec, maxsplit=1)[0]
+
+
+def _run(cmd, cwd=None) -> Optional[str]:
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=PROBE_TIMEOUT, cwd=cwd)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+class InstalledState:
+    """~/.mcp/installed.json 的讀寫與驗證；可從多個安裝執行緒同時呼叫"""
+
+    def __init__(self, path: Path, servers_dir: Path):
+        self.path = Path(path)
+        self.servers_dir = Path(servers_dir)
+        self._lock = threading.Lock()
+        self._probes: Dict[str, Optional[str]] = {}
+        self._probe_locks: Dict[str, threading.Lock] = {}
+        self.entries: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("format") != MANIFEST_FORMAT or data.get("version") != MANIFEST_VERSION:
+            return {}
+        return data.get("servers", {})
+
+    def save(self) -> None:
+        with self._lock:
+            payload = {"format": MANIFEST_FORMAT, "version": MANIFEST_VERSION,
+                       "servers": dict(sorted(self.entries.items()))}
+            temp = self.path.with_name(self.path.name + ".tmp")
+            with open(temp, "w", encoding="utf-8") as f:
+                json.dump(payload, f, indent=2, ensure_ascii=False)
+            os.replace(temp, self.path)
+
+    def _probe(self, name: str, cmd) -> Optional[str]:
+        """每次執行只調用一次的工具查詢（npm 全域目錄、go bin 目錄）
+
+        查詢可能耗時數秒，只持有該查詢自己的鎖，不阻擋其他執行緒讀寫清單
+        """
+        with self._lock:
+            if name in self._probes:
+                return self._probes[name]
+            probe_lock = self._probe_locks.setdefault(name, threading.Lock())
+        with probe_lock:
+            with self._lock:
+                if name in self._probes:
+                    return self._probes[name]
+            value = _run(cmd)
+            with self._lock:
+                self._probes[name] = value
+            return value
+
+    # 各安裝方法的 (marker 文件, 安裝位置, 版本) 解析
+
+    def _locate_npm(self, server) -> Optional[Tuple[Path, Path, str]]:
+        root = self._probe("npm-root", ["npm", "root", "-g"])
+        if not root:
+            return None
+        package_dir = Path(root) / npm_package_name(server.package)
+        marker = package_dir / "package.json"
+        try:
+            with open(marker, "r", encoding="utf-8") as f:
+                version = json.load(f).get("version", "")
+        except (OSError, ValueError):
+            return None
+        return marker, package_dir, version
+
+    def _locate_pip(self, server, server_key: str, entry: Optional[Dict] = None) -> Optional[Tuple[Path, Path, str]]:
+        # 已知 dist-info 位置時直接讀 METADATA，否則在伺服器的虛擬環境中尋找
+        if entry and entry.get("path"):
+            marker = Path(entry["path"]) / "METADATA"
+            version = self._metadata_version(marker)
+            if version:
+                return marker, marker.parent, version
+        site_packages = environment_paths(self.servers_dir / server_key).site_packages
+        wanted = re.sub(r"[-_.]+", "_", pip_distribution_name(server.package)).lower()
+        for dist_info in site_packages.glob("*.dist-info"):
+            name, _, _ = dist_info.name[:-len(".dist-info")].rpartition("-")
+            if re.sub(r"[-_.]+", "_", name).lower() == wanted:
+                marker = dist_info / "METADATA"
+                version = self._metadata_version(marker)
+                return (marker, dist_info, version) if version else None
+        return None
+
+    @staticmethod
+    def _metadata_version(marker: Path) -> Optional[str]:
+        try:
+            with open(marker, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith("Version:"):
+                        return line.split(":", 1)[1].strip()
+                    if not line.strip():
+                        break
+        except OSError:
+            pass
+        return None
+
+    def _locate_git(self, server, server_key: str) -> Optional[Tuple[Path, Path, str]]:
+        clone_dir = self.servers_dir / server_key
+        output = _run(["git", "-C", str(clone_dir), "rev-parse", "HEAD", "--git-path", "index"])
+        if not output or len(output.splitlines()) != 2:
+            return None
+        head, index = output.splitlines()
+        # 索引文件在 checkout/pull 時改寫，比 HEAD（通常只是分支引用）更能反映工作區變化；
+        # worktree 的索引位於共用克隆的 .git/worktrees/<name>/ 之下
+        return clone_dir / index, clone_dir, head
+
+    def _locate_go(self, server) -> Optional[Tuple[Path, Path, str]]:
+        gobin = self._probe("go-bin", ["go", "env", "GOBIN"])
+        if not gobin:
+            gopath = self._probe("go-path", ["go", "env", "GOPATH"])
+            if not gopath:
+                return None
+            gobin = str(Path(gopath.split(os.pathsep)[0]) / "bin")
+        binary = Path(gobin) / server.package.split("@")[0].rstrip("/").split("/")[-1]
+        if not binary.exists():
+            return None
+        return binary, binary, server.package
+
+    def _locate(self, server_key: str, server, entry: Optional[Dict] = None):
+        method = server.installation_method.value
+        if method == "npm":
+            return self._locate_npm(server)
+        if method == "pip":
+            return self._locate_pip(server, server_key, entry)
+        if method == "git":
+            return self._locate_git(server, server_key)
+        if method == "go":
+            return self._locate_go(server)
+        return None
+
+    def is_current(self, server_key: str, server) -> bool:
+        """伺服器是否已按目前配置安裝且未被改動"""
+        with self._lock:
+            entry = self.entries.get(server_key)
+        if not entry or entry.get("spec_hash") != spec_hash(server):
+            return False
+        # 舊版安裝到全域直譯器的 pip 伺服器需重新安裝到自己的虛擬環境
+        if server.installation_method.value == "pip" and \
+                self.servers_dir / server_key not in Path(entry["path"]).parents:
+            return False
+
+        signature = stat_signature(Path(entry["marker"]))
+        if signature is not None and signature == entry.get("stat"):
+            return True
+
+        # stat 不同（例如被重新安裝、修改或只是 touch），以版本與內容雜湊判斷
+        located = self._locate(server_key, server, entry)
+        if not located or located[2] != entry.get("version"):
+            return False
+        marker, path, version = located
+        digest = marker_sha256(marker)
+        # 舊版清單沒有 sha256，此時以版本為準並補上雜湊
+        if digest is None or (entry.get("sha256") and digest != entry["sha256"]):
+            return False
+        with self._lock:
+            entry.update(marker=str(marker), path=str(path), stat=stat_signature(marker), sha256=digest)
+        return True
+
+    def record_install(self, server_key: str, server) -> Optional[Dict]:
+        """安裝成功後記錄版本與位置；無法解析位置的方法（如 unity）不記錄"""
+        located = self._locate(server_key, server)
+        if not located:
+            with self._lock:
+                self.entries.pop(server_key, None)
+            return None
+        marker, path, version = located
+        entry = {
+            "name": server.name,
+            "package": server.package,
+            "method": server.installation_method.value,
+            "spec_hash": spec_hash(server),
+            "version": version,
+            "path": str(path),
+            "marker": str(marker),
+            "stat": stat_signature(marker),
+            "sha256": marker_sha256(marker),
+            "installed_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        with self._lock:
+            self.entries[server_key] = entry
+        return entry
+
+    def location(self, server_key: str, server) -> Optional[Path]:
+        """已安裝的位置（npm 包目錄、pip dist-info、git 克隆目錄、go 執行檔）；優先使用清單記錄"""
+        with self._lock:
+            entry = self.entries.get(server_key)
+        if entry and entry.get("spec_hash") == spec_hash(server) and Path(entry["path"]).exists():
+            return Path(entry["path"])
+        located = self._locate(server_key, server, entry)
+        return located[1] if located else None
+
+    def forget(self, server_key: str) -> None:
+        with self._lock:
+            self.entries.pop(server_key, None)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MCP 伺服器啟動指令解析
+為 VS Code 配置寫入已安裝伺服器的絕對路徑，啟動時不經過 npx / 包管理器解析
+
+- npm   讀取已安裝包的 package.json "bin"，寫入 node 的絕對路徑與入口腳本
+- pip   伺服器虛擬環境的直譯器，加上依 entry_points.txt 生成的 console script；
+        沒有 console script 時以該直譯器執行 -m <模組>。舊版的全域安裝則從 RECORD
+        找出 console script 的絕對路徑（其 shebang 即安裝時的直譯器）
+- go    安裝清單記錄的執行檔
+- git   node / python 的絕對路徑加上入口文件
+
+安裝位置取自 InstalledState（~/.mcp/installed.json），無法解析時返回 None，
+由呼叫者退回 npx / python -m。
+
+作者: MCP Navigator Project
+"""
+
+import json
+import os
+import shutil
+import sys
+from configparser import ConfigParser, Error as ConfigParserError
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from install_state import InstalledState, npm_package_name, pip_distribution_name
+from python_envs import environment_paths
+
+LaunchCommand = Tuple[str, List[str]]
+
+_SCRIPT_DIRS = ("bin", "Scripts")
+
+
+def which(name: str) -> Optional[str]:
+    """PATH 中的工具的絕對路徑（不解析符號連結，以免 venv 的 python 指向基底直譯器）"""
+    found = shutil.which(name)
+    return os.path.abspath(found) if found else None
+
+
+def _read_shebang(script: Path) -> Optional[str]:
+    try:
+        with open(script, "rb") as f:
+            line = f.readline(512).decode("utf-8", "replace").strip()
+    except OSError:
+        return None
+    if not line.startswith("#!"):
+        return None
+    parts = line[2:].split()
+    # 只接受直接指向 python 的 shebang，"#!/usr/bin/env python" 或 shell 包裝腳本不算
+    if not parts or not Path(parts[0]).name.startswith("python") or not Path(parts[0]).is_file():
+        return None
+    return parts[0]
+
+
+class LaunchResolver:
+    """依安裝清單解析各伺服器的啟動指令"""
+
+    def __init__(self, state: InstalledState):
+        self.state = state
+        self._node = which("node")
+
+    def resolve(self, server_key: str, server) -> Optional[LaunchCommand]:
+        method = server.installation_method.value
+        location = self.state.location(server_key, server)
+        if not location:
+            return None
+        if method == "npm":
+            return self._resolve_npm(server, location)
+        if method == "pip":
+            return self._resolve_pip(server_key, server, location)
+        if method == "go":
+            return (str(location), []) if location.is_file() else None
+        return None
+
+    def resolve_source(self, server_dir: Path) -> Optional[LaunchCommand]:
+        """Git 伺服器原始碼目錄的入口文件，以 node / python 的絕對路徑執行"""
+        if (server_dir / "package.json").exists():
+            return self._node or "node", [str(server_dir / "index.js")]
+        if (server_dir / "main.py").exists():
+            return which("python") or "python", [str(server_dir / "main.py")]
+        return None
+
+    def _resolve_npm(self, server, package_dir: Path) -> Optional[LaunchCommand]:
+        if not self._node:
+            return None
+        try:
+            with open(package_dir / "package.json", "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        bin_field = manifest.get("bin")
+        if isinstance(bin_field, str):
+            entry = bin_field
+        elif isinstance(bin_field, dict) and bin_field:
+            # 多個執行檔時取與包同名者，例如 @scope/server-x 的 "server-x"
+            short_name = npm_package_name(server.package).split("/")[-1]
+            entry = bin_field.get(short_name) or next(iter(bin_field.values()))
+        else:
+            return None
+        script = (package_dir / entry).resolve()
+        return (self._node, [str(script)]) if script.is_file() else None
+
+    def _resolve_pip(self, server_key: str, server, dist_info: Path) -> Optional[LaunchCommand]:
+        wanted = pip_distribution_name(server.package).lower().replace("_", "-")
+        scripts = sorted(self._console_scripts(dist_info),
+                         key=lambda name: name.lower().replace("_", "-") != wanted)
+        module = pip_distribution_name(server.package).replace("-", "_")
+
+        env = environment_paths(self.state.servers_dir / server_key)
+        if env.root in dist_info.parents:
+            # 明確以環境的直譯器執行 console script，不依賴 shebang
+            for name in scripts:
+                if (env.scripts / name).is_file():
+                    return str(env.python), [str(env.scripts / name)]
+            return str(env.python), ["-m", module]
+
+        site_packages = dist_info.parent
+        installed = {}
+        try:
+            with open(dist_info / "RECORD", "r", encoding="utf-8") as f:
+                for line in f:
+                    relative = line.split(",", 1)[0]
+                    path = Path(relative)
+                    if path.parent.name in _SCRIPT_DIRS:
+                        installed[path.stem if path.suffix == ".exe" else path.name] = relative
+        except OSError:
+            pass
+
+        for name in scripts:
+            if name in installed:
+                script = Path(os.path.normpath(site_packages / installed[name]))
+                if script.is_file():
+                    return str(script), []
+
+        interpreter = self._interpreter_for(site_packages, installed)
+        return interpreter, ["-m", module]
+
+    @staticmethod
+    def _console_scripts(dist_info: Path) -> List[str]:
+        parser = ConfigParser(interpolation=None)
+        parser.optionxform = str
+        try:
+            parser.read(dist_info / "entry_points.txt", encoding="utf-8")
+        except (OSError, ConfigParserError):
+            return []
+        return list(parser["console_scripts"]) if parser.has_section("console_scripts") else []
+
+    @staticmethod
+    def _interpreter_for(site_packages: Path, installed: dict) -> str:
+        """安裝該包的直譯器：任一已安裝腳本的 shebang，其次是 pip 的 shebang"""
+        for relative in installed.values():
+            interpreter = _read_shebang(Path(os.path.normpath(site_packages / relative)))
+            if interpreter:
+                return interpreter
+        pip = shutil.which("pip")
+        interpreter = _read_shebang(Path(pip)) if pip else None
+        return interpreter or which("python") or sys.executable
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MCP 伺服器離線包快取
+預先下載所有安裝所需的內容，供無網路的主機以本地磁碟速度安裝
+
+目錄結構（預設 ~/.mcp/cache，可用 --cache-dir 指定，例如共享磁碟）:
+    blobs/sha256/<ab>/<digest>   內容定址的檔案（wheel、sdist、git bundle），相同內容只存一份
+    pip/wheelhouse/<filename>    指向 blobs 的硬連結，供 pip --find-links 使用
+    git/<host>/<owner>/<repo>.bundle
+                                 指向 blobs 的硬連結，完整倉庫的 git bundle
+    npm/                         npm 自身的內容定址快取（cacache），包含所有依賴的 tarball
+    go/mod/                      Go 模組快取；go/mod/cache/download 可直接作為 GOPROXY
+    manifest.json                每個伺服器預取了哪些內容及其雜湊；npm 與 Go 另記錄
+                                 快取中必須存在的 tarball 與模組 zip 路徑，供 --offline 前檢查
+
+各安裝方法在離線模式下的來源:
+    npm   npm install -g --offline --cache <cache>/npm
+    pip   pip wheel --no-index --find-links <cache>/pip/wheelhouse（再連結到伺服器的虛擬環境）
+    git   從 bundle 克隆或 fetch
+    go    GOPROXY=file://<cache>/go/mod/cache/download GOSUMDB=off
+
+作者: MCP Navigator Project
+"""
+
+import base64
+import errno
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from git_checkout import RepositoryLocation, parse_repository
+from install_state import file_sha256, spec_hash
+
+MANIFEST_FORMAT = "mcp-package-cache"
+MANIFEST_VERSION = 1
+PREFETCH_TIMEOUT = 900
+
+PrefetchResult = Tuple[bool, str, List[str], List[str]]
+
+
+def _run(cmd: List[str], env: Optional[Dict[str, str]] = None) -> Tuple[bool, str]:
+    ok, _, error = _capture(cmd, env)
+    return ok, error
+
+
+def _capture(cmd: List[str], env: Optional[Dict[str, str]] = None) -> Tuple[bool, str, str]:
+    """執行 cmd，返回 (是否成功, stdout, stderr)"""
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=PREFETCH_TIMEOUT, env=env)
+    except subprocess.TimeoutExpired:
+        return False, "", f"{cmd[0]} 超時"
+    except OSError as e:
+        return False, "", str(e)
+    return result.returncode == 0, result.stdout, result.stderr.strip()
+
+
+def cacache_content_path(integrity: str) -> Optional[str]:
+    """npm 的 integrity（例如 "sha512-<base64>"）在 cacache 中的內容路徑（相對於 _cacache）"""
+    if not integrity.strip():
+        return None
+    algorithm, _, encoded = integrity.split()[0].partition("-")
+    try:
+        digest = base64.b64decode(encoded, validate=True).hex()
+    except ValueError:
+        return None
+    if not algorithm or not digest:
+        return None
+    return f"content-v2/{algorithm}/{digest[:2]}/{digest[2:4]}/{digest[4:]}"
+
+
+def go_module_zip(module: str, version: str) -> str:
+    """模組快取中 module@version 的 zip 路徑（相對於 cache/download；大寫字母依 Go 規則轉義）"""
+    escaped = "".join(f"!{c.lower()}" if c.isupper() else c for c in module)
+    return f"{escaped}/@v/{version}.zip"
+
+
+class PackageCache:
+    """內容定址的離線包快取；可從多個預取執行緒同時呼叫"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.blobs_dir = self.root / "blobs" / "sha256"
+        self.wheelhouse = self.root / "pip" / "wheelhouse"
+        self.bundles_dir = self.root / "git"
+        self.npm_cache = self.root / "npm"
+        self.go_modcache = self.root / "go" / "mod"
+        self.manifest_path = self.root / "manifest.json"
+        self._lock = threading.Lock()
+        self._repo_locks: Dict[str, threading.Lock] = {}
+        self._bundled = set()  # 本次執行已打包的倉庫
+        self.manifest = self._load()
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        if data.get("format") != MANIFEST_FORMAT or data.get("version") != MANIFEST_VERSION:
+            data = {"format": MANIFEST_FORMAT, "version": MANIFEST_VERSION, "servers": {}, "bundles": {}}
+        return data
+
+    def save(self) -> None:
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            temp = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+            with open(temp, "w", encoding="utf-8") as f:
+                json.dump(self.manifest, f, indent=2, ensure_ascii=False, sort_keys=True)
+            os.replace(temp, self.manifest_path)
+
+    # 內容定址儲存
+
+    def blob_path(self, digest: str) -> Path:
+        return self.blobs_dir / digest[:2] / digest
+
+    def staging(self, prefix: str) -> tempfile.TemporaryDirectory:
+        """位於快取根目錄下的暫存目錄，store() 可直接改名移入 blobs"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        return tempfile.TemporaryDirectory(prefix=prefix, dir=self.root)
+
+    def store(self, source: Path, link: Path) -> str:
+        """把 source 移入 blobs（已存在則丟棄），並在 link 建立指向它的硬連結"""
+        digest = file_sha256(source)
+        blob = self.blob_path(digest)
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        if blob.exists():
+            source.unlink()
+        else:
+            try:
+                os.replace(source, blob)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                # 來源在其他檔案系統：先複製到 blobs 旁再改名，避免留下不完整的 blob
+                temp = blob.with_name(f"{blob.name}.{threading.get_ident()}.tmp")
+                shutil.copy2(source, temp)
+                os.replace(temp, blob)
+                source.unlink()
+        link.parent.mkdir(parents=True, exist_ok=True)
+        temp = link.with_name(f"{link.name}.{threading.get_ident()}.tmp")
+        try:
+            os.link(blob, temp)
+        except OSError:
+            # 跨檔案系統無法硬連結時改為複製
+            shutil.copy2(blob, temp)
+        os.replace(temp, link)
+        return digest
+
+    def verify(self, server_key: str, server) -> Optional[str]:
+        """離線安裝前的檢查；返回問題描述，沒問題時返回 None"""
+        entry = self.manifest["servers"].get(server_key)
+        if not entry:
+            return "尚未預取（請先在有網路的主機執行 --prefetch）"
+        if entry.get("spec_hash") != spec_hash(server):
+            return "配置已變更，快取內容已過期（請重新 --prefetch）"
+        missing = [digest for digest in entry.get("blobs", []) if not self.blob_path(digest).exists()]
+        missing += [path for path in entry.get("files", []) if not (self.root / path).exists()]
+        if missing:
+            return f"快取缺少 {len(missing)} 個檔案（請重新 --prefetch）"
+        return None
+
+    def _record(self, server_key: str, server, blobs: List[str], files: List[str]) -> None:
+        with self._lock:
+            self.manifest["servers"][server_key] = {
+                "name": server.name,
+                "method": server.installation_method.value,
+                "package": server.package,
+                "spec_hash": spec_hash(server),
+                "blobs": sorted(set(blobs)),
+                "files": sorted(set(files)),
+                "prefetched_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+
+    # 離線安裝時各方法的參數
+
+    def npm_options(self) -> List[str]:
+        return ["--offline", "--cache", str(self.npm_cache)]
+
+    def pip_options(self) -> List[str]:
+        return ["--no-index", "--find-links", str(self.wheelhouse)]
+
+    def go_env(self) -> Dict[str, str]:
+        env = dict(os.environ)
+        env.update(GOPROXY=f"file://{self.go_modcache / 'cache' / 'download'}",
+                   GOSUMDB="off", GOFLAGS="-mod=mod")
+        return env
+
+    def bundle_path(self, location: RepositoryLocation) -> Path:
+        return self.bundles_dir / f"{location.cache_path}.bundle"
+
+    # 預取
+
+    def prefetch(self, server_key: str, server) -> Tuple[bool, str]:
+        """下載單個伺服器所需的全部內容，返回 (是否成功, 說明)"""
+        method = server.installation_method.value
+        if method == "npm":
+            ok, message, blobs, files = self._prefetch_npm(server)
+        elif method == "pip":
+            ok, message, blobs, files = self._prefetch_pip(server)
+        elif method == "git":
+            ok, message, blobs, files = self._prefetch_git(server)
+        elif method == "go":
+            ok, message, blobs, files = self._prefetch_go(server)
+        else:
+            return True, "無需預取"
+        if ok:
+            self._record(server_key, server, blobs, files)
+        return ok, message
+
+    def _prefetch_npm(self, server) -> PrefetchResult:
+        # 安裝到臨時前綴，讓 npm 把包及所有依賴的 tarball 寫入快取
+        with self.staging("mcp-npm-") as prefix:
+            ok, error = _run(["npm", "install", "-g", "--prefix", prefix, "--cache", str(self.npm_cache),
+                              "--no-audit", "--no-fund", server.package])
+            if not ok:
+                return False, error, [], []
+            files = self._npm_tarballs(Path(prefix))
+        return True, f"npm 快取已更新（{len(files)} 個 tarball）", [], files
+
+    def _npm_tarballs(self, prefix: Path) -> List[str]:
+        """臨時前綴中 npm 的隱藏 lockfile 所列各包的 tarball 在快取中的路徑"""
+        files = []
+        for modules in (prefix / "lib" / "node_modules", prefix / "node_modules"):
+            try:
+                with open(modules / ".package-lock.json", "r", encoding="utf-8") as f:
+                    packages = json.load(f).get("packages", {})
+            except (OSError, ValueError):
+                continue
+            for package in packages.values():
+                content = cacache_content_path(package.get("integrity") or "")
+                if content:
+                    files.append(f"{self.npm_cache.name}/_cacache/{content}")
+        return files
+
+    def _prefetch_pip(self, server) -> PrefetchResult:
+        with self.staging("mcp-pip-") as staging:
+            # 與 python_envs 建立伺服器環境的直譯器相同，wheel 的平台標籤才會一致
+            ok, error = _run([sys.executable, "-m", "pip", "download", "--dest", staging, server.package])
+            if not ok:
+                return False, error, [], []
+            blobs = [self.store(path, self.wheelhouse / path.name) for path in Path(staging).iterdir()]
+        return True, f"{len(blobs)} 個 wheel/sdist", blobs, []
+
+    def _prefetch_git(self, server) -> PrefetchResult:
+        location = parse_repository(server.repository)
+        if not location:
+            return False, f"無法辨識的倉庫網址: {server.repository}", [], []
+        with self._lock:
+            repo_lock = self._repo_locks.setdefault(location.cache_path, threading.Lock())
+        # 同一倉庫每次執行只打包一次（例如 monorepo 中的多個伺服器）
+        with repo_lock:
+            if location.cache_path in self._bundled:
+                return True, "共用已預取的 bundle", [self.manifest["bundles"][location.cache_path]], []
+            return self._bundle_repository(location)
+
+    def _bundle_repository(self, location: RepositoryLocation) -> PrefetchResult:
+        with self.staging("mcp-git-") as staging:
+            mirror = Path(staging) / "mirror.git"
+            bundle = Path(staging) / "repo.bundle"
+            ok, error = _run(["git", "clone", "--quiet", "--mirror", location.clone_url, str(mirror)])
+            if ok:
+                ok, error = _run(["git", "-C", str(mirror), "bundle", "create", str(bundle), "--all"])
+            if not ok:
+                return False, error, [], []
+            digest = self.store(bundle, self.bundle_path(location))
+        with self._lock:
+            self.manifest["bundles"][location.cache_path] = digest
+            self._bundled.add(location.cache_path)
+        return True, f"bundle {digest[:12]}", [digest], []
+
+    def _prefetch_go(self, server) -> PrefetchResult:
+        with self.staging("mcp-go-") as gobin:
+            env = dict(os.environ)
+            env.update(GOMODCACHE=str(self.go_modcache), GOBIN=gobin, GOFLAGS="-modcacherw")
+            ok, error = _run(["go", "install", server.package], env=env)
+            if not ok:
+                return False, error, [], []
+            files = []
+            for binary in Path(gobin).iterdir():
+                files.extend(self._go_module_zips(binary))
+        return True, f"Go 模組快取已更新（{len(files)} 個模組）", [], files
+
+    def _go_module_zips(self, binary: Path) -> List[str]:
+        """執行檔內嵌的建置資訊（go version -m）所列各模組的 zip 在快取中的路徑"""
+        ok, output, _ = _capture(["go", "version", "-m", str(binary)])
+        if not ok:
+            return []
+        download = (self.go_modcache / "cache" / "download").relative_to(self.root)
+        lines = [line.split() for line in output.splitlines()]
+        files = []
+        for fields, following in zip(lines, lines[1:] + [[]]):
+            # 被 replace 的模組由下一行 "=>" 記錄實際下載的來源；本地路徑的替換沒有版本
+            if following[:1] == ["=>"] and fields[:1] == ["dep"]:
+                continue
+            if len(fields) >= 3 and fields[0] in ("mod", "dep", "=>") and fields[2].startswith("v"):
+                files.append(f"{download.as_posix()}/{go_module_zip(fields[1], fields[2])}")
+        return files
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+安裝腳本的 --profile 支援
+只在命令列帶有 --profile 參數時才從專案的 code/ 目錄載入共用的 profiling 模組
+
+本資料夾可單獨複製使用：沒有 code/profiling.py 時照常執行，--profile 參數
+仍可解析但會被忽略並顯示警告。
+
+作者: MCP Navigator Project
+"""
+
+import argparse
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+CODE_DIR = Path(__file__).resolve().parent.parent / "code"
+
+_PROFILE_OPTIONS = ("--profile-output", "--profile-mode", "--profile-interval", "--profile-top")
+
+
+def _requested() -> bool:
+    return any(arg.startswith("--profile") for arg in sys.argv[1:])
+
+
+@lru_cache(maxsize=None)
+def _profiling():
+    """載入 code/profiling.py；命令列沒有 --profile 參數或找不到模組時返回 None"""
+    if not _requested():
+        return None
+    if str(CODE_DIR) not in sys.path:
+        sys.path.insert(0, str(CODE_DIR))
+    try:
+        import profiling
+    except ImportError:
+        return None
+    return profiling
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """註冊 --profile 參數；profiling 模組不可用時只接受參數而不顯示於 --help"""
+    profiling = _profiling()
+    if profiling:
+        profiling.add_profile_arguments(parser)
+    elif _requested():
+        parser.add_argument("--profile", action="store_true", help=argparse.SUPPRESS)
+        for option in _PROFILE_OPTIONS:
+            parser.add_argument(option, help=argparse.SUPPRESS)
+
+
+def run_profiled(main):
+    """執行 main()；要求 --profile 且 profiling 模組可用時在剖析器下執行"""
+    profiling = _profiling()
+    if profiling:
+        return profiling.run_profiled(main)
+    if _requested():
+        print(f"警告: 找不到 {CODE_DIR / 'profiling.py'}，已忽略 --profile 參數", file=sys.stderr)
+    return main()
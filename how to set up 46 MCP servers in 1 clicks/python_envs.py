@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MCP Python 伺服器的獨立虛擬環境
+每個 pip 伺服器安裝到 ~/.mcp/servers/<server_key>/ 下自己的虛擬環境，互不影響依賴版本
+
+安裝流程:
+1. pip wheel 只解析這個伺服器的依賴，下載或建置所需的 wheel（沿用 pip 自身的快取）
+2. 每個 wheel 依 SHA-256 解壓一次到共用的 ~/.mcp/wheels/unpacked/<ab>/<digest>/
+3. 建立不含 pip 的虛擬環境（python -m venv --without-pip，約數十毫秒）
+4. 把解壓後的文件以硬連結放入環境的 site-packages，並生成 console script
+
+安裝完成後以環境的直譯器執行 compileall 預先編譯 .pyc（compile），伺服器第一次啟動時
+不必再編譯，多個伺服器同時啟動也不會競相寫入 __pycache__。
+
+相同版本的依賴在所有環境中共用同一份磁碟空間；跨檔案系統無法硬連結時改為複製。
+環境中的文件與其他環境共用 inode，請勿直接修改（重新安裝會重建整個環境）。
+Windows 上不生成 console script 的 .exe 啟動器，VS Code 配置改以 python -m 啟動。
+
+作者: MCP Navigator Project
+"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import sysconfig
+import tempfile
+import time
+import zipfile
+from configparser import ConfigParser, Error as ConfigParserError
+from pathlib import Path
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+WHEEL_TIMEOUT = 600
+VENV_TIMEOUT = 120
+COMPILE_TIMEOUT = 600
+
+# 伺服器以一般方式（不帶 -O）啟動，只需要最佳化等級 0 的 .pyc
+DEFAULT_OPTIMIZE_LEVELS = [0]
+
+_SCRIPT_TEMPLATE = """#!{python}
+# -*- coding: utf-8 -*-
+import re
+import sys
+from {module} import {import_name}
+if __name__ == "__main__":
+    sys.argv[0] = re.sub(r"(-script\\.pyw|\\.exe)?$", "", sys.argv[0])
+    sys.exit({call}())
+"""
+
+
+class EnvironmentPaths(NamedTuple):
+    """虛擬環境中的主要路徑"""
+    root: Path
+    python: Path
+    scripts: Path
+    site_packages: Path
+
+
+def environment_paths(env_dir: Path) -> EnvironmentPaths:
+    """依目前直譯器的安裝配置計算 env_dir 中的路徑（環境不必已存在）"""
+    scheme = "nt" if os.name == "nt" else "posix_prefix"
+    variables = {"base": str(env_dir), "platbase": str(env_dir),
+                 "installed_base": str(env_dir), "installed_platbase": str(env_dir)}
+    scripts = Path(sysconfig.get_path("scripts", scheme, variables))
+    return EnvironmentPaths(
+        root=Path(env_dir),
+        python=scripts / ("python.exe" if os.name == "nt" else "python"),
+        scripts=scripts,
+        site_packages=Path(sysconfig.get_path("purelib", scheme, variables)),
+    )
+
+
+def parse_optimize_levels(text: Optional[str]) -> List[int]:
+    """解析 "0,1,2" 形式的最佳化等級（對應 python、python -O、python -OO）"""
+    if not text:
+        return list(DEFAULT_OPTIMIZE_LEVELS)
+    levels = []
+    for item in text.split(","):
+        if item.strip() not in ("0", "1", "2"):
+            raise ValueError(f"無效的最佳化等級: {item!r}（格式如 0,1,2）")
+        if int(item) not in levels:
+            levels.append(int(item))
+    return levels
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _link_file(source: Path, target: Path) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def _link_tree(source: Path, target: Path) -> int:
+    """把 source（文件或目錄）硬連結到 target，返回文件數"""
+    if source.is_file():
+        _link_file(source, target)
+        return 1
+    count = 0
+    for directory, _, files in os.walk(source):
+        relative = Path(directory).relative_to(source)
+        for name in files:
+            _link_file(Path(directory) / name, target / relative / name)
+            count += 1
+    return count
+
+
+def _run(cmd: List[str], phase: str, timeout: float) -> subprocess.CompletedProcess:
+    return subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+
+
+class ServerEnvironments:
+    """建立各伺服器的虛擬環境並從共用的解壓 wheel 快取以硬連結填充；可從多個安裝執行緒同時呼叫"""
+
+    def __init__(self, servers_dir: Path, wheels_dir: Path, python: str = sys.executable,
+                 runner: Optional[Callable[..., object]] = None):
+        self.servers_dir = Path(servers_dir)
+        self.unpacked_dir = Path(wheels_dir) / "unpacked"
+        self.python = python
+        self.runner = runner or _run
+
+    def env_dir(self, server_key: str) -> Path:
+        return self.servers_dir / server_key
+
+    def paths(self, server_key: str) -> EnvironmentPaths:
+        return environment_paths(self.env_dir(server_key))
+
+    def install(self, server_key: str, package: str, source_options: Sequence[str] = ()) -> Tuple[bool, str]:
+        """（重新）建立 server_key 的環境並安裝 package，返回 (是否成功, 說明)"""
+        # 先解析並取得全部 wheel，失敗時保留現有環境
+        with tempfile.TemporaryDirectory(prefix="mcp-wheels-") as staging:
+            result = self.runner([self.python, "-m", "pip", "wheel", "--wheel-dir", staging,
+                                  *source_options, package], phase="pip", timeout=WHEEL_TIMEOUT)
+            if result.returncode != 0:
+                return False, result.stderr.strip() or "pip wheel 失敗"
+            trees = [self._unpack(wheel) for wheel in sorted(Path(staging).glob("*.whl"))]
+
+        env_dir = self.env_dir(server_key)
+        if env_dir.exists():
+            shutil.rmtree(env_dir)
+        result = self.runner([self.python, "-m", "venv", "--without-pip", str(env_dir)],
+                             phase="venv", timeout=VENV_TIMEOUT)
+        if result.returncode != 0:
+            return False, result.stderr.strip() or "建立虛擬環境失敗"
+
+        paths = environment_paths(env_dir)
+        files = sum(self._link(tree, paths) for tree in trees)
+        return True, f"{len(trees)} 個 wheel、{files} 個文件以硬連結安裝到 {env_dir}"
+
+    def compile(self, server_key: str, levels: Sequence[int] = DEFAULT_OPTIMIZE_LEVELS,
+                workers: Optional[int] = None) -> Tuple[bool, str]:
+        """以環境的直譯器編譯 site-packages 中的 .pyc，每個最佳化等級一次，返回 (是否成功, 說明)"""
+        paths = self.paths(server_key)
+        workers = workers or os.cpu_count() or 1
+        started = time.monotonic()
+        for level in levels:
+            # 以 -O/-OO 啟動直譯器指定等級，Python 3.8 的 compileall 沒有 -o 選項
+            result = self.runner([str(paths.python), *["-O"] * level, "-m", "compileall", "-q",
+                                  "-j", str(workers), str(paths.site_packages)],
+                                 phase="compile", timeout=COMPILE_TIMEOUT)
+            if result.returncode != 0:
+                # 部分包附帶無法編譯的範例或模板文件，其餘文件仍已編譯
+                errors = [line for line in result.stdout.splitlines() if line.startswith("***")]
+                return False, f"等級 {level} 有 {len(errors) or '部分'} 個文件無法編譯"
+        elapsed = time.monotonic() - started
+        return True, f"最佳化等級 {','.join(map(str, levels))}，{workers} 個程序，{elapsed:.1f} 秒"
+
+    def _unpack(self, wheel: Path) -> Path:
+        """解壓 wheel 到以內容雜湊命名的共用目錄（已存在時直接沿用）"""
+        digest = _sha256(wheel)
+        target = self.unpacked_dir / digest[:2] / digest
+        if target.is_dir():
+            return target
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp = Path(tempfile.mkdtemp(prefix=f"{digest[:12]}-", dir=target.parent))
+        with zipfile.ZipFile(wheel) as archive:
+            archive.extractall(temp)
+            for info in archive.infolist():
+                mode = (info.external_attr >> 16) & 0o777
+                if mode & 0o111:
+                    os.chmod(temp / info.filename, mode)
+        try:
+            os.rename(temp, target)
+        except OSError:
+            # 另一個執行緒已解壓同一個 wheel
+            shutil.rmtree(temp, ignore_errors=True)
+        return target
+
+    def _link(self, tree: Path, paths: EnvironmentPaths) -> int:
+        count = 0
+        for entry in tree.iterdir():
+            if entry.is_dir() and entry.name.endswith(".data"):
+                for section in entry.iterdir():
+                    if section.name in ("purelib", "platlib"):
+                        count += _link_tree(section, paths.site_packages)
+                    elif section.name == "scripts":
+                        count += self._copy_scripts(section, paths)
+                    elif section.name == "data":
+                        count += _link_tree(section, paths.root)
+                    elif section.name == "headers":
+                        count += _link_tree(section, paths.root / "include")
+            else:
+                count += _link_tree(entry, paths.site_packages / entry.name)
+            if entry.is_dir() and entry.name.endswith(".dist-info"):
+                count += self._write_entry_points(entry, paths)
+        return count
+
+    @staticmethod
+    def _copy_scripts(section: Path, paths: EnvironmentPaths) -> int:
+        """wheel 內附的腳本：把 "#!python" 改寫為環境的直譯器（因內容不同，複製而非連結）"""
+        count = 0
+        for script in section.iterdir():
+            content = script.read_bytes()
+            if content.startswith(b"#!python"):
+                _, _, body = content.partition(b"\n")
+                content = f"#!{paths.python}\n".encode() + body
+            target = paths.scripts / script.name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(content)
+            target.chmod(0o755)
+            count += 1
+        return count
+
+    @staticmethod
+    def _write_entry_points(dist_info: Path, paths: EnvironmentPaths) -> int:
+        """依 entry_points.txt 生成 console script（Windows 略過，改以 python -m 啟動）"""
+        if os.name == "nt":
+            return 0
+        parser = ConfigParser(interpolation=None)
+        parser.optionxform = str
+        try:
+            parser.read(dist_info / "entry_points.txt", encoding="utf-8")
+        except (OSError, ConfigParserError):
+            return 0
+        count = 0
+        for section in ("console_scripts", "gui_scripts"):
+            if not parser.has_section(section):
+                continue
+            for name, value in parser[section].items():
+                module, _, attr = value.split("[")[0].strip().partition(":")
+                if not module or not attr:
+                    continue
+                target = paths.scripts / name
+                target.parent.mkdir(parents=True, exist_ok=True)
+                target.write_text(_SCRIPT_TEMPLATE.format(python=paths.python, module=module.strip(),
+                                                          import_name=attr.strip().split(".")[0],
+                                                          call=attr.strip()), encoding="utf-8")
+                target.chmod(0o755)
+                count += 1
+        return count
@@ -17,6 +17,10 @@ from pathlib import Path
 from typing import List, Optional
 import argparse
 
+# --profile 時才載入專案 code/ 目錄中的共用 profiling 模組
+from profile_hooks import add_profile_arguments, run_profiled
+from toolchain_probe import probe_toolchain
+
 
 class Color:
     """終端顏色輸出類"""
@@ -96,6 +100,13 @@ class QuickStart:
         
         self.print_colored(f"✅ Python 版本: {python_version.major}.{python_version.minor}.{python_version.micro}", Color.GREEN)
         
+        # 安裝工具鏈（結果快取於 ~/.mcp/toolchain.json，安裝腳本的檢查直接沿用）
+        for tool, info in probe_toolchain().items():
+            if info.version:
+                self.print_colored(f"✅ {tool}: {info.version}", Color.GREEN)
+            else:
+                self.print_colored(f"⚠️ 找不到 {tool}，使用該工具安裝的伺服器將會失敗", Color.YELLOW)
+        
         return True
     
     def run_command(self, command: List[str], description: str, timeout: int = 300) -> bool:
@@ -361,6 +372,7 @@ def main():
     parser.add_argument("--skip-env", action="store_true", help="跳過環境變量設置")
     parser.add_argument("--skip-test", action="store_true", help="跳過伺服器測試")
     
+    add_profile_arguments(parser)
     args = parser.parse_args()
     
     # 解析伺服器列表
@@ -387,4 +399,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_profiled(main)
\ No newline at end of file
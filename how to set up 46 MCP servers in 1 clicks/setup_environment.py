@@ -18,6 +18,9 @@ import argparse
 from getpass import getpass
 import platform
 
+# --profile 時才載入專案 code/ 目錄中的共用 profiling 模組
+from profile_hooks import add_profile_arguments, run_profiled
+
 
 class Color:
     """終端顏色輸出類"""
@@ -458,6 +461,7 @@ def main():
     parser.add_argument("--apply", action="store_true", help="應用環境變量到當前會話")
     parser.add_argument("--remove", help="移除指定的環境變量")
     
+    add_profile_arguments(parser)
     args = parser.parse_args()
     
     manager = EnvironmentManager()
@@ -486,4 +490,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_profiled(main)
\ No newline at end of file
@@ -25,6 +25,9 @@ import socket
 import requests
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+# --profile 時才載入專案 code/ 目錄中的共用 profiling 模組
+from profile_hooks import add_profile_arguments, run_profiled
+
 
 class TestResult(Enum):
     """測試結果枚舉"""
@@ -496,6 +499,7 @@ def main():
     parser.add_argument("--servers", help="指定要測試的伺服器列表，用逗號分隔")
     parser.add_argument("--no-cleanup", action="store_true", help="測試後不清理進程")
     
+    add_profile_arguments(parser)
     args = parser.parse_args()
     
     # 創建測試器實例
@@ -537,4 +541,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_profiled(main)
\ No newline at end of file
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MCP 安裝工具鏈偵測
+查詢 node、npm、python、pip、git、go 的位置與版本，結果快取於 ~/.mcp/toolchain.json
+
+每個工具的快取記錄一個指紋：
+- PATH 環境變量
+- PATH 中找到的執行檔路徑
+- 執行檔（及符號連結指向的實際文件）的大小與 mtime
+
+指紋相同時直接使用快取的版本，不啟動任何子程序；PATH 改變、工具被升級或移除時
+只重新查詢受影響的工具，且多個工具同時查詢。
+注意: pyenv / nvm 等 shim 切換版本時 shim 文件本身不變，可用 refresh=True 強制重新查詢。
+
+作者: MCP Navigator Project
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+CACHE_FORMAT = "mcp-toolchain"
+CACHE_VERSION = 1
+PROBE_TIMEOUT = 10
+
+DEFAULT_CACHE_FILE = Path.home() / ".mcp" / "toolchain.json"
+
+# 顯示名稱 -> 版本查詢指令
+TOOLS: Dict[str, List[str]] = {
+    "Node.js": ["node", "--version"],
+    "npm": ["npm", "--version"],
+    "Python": ["python", "--version"],
+    "pip": ["pip", "--version"],
+    "Git": ["git", "--version"],
+    "Go": ["go", "version"],
+}
+
+_cache_lock = threading.Lock()
+
+
+class ToolInfo(NamedTuple):
+    """單個工具的偵測結果；version 為 None 表示找不到或無法執行"""
+    name: str
+    path: Optional[str]
+    version: Optional[str]
+    cached: bool
+
+
+def _fingerprint(executable: str) -> Optional[list]:
+    """PATH、執行檔路徑與其 stat；找不到執行檔時返回 None"""
+    path = shutil.which(executable)
+    if not path:
+        return None
+    signature = [os.environ.get("PATH", ""), path]
+    real = os.path.realpath(path)
+    for candidate in [path] + ([real] if real != path else []):
+        try:
+            st = os.stat(candidate)
+        except OSError:
+            return None
+        signature.extend([candidate, st.st_size, st.st_mtime_ns])
+    return signature
+
+
+def _run_probe(command: List[str]) -> Optional[str]:
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, timeout=PROBE_TIMEOUT)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    # 舊版 python --version 輸出到 stderr
+    output = (result.stdout.strip() or result.stderr.strip()).split("\n")[0]
+    return output or None
+
+
+def _load(cache_path: Path) -> Dict[str, Dict]:
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("format") != CACHE_FORMAT or data.get("version") != CACHE_VERSION:
+        return {}
+    return data.get("tools", {})
+
+
+def _save(cache_path: Path, tools: Dict[str, Dict]) -> None:
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump({"format": CACHE_FORMAT, "version": CACHE_VERSION, "tools": tools},
+                      f, indent=2, ensure_ascii=False)
+        os.replace(temp, cache_path)
+    except OSError:
+        pass  # 快取只是加速，寫入失敗不影響偵測結果
+
+
+def probe_toolchain(tools: Optional[Dict[str, List[str]]] = None,
+                    cache_path: Optional[Path] = DEFAULT_CACHE_FILE,
+                    refresh: bool = False) -> Dict[str, ToolInfo]:
+    """偵測工具鏈，返回 {顯示名稱: ToolInfo}，順序與 tools 相同；cache_path 為 None 時不使用快取"""
+    tools = tools or TOOLS
+    with _cache_lock:
+        cached = _load(cache_path) if cache_path and not refresh else {}
+
+        results: Dict[str, ToolInfo] = {}
+        stale: Dict[str, list] = {}
+        for name, command in tools.items():
+            fingerprint = _fingerprint(command[0])
+            entry = cached.get(name)
+            if fingerprint is None:
+                results[name] = ToolInfo(name, None, None, False)
+            elif entry and entry.get("command") == command and entry.get("fingerprint") == fingerprint:
+                results[name] = ToolInfo(name, fingerprint[1], entry.get("output"), True)
+            else:
+                stale[name] = fingerprint
+
+        if stale:
+            with ThreadPoolExecutor(max_workers=len(stale)) as pool:
+                outputs = dict(zip(stale, pool.map(lambda name: _run_probe(tools[name]), stale)))
+            for name, fingerprint in stale.items():
+                results[name] = ToolInfo(name, fingerprint[1], outputs[name], False)
+                # 執行失敗（例如逾時）不快取，下次重新查詢
+                if outputs[name] is not None:
+                    cached[name] = {"command": tools[name], "fingerprint": fingerprint, "output": outputs[name]}
+                else:
+                    cached.pop(name, None)
+            if cache_path:
+                _save(cache_path, cached)
+
+    return {name: results[name] for name in tools}
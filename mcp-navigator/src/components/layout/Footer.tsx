@@ -3,7 +3,7 @@ import { useMCP } from '../../context/MCPContext';
 import { slugify } from '../../lib/utils';
 
 export default function Footer() {
-  const { mcpData } = useMCP();
+  const { summary } = useMCP();
   const currentYear = new Date().getFullYear();
 
   // Get build time, use current time if not available
@@ -19,7 +19,7 @@ export default function Footer() {
   });
 
   // Get some featured categories
-  const featuredCategories = mcpData?.categories.slice(0, 6) || [];
+  const featuredCategories = summary?.categories.slice(0, 6) || [];
 
   return (
     <footer className="bg-gray-900 text-white pt-12 pb-6">
@@ -110,11 +110,11 @@ export default function Footer() {
             <ul className="space-y-2">
               <li className="text-gray-400">
                 <span className="font-medium">Total MCPs:</span>{' '}
-                {mcpData?.metadata.total_servers || 0}
+                {summary?.metadata.total_servers || 0}
               </li>
               <li className="text-gray-400">
                 <span className="font-medium">Categories:</span>{' '}
-                {mcpData?.metadata.total_categories || 0}
+                {summary?.metadata.total_categories || 0}
               </li>
               <li className="text-gray-400">
                 <span className="font-medium">Last Updated:</span>{' '}
@@ -8,7 +8,7 @@ export default function Header() {
   const [categoriesDropdownOpen, setCategoriesDropdownOpen] = useState(false);
   const [searchQuery, setSearchQuery] = useState('');
   const navigate = useNavigate();
-  const { mcpData } = useMCP();
+  const { summary } = useMCP();
   const dropdownRef = useRef<HTMLDivElement>(null);
 
   // Close dropdown when clicking outside
@@ -81,7 +81,7 @@ export default function Header() {
                   </Link>
                   
                   {/* Individual Category Links */}
-                    {mcpData?.categories.slice(0, 12).map((category) => (
+                    {summary?.categories.slice(0, 12).map((category) => (
                       <Link
                         key={category.name}
                         to={`/category/${slugify(category.name)}`}
@@ -93,13 +93,13 @@ export default function Header() {
                         <span className="ml-auto text-xs text-gray-500">{category.count}</span>
                       </Link>
                     ))}
-                    {mcpData && mcpData.categories.length > 12 && (
+                    {summary && summary.categories.length > 12 && (
                       <Link
                         to="/categories"
                         className="block px-4 py-2 text-sm text-blue-600 hover:bg-blue-50 text-center border-t border-gray-100"
                         onClick={() => setCategoriesDropdownOpen(false)}
                       >
-                        View all {mcpData.categories.length} categories →
+                        View all {summary.categories.length} categories →
                       </Link>
                     )}
                   </div>
@@ -237,7 +237,7 @@ export default function Header() {
                   </svg>
                 </summary>
                 <div className="mt-2 space-y-1 ml-4">
-                  {mcpData?.categories.map((category) => (
+                  {summary?.categories.map((category) => (
                     <Link
                       key={category.name}
                       to={`/category/${slugify(category.name)}`}
@@ -3,13 +3,13 @@ import { Link } from 'react-router-dom';
 import { useMCP } from '../../context/MCPContext';
 import { slugify, truncateText } from '../../lib/utils';
 
-import { Category, MCP } from '../../types';
+import { PopularServer } from '../../types';
 
 export default function HomePage() {
-  const { mcpData, loading, error } = useMCP();
+  const { summary, summaryLoading, error } = useMCP();
   const [searchQuery, setSearchQuery] = useState('');
 
-  if (loading) {
+  if (summaryLoading) {
     return (
       <div className="flex items-center justify-center min-h-[50vh]">
         <div className="animate-spin rounded-full h-12 w-12 border-b-2 border-blue-500"></div>
@@ -17,7 +17,7 @@ export default function HomePage() {
     );
   }
 
-  if (error || !mcpData) {
+  if (!summary) {
     return (
       <div className="text-center py-12">
         <h2 className="text-2xl font-bold text-red-600">Failed to load MCP data</h2>
@@ -26,10 +26,8 @@ export default function HomePage() {
     );
   }
 
-  // Get featured MCPs (high popularity)
-  const featuredMCPs: [string, MCP][] = Object.entries(mcpData.servers)
-    .filter(([_, mcp]) => mcp.popularity_indicators.level === 'high')
-    .slice(0, 6);
+  // Featured MCPs come precomputed (high popularity) in the critical payload
+  const featuredMCPs: PopularServer[] = summary.popular_servers;
 
   return (
     <div className="space-y-12">
@@ -69,10 +67,10 @@ export default function HomePage() {
           <Link to="/browse" className="text-blue-600 hover:underline">View all</Link>
         </div>
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
-          {featuredMCPs.map(([id, mcp]) => (
+          {featuredMCPs.map((mcp) => (
             <Link 
               to={`/mcp/${slugify(mcp.name)}`} 
-              key={id}
+              key={mcp.key}
               className="bg-white rounded-lg shadow-md hover:shadow-lg transition p-6 border border-gray-200"
             >
               <h3 className="text-xl font-semibold mb-2">{mcp.name}</h3>
@@ -82,9 +80,9 @@ export default function HomePage() {
                   {mcp.category}
                 </span>
                 <span className="ml-auto text-gray-500">
-                  {mcp.popularity_indicators.level === 'high' && '⭐⭐⭐'}
-                  {mcp.popularity_indicators.level === 'medium' && '⭐⭐'}
-                  {mcp.popularity_indicators.level === 'low' && '⭐'}
+                  {mcp.level === 'high' && '⭐⭐⭐'}
+                  {mcp.level === 'medium' && '⭐⭐'}
+                  {mcp.level === 'low' && '⭐'}
                 </span>
               </div>
             </Link>
@@ -96,7 +94,7 @@ export default function HomePage() {
       <section>
         <h2 className="text-2xl font-bold mb-6">Browse by Category</h2>
         <div className="grid grid-cols-1 sm:grid-cols-2 md:grid-cols-3 lg:grid-cols-4 gap-4">
-          {mcpData.categories.map((category: Category) => (
+          {summary.categories.map((category) => (
             <Link
               to={`/category/${slugify(category.name)}`}
               key={category.name}
@@ -1,46 +1,126 @@
 import { createContext, useContext, useEffect, useState, ReactNode } from 'react';
-import { MCPDirectory } from '../types';
+import { CriticalPayload, MCPDirectory } from '../types';
 
 interface MCPContextType {
   loading: boolean;
   error: string | null;
   mcpData: MCPDirectory | null;
+  // First-paint data; available well before the full directory
+  summary: CriticalPayload | null;
+  summaryLoading: boolean;
 }
 
 const MCPContext = createContext<MCPContextType>({
   loading: true,
   error: null,
   mcpData: null,
+  summary: null,
+  summaryLoading: true,
 });
 
+interface DataManifest {
+  files: Record<string, { path: string; sha256: string; size: number }>;
+}
+
+// manifest.json is the only file that must be revalidated; the files it points
+// at carry a content hash in their name and never change once published
+async function loadManifest(dataUrl: string): Promise<DataManifest | null> {
+  try {
+    const response = await fetch(`${dataUrl}/manifest.json`, { cache: 'no-cache' });
+    if (response.ok) {
+      return await response.json();
+    }
+  } catch {
+    // Older deployments have no manifest; fall through to the plain filenames
+  }
+  return null;
+}
+
+function dataFileUrl(dataUrl: string, manifest: DataManifest | null, name: string): string {
+  return `${dataUrl}/${manifest?.files[name]?.path ?? name}`;
+}
+
+// Fallback when no critical payload is published
+function summarize(data: MCPDirectory): CriticalPayload {
+  return {
+    metadata: data.metadata,
+    categories: data.categories,
+    popular_servers: Object.entries(data.servers)
+      .filter(([_, mcp]) => mcp.popularity_indicators.level === 'high')
+      .slice(0, 6)
+      .map(([key, mcp]) => ({
+        key,
+        name: mcp.name,
+        description: mcp.description,
+        category: mcp.category,
+        level: mcp.popularity_indicators.level,
+      })),
+  };
+}
+
 export function MCPProvider({ children }: { children: ReactNode }) {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [mcpData, setMcpData] = useState<MCPDirectory | null>(null);
+  const [summary, setSummary] = useState<CriticalPayload | null>(null);
+  const [summaryLoading, setSummaryLoading] = useState(true);
 
   useEffect(() => {
     async function fetchData() {
-      try {
-        // Get correct base URL, support GitHub Pages deployment
-        const baseUrl = import.meta.env.PROD ? '/MCP-Navigator' : '';
-        const response = await fetch(`${baseUrl}/data/comprehensive_mcp_directory.json`);
-        if (!response.ok) {
-          throw new Error('Failed to fetch MCP data');
+      // Get correct base URL, support GitHub Pages deployment
+      const baseUrl = import.meta.env.PROD ? '/MCP-Navigator' : '';
+      const dataUrl = `${baseUrl}/data`;
+      const manifest = await loadManifest(dataUrl);
+
+      // Both files are requested as soon as the manifest is known: the few-KB
+      // critical payload lets the landing page paint early without delaying
+      // the full directory. Whichever arrives first provides the summary.
+      let haveSummary = false;
+
+      const critical = (async () => {
+        try {
+          const response = await fetch(dataFileUrl(dataUrl, manifest, 'comprehensive_mcp_directory.critical.json'));
+          if (response.ok) {
+            const payload: CriticalPayload = await response.json();
+            if (!haveSummary) {
+              haveSummary = true;
+              setSummary(payload);
+              setSummaryLoading(false);
+            }
+          }
+        } catch {
+          // Fall back to summarizing the full directory
+        }
+      })();
+
+      const full = (async () => {
+        try {
+          const response = await fetch(dataFileUrl(dataUrl, manifest, 'comprehensive_mcp_directory.json'));
+          if (!response.ok) {
+            throw new Error('Failed to fetch MCP data');
+          }
+          const data: MCPDirectory = await response.json();
+          setMcpData(data);
+          if (!haveSummary) {
+            haveSummary = true;
+            setSummary(summarize(data));
+            setSummaryLoading(false);
+          }
+        } catch (err) {
+          setError(err instanceof Error ? err.message : 'An unknown error occurred');
         }
-        const data = await response.json();
-        setMcpData(data);
-        setLoading(false);
-      } catch (err) {
-        setError(err instanceof Error ? err.message : 'An unknown error occurred');
         setLoading(false);
-      }
+      })();
+
+      await Promise.all([critical, full]);
+      setSummaryLoading(false);
     }
 
     fetchData();
   }, []);
 
   return (
-    <MCPContext.Provider value={{ loading, error, mcpData }}>
+    <MCPContext.Provider value={{ loading, error, mcpData, summary, summaryLoading }}>
       {children}
     </MCPContext.Provider>
   );
@@ -48,4 +128,4 @@ export function MCPProvider({ children }: { children: ReactNode }) {
 
 export function useMCP() {
   return useContext(MCPContext);
-}
\ No newline at end of file
+}
@@ -39,4 +39,20 @@ export interface MCPDirectory {
   };
   categories: Category[];
   servers: Record<string, MCP>;
-}
\ No newline at end of file
+}
+
+export interface PopularServer {
+  key: string;
+  name: string;
+  description: string;
+  category: string;
+  level: MCP['popularity_indicators']['level'];
+}
+
+// Small first-paint payload (comprehensive_mcp_directory.critical.json):
+// everything HomePage, Header and Footer render, without the server records
+export interface CriticalPayload {
+  metadata: MCPDirectory['metadata'];
+  categories: Pick<Category, 'name' | 'count' | 'icon' | 'color'>[];
+  popular_servers: PopularServer[];
+}
@@ -0,0 +1,41 @@
+"""
+Shared pytest setup
+
+The Python tools are plain scripts rather than a package, so the directories
+that hold them are put on sys.path here; tests import them by module name.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+INSTALLER_DIR = ROOT / 'how to set up 46 MCP servers in 1 clicks'
+
+for directory in (ROOT / 'code', INSTALLER_DIR, ROOT / 'benchmarks'):
+    if str(directory) not in sys.path:
+        sys.path.insert(0, str(directory))
+
+
+@pytest.fixture(scope='session')
+def directory():
+    """The committed comprehensive MCP directory"""
+    with open(ROOT / 'data' / 'comprehensive_mcp_directory.json', 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope='session')
+def servers(directory):
+    return directory['servers']
+
+
+@pytest.fixture
+def installer(tmp_path, monkeypatch):
+    """MCPInstaller with its ~/.mcp directory under tmp_path and the repository's server config"""
+    monkeypatch.setenv('HOME', str(tmp_path))
+    from install_mcp_servers import MCPInstaller
+    installer = MCPInstaller(config_file=str(INSTALLER_DIR / 'mcp-servers-config.json'))
+    assert installer.load_config()
+    return installer
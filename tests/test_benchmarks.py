@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from run_benchmarks import STAGES, compare, main, parse_size, run_size, size_label
+from synthetic_catalog import CATEGORIES, generate_catalog, generate_duplicates
+
+
+def test_catalog_is_reproducible():
+    assert generate_catalog(200, seed=7) == generate_catalog(200, seed=7)
+    assert generate_catalog(200, seed=7) != generate_catalog(200, seed=8)
+    # A larger catalog extends a smaller one with the same seed
+    assert generate_catalog(500, seed=7)[:200] == generate_catalog(200, seed=7)
+
+
+def test_catalog_entries_look_like_source_entries():
+    entries = generate_catalog(1000)
+    assert len({entry['name'] for entry in entries}) == 1000
+    for entry in entries:
+        assert entry['category'] in CATEGORIES
+        assert entry['popularity'] in ('high', 'medium', 'low')
+        assert entry['repository_link'].startswith('https://github.com/')
+
+
+def test_duplicates_resight_existing_servers():
+    entries = generate_catalog(100)
+    duplicates = generate_duplicates(entries, rate=0.3)
+    assert duplicates == generate_duplicates(entries, rate=0.3)
+    assert len(duplicates) == 30
+    names = {entry['name'] for entry in entries}
+    assert all(duplicate['name'] in names and duplicate['source'] for duplicate in duplicates)
+
+
+@pytest.mark.parametrize('text, count, label', [('1k', 1000, '1k'), ('100K', 100000, '100k'),
+                                                ('1m', 1000000, '1m'), ('250', 250, '250')])
+def test_sizes(text, count, label):
+    assert parse_size(text) == count
+    assert size_label(count) == label
+
+
+def test_run_size_reports_every_stage():
+    result = run_size(50, seed=0, repeat=1, memory=True, log=lambda line: None)
+    assert result['servers'] == 50
+    assert list(result['stages']) == [name for name, _ in STAGES]
+    for metrics in result['stages'].values():
+        assert metrics['seconds'] >= 0
+        assert metrics['peak_bytes'] > 0
+
+
+def results(seconds, peak_bytes):
+    return {'results': {'1k': {'stages': {'export': {'seconds': seconds, 'peak_bytes': peak_bytes}}}}}
+
+
+def test_compare_flags_only_meaningful_regressions():
+    baseline = results(0.100, 50 * 1024 * 1024)
+    assert compare(results(0.110, 50 * 1024 * 1024), baseline, 0.25) == []
+    # Relative growth without absolute growth is noise
+    assert compare(results(0.004, 0), results(0.001, 0), 0.25) == []
+    regressions = compare(results(0.200, 80 * 1024 * 1024), baseline, 0.25)
+    assert len(regressions) == 2
+    assert regressions[0].startswith('1k/export seconds: 0.1s -> 0.2s (+100%)')
+
+
+def test_main_writes_results(tmp_path):
+    output = tmp_path / 'results.json'
+    assert main(['--sizes', '20', '--no-memory', '--output', str(output)]) == 0
+    data = json.loads(output.read_text())
+    assert data['format'] == 'mcp-benchmark'
+    assert data['results']['20']['servers'] == 20
+
+
+def test_main_fails_on_regression(tmp_path, monkeypatch, capsys):
+    import run_benchmarks
+    monkeypatch.setattr(run_benchmarks, 'run_size', lambda *args: results(0.200, None)['results']['1k'])
+    baseline = tmp_path / 'baseline.json'
+    baseline.write_text(json.dumps(results(0.100, None)))
+    argv = ['--sizes', '1k', '--output', str(tmp_path / 'results.json'), '--baseline', str(baseline)]
+    assert main(argv) == 1
+    assert '1k/export seconds' in capsys.readouterr().out
+    assert main(argv + ['--threshold', '1.5']) == 0
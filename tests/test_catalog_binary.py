@@ -0,0 +1,90 @@
+import json
+import struct
+
+import pytest
+
+from catalog_binary import (FORMAT_VERSION, HEADER_STRUCT, BinaryCatalog, BinaryCatalogError,
+                            encode_binary_catalog, open_catalog, write_binary_catalog)
+
+
+@pytest.fixture
+def catalog_path(tmp_path, servers):
+    path = tmp_path / 'directory.mcpb'
+    write_binary_catalog(servers, str(path))
+    return path
+
+
+def test_every_record_reads_back(catalog_path, servers):
+    with BinaryCatalog(str(catalog_path)) as catalog:
+        assert len(catalog) == len(servers)
+        for key, server in servers.items():
+            assert catalog[key] == server
+
+
+def test_missing_keys(catalog_path):
+    with BinaryCatalog(str(catalog_path)) as catalog:
+        assert 'no-such-server' not in catalog
+        assert catalog.get('no-such-server', 'fallback') == 'fallback'
+        assert catalog.raw('no-such-server') is None
+        with pytest.raises(KeyError):
+            catalog['no-such-server']
+
+
+def test_key_order_and_export_order(tmp_path):
+    servers = {key: {'name': key, 'category': 'x'} for key in ('zeta', 'Alpha', 'émile', 'beta')}
+    path = tmp_path / 'small.mcpb'
+    write_binary_catalog(servers, str(path))
+    with BinaryCatalog(str(path)) as catalog:
+        assert list(catalog.keys()) == sorted(servers, key=lambda key: key.encode('utf-8'))
+        assert [catalog.key_at(i) for i in range(len(catalog))] == list(servers)
+
+
+def test_category_index(catalog_path, servers):
+    expected = {}
+    for key, server in servers.items():
+        expected.setdefault(server['category'], []).append(key)
+    with BinaryCatalog(str(catalog_path)) as catalog:
+        assert catalog.category_counts() == {name: len(keys) for name, keys in expected.items()}
+        assert catalog.categories() == sorted(expected, key=lambda name: name.encode('utf-8'))
+        for name, keys in expected.items():
+            assert catalog.keys_in_category(name) == keys
+            assert catalog.by_category(name) == [servers[key] for key in keys]
+        assert catalog.by_category('No Such Category') == []
+
+
+def test_raw_is_the_record_json(catalog_path, servers):
+    key = next(iter(servers))
+    with BinaryCatalog(str(catalog_path)) as catalog:
+        view = catalog.raw(key)
+        assert json.loads(bytes(view)) == servers[key]
+        view.release()
+
+
+def test_rejects_other_format_versions(tmp_path, servers):
+    data = bytearray(encode_binary_catalog(servers))
+    struct.pack_into('<H', data, 4, FORMAT_VERSION - 1)
+    path = tmp_path / 'old.mcpb'
+    path.write_bytes(bytes(data))
+    with pytest.raises(BinaryCatalogError):
+        BinaryCatalog(str(path))
+    # Callers fall back to the JSON directory instead of failing
+    assert open_catalog(str(path)) is None
+
+
+def test_rejects_damaged_files(tmp_path, servers):
+    data = encode_binary_catalog(servers)
+    cases = {
+        'empty.mcpb': b'',
+        'header.mcpb': data[:HEADER_STRUCT.size - 1],
+        'magic.mcpb': b'XXXX' + data[4:],
+        'blob.mcpb': data[:-10],
+    }
+    for name, content in cases.items():
+        path = tmp_path / name
+        path.write_bytes(content)
+        with pytest.raises(BinaryCatalogError):
+            BinaryCatalog(str(path))
+
+
+def test_open_catalog_without_a_file(tmp_path):
+    assert open_catalog(str(tmp_path / 'missing.mcpb')) is None
@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from catalog_columnar import FORMAT_NAME, decode_columnar, encode_columnar
+
+
+def roundtrip(servers):
+    # Through JSON, as the exported file is read back
+    return decode_columnar(json.loads(json.dumps(encode_columnar(servers)))).to_servers()
+
+
+def test_roundtrip_of_the_committed_directory(servers):
+    assert roundtrip(servers) == servers
+
+
+def test_roundtrip_keeps_server_and_field_order(servers):
+    decoded = roundtrip(servers)
+    assert list(decoded) == list(servers)
+    for key in servers:
+        assert list(decoded[key]) == list(servers[key])
+
+
+def test_repeated_strings_are_stored_once(servers):
+    block = encode_columnar(servers)
+    assert block['format'] == FORMAT_NAME
+    assert len(block['strings']) == len(set(block['strings']))
+    categories = {server['category'] for server in servers.values()}
+    assert categories <= set(block['strings'])
+    assert all(isinstance(value, int) for value in block['columns']['category'])
+
+
+def test_missing_fields_and_explicit_none_are_distinguished():
+    servers = {'a': {'name': 'A', 'source': None}, 'b': {'name': 'B'}}
+    decoded = roundtrip(servers)
+    assert decoded == servers
+    assert 'source' not in decoded['b']
+
+
+def test_integers_in_interned_fields_are_not_string_references():
+    servers = {
+        'a': {'category': 'Databases', 'source': 0, 'use_cases': ['query', 1]},
+        'b': {'category': 'Search', 'source': 'npm', 'use_cases': ['search']},
+    }
+    block = encode_columnar(servers)
+    assert 'source' not in block['interned']
+    assert 'use_cases' not in block['interned']
+    assert 'category' in block['interned']
+    assert roundtrip(servers) == servers
+
+
+def test_empty_nested_dicts_survive():
+    servers = {
+        'a': {'name': 'A', 'popularity_indicators': {}},
+        'b': {'name': 'B', 'popularity_indicators': {'level': 'high'}},
+    }
+    assert roundtrip(servers) == servers
+
+
+def test_column_decodes_without_building_records(servers):
+    catalog = decode_columnar(encode_columnar(servers))
+    assert catalog.column('category') == [server['category'] for server in servers.values()]
+
+
+def test_lookup_by_key(servers):
+    catalog = decode_columnar(encode_columnar(servers))
+    key = next(iter(servers))
+    assert key in catalog
+    assert catalog[key] == servers[key]
+    assert catalog.get('no-such-server') is None
+    assert len(catalog) == len(servers)
+
+
+def test_decodes_a_whole_exported_document(directory):
+    document = dict(directory, servers=encode_columnar(directory['servers']))
+    assert decode_columnar(document).to_servers() == directory['servers']
+
+
+def test_rejects_other_formats():
+    with pytest.raises(ValueError):
+        decode_columnar({'format': 'something-else'})
@@ -0,0 +1,114 @@
+import itertools
+
+import pytest
+
+from catalog_index import CatalogIndex, installation_method, popularity_score
+
+
+def reference_order(servers, sort, descending):
+    """What a plain stable sort over the servers gives"""
+    by_name = sorted(servers, key=lambda k: ((servers[k].get('name') or k).casefold(), k))
+    if sort == 'name':
+        return sorted(by_name, key=lambda k: (servers[k].get('name') or k).casefold(), reverse=descending)
+    return sorted(by_name, key=lambda k: popularity_score(servers[k]), reverse=descending)
+
+
+@pytest.fixture(scope='module')
+def tied():
+    """Equal names and equal scores, in an order that is neither sorted nor reversed"""
+    return {
+        'b': {'name': 'Same', 'popularity_indicators': {'level': 'high'}},
+        'c': {'name': 'Other', 'popularity_indicators': {'level': 'low'}},
+        'a': {'name': 'same', 'popularity_indicators': {'level': 'high'}},
+        'e': {'name': None, 'popularity_indicators': {'level': 'medium'}},
+        'd': {'name': 'Other', 'popularity_indicators': {'level': 'low'}},
+    }
+
+
+@pytest.mark.parametrize('sort, descending', list(itertools.product(('name', 'score'), (False, True))))
+def test_orders_match_a_stable_sort(servers, tied, sort, descending):
+    for data in (servers, tied):
+        assert CatalogIndex(data).ordered(sort, descending) == reference_order(data, sort, descending)
+
+
+def test_ties_stay_in_ascending_key_order(tied):
+    index = CatalogIndex(tied)
+    assert index.ordered('name') == ['e', 'c', 'd', 'a', 'b']
+    assert index.ordered('name', descending=True) == ['a', 'b', 'c', 'd', 'e']
+    assert index.ordered('score') == ['c', 'd', 'e', 'a', 'b']
+    assert index.ordered('score', descending=True) == ['a', 'b', 'e', 'c', 'd']
+
+
+def test_filtered_queries_use_the_same_order(tied):
+    result = CatalogIndex(tied).query(popularity='high', sort='name', descending=True)
+    assert result.keys == ['a', 'b']
+
+
+def brute_force(servers, **filters):
+    index = CatalogIndex(servers)
+    extract = {
+        'category': lambda s: s.get('category') or 'Uncategorized',
+        'popularity': lambda s: (s.get('popularity_indicators') or {}).get('level') or 'unknown',
+        'installation_method': installation_method,
+        'creator': lambda s: s.get('creator_maintainer') or 'unknown',
+    }
+    return [key for key in index.ordered('score', True)
+            if all(extract[name](servers[key]) == value for name, value in filters.items())]
+
+
+def test_filters_match_a_full_scan(servers):
+    index = CatalogIndex(servers)
+    for category in index.values('category'):
+        for level in ('high', 'medium', 'low'):
+            result = index.query(category=category, popularity=level, sort='score', descending=True)
+            assert result.keys == brute_force(servers, category=category, popularity=level)
+            assert result.total == len(result.keys)
+
+
+def test_pagination(servers):
+    index = CatalogIndex(servers)
+    everything = index.query(sort='name').keys
+    pages = [index.query(sort='name', offset=offset, limit=7) for offset in range(0, len(servers), 7)]
+    assert [key for page in pages for key in page.keys] == everything
+    assert all(page.total == len(servers) for page in pages)
+    assert index.query(offset=len(servers) + 5, limit=3).keys == []
+
+
+def test_unmatched_filters_return_nothing(servers):
+    result = CatalogIndex(servers).query(category='No Such Category', popularity='high')
+    assert result.total == 0
+    assert result.items == []
+
+
+def test_rejects_bad_arguments(servers):
+    index = CatalogIndex(servers)
+    with pytest.raises(ValueError):
+        index.query(sort='stars')
+    with pytest.raises(ValueError):
+        index.query(offset=-1)
+    with pytest.raises(ValueError):
+        index.query(limit=-1)
+
+
+def test_facets_count_every_server(servers):
+    index = CatalogIndex(servers)
+    for field_name in ('category', 'popularity', 'installation_method', 'creator'):
+        assert sum(index.facet(field_name).values()) == len(servers)
+
+
+def test_installation_method_is_derived_from_the_command():
+    assert installation_method({'installation_method': 'pip'}) == 'pip'
+    assert installation_method({'installation_instructions': 'npx -y @scope/pkg'}) == 'npm'
+    assert installation_method({'installation_instructions': 'pip install x'}) == 'pip'
+    assert installation_method({'installation_instructions': 'git clone https://x'}) == 'git'
+    assert installation_method({'installation_instructions': 'go install x@latest'}) == 'go'
+    assert installation_method({'installation_instructions': 'Download the app'}) == 'manual'
+    assert installation_method({}) == 'unknown'
+
+
+def test_from_data_accepts_columnar_documents(directory):
+    from catalog_columnar import encode_columnar
+
+    document = dict(directory, servers=encode_columnar(directory['servers']))
+    index = CatalogIndex.from_data(document)
+    assert index.ordered() == CatalogIndex.from_data(directory).ordered()
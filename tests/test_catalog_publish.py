@@ -0,0 +1,85 @@
+import hashlib
+import json
+import os
+
+from catalog_publish import canonical_json, hashed_name, publish_artifacts, read_manifest
+
+
+def dirs(tmp_path):
+    return [str(tmp_path / 'data'), str(tmp_path / 'public' / 'data')]
+
+
+def generation(n):
+    return {
+        'directory.json': canonical_json({'servers': {'b': n, 'a': n}}, indent=2),
+        'directory.mcpb': bytes([n]) * 16,
+    }
+
+
+def test_hashed_names():
+    assert hashed_name('directory.critical.json', 'abcdef0123456789') == 'directory.critical.abcdef012345.json'
+
+
+def test_canonical_json_keeps_insertion_order():
+    data = canonical_json({'z': 1, 'a': {'y': 2, 'b': 3}})
+    assert data == b'{"z":1,"a":{"y":2,"b":3}}'
+    assert canonical_json({'name': 'café'}) == '{"name":"café"}'.encode('utf-8')
+
+
+def test_publish_writes_the_same_bytes_to_every_directory(tmp_path):
+    manifest = publish_artifacts(generation(1), dirs(tmp_path))
+    for directory in dirs(tmp_path):
+        assert read_manifest(directory) == manifest
+        for name, data in generation(1).items():
+            entry = manifest['files'][name]
+            assert entry['sha256'] == hashlib.sha256(data).hexdigest()
+            assert entry['size'] == len(data)
+            with open(os.path.join(directory, entry['path']), 'rb') as f:
+                assert f.read() == data
+            # Plain names for the Python tools
+            with open(os.path.join(directory, name), 'rb') as f:
+                assert f.read() == data
+
+
+def test_republishing_unchanged_data_rewrites_nothing(tmp_path):
+    publish_artifacts(generation(1), dirs(tmp_path))
+    before = {path: os.stat(path).st_mtime_ns
+              for directory in dirs(tmp_path) for path in
+              (os.path.join(directory, name) for name in os.listdir(directory))}
+    publish_artifacts(generation(1), dirs(tmp_path))
+    after = {path: os.stat(path).st_mtime_ns for path in before}
+    assert before == after
+
+
+def test_previous_generation_is_kept_and_older_ones_pruned(tmp_path):
+    directory = dirs(tmp_path)[0]
+    first = publish_artifacts(generation(1), dirs(tmp_path))
+    second = publish_artifacts(generation(2), dirs(tmp_path))
+    files = set(os.listdir(directory))
+    for manifest in (first, second):
+        assert {entry['path'] for entry in manifest['files'].values()} <= files
+
+    publish_artifacts(generation(3), dirs(tmp_path))
+    files = set(os.listdir(directory))
+    assert not {entry['path'] for entry in first['files'].values()} & files
+    assert {entry['path'] for entry in second['files'].values()} <= files
+
+
+def test_exporters_share_a_manifest(tmp_path):
+    publish_artifacts({'directory.json': b'{}'}, dirs(tmp_path))
+    manifest = publish_artifacts({'database.json': b'[]'}, dirs(tmp_path))
+    assert list(manifest['files']) == ['database.json', 'directory.json']
+    # Pruning one exporter's files leaves the other's alone
+    publish_artifacts({'database.json': b'[1]'}, dirs(tmp_path))
+    publish_artifacts({'database.json': b'[2]'}, dirs(tmp_path))
+    directory = dirs(tmp_path)[0]
+    assert read_manifest(directory)['files']['directory.json']['path'] in os.listdir(directory)
+
+
+def test_unreadable_manifest_is_treated_as_empty(tmp_path):
+    directory = tmp_path / 'data'
+    directory.mkdir()
+    (directory / 'manifest.json').write_text('{not json')
+    assert read_manifest(str(directory)) == {'files': {}}
+    (directory / 'manifest.json').write_text(json.dumps({'format': 'other', 'files': {'x': {}}}))
+    assert read_manifest(str(directory)) == {'files': {}}
@@ -0,0 +1,148 @@
+import asyncio
+import json
+import os
+import shutil
+from functools import partial
+from pathlib import Path
+
+import pytest
+
+from catalog_server import MAX_PAGE_SIZE, CatalogService, _serve_connection
+
+DATA_FILE = Path(__file__).resolve().parent.parent / 'data' / 'comprehensive_mcp_directory.json'
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / 'directory.json'
+    shutil.copy(DATA_FILE, path)
+    return path
+
+
+@pytest.fixture
+def service(data_file):
+    return CatalogService(str(data_file))
+
+
+def get(service, target, **headers):
+    status, response_headers, body = service.handle('GET', target, headers)
+    return status, response_headers, json.loads(body) if body else None
+
+
+def test_matching_etag_gives_304(service):
+    status, headers, _ = get(service, '/servers?limit=5')
+    assert status == 200
+    etag = headers['ETag']
+
+    status, headers, body = get(service, '/servers?limit=5', **{'if-none-match': etag})
+    assert status == 304
+    assert body is None
+    assert headers['ETag'] == etag
+
+    assert get(service, '/servers?limit=5', **{'if-none-match': f'"other", {etag}'})[0] == 304
+    assert get(service, '/servers?limit=5', **{'if-none-match': '*'})[0] == 304
+    assert get(service, '/servers?limit=5', **{'if-none-match': '"stale"'})[0] == 200
+
+
+def test_etag_is_stable_and_per_response(service):
+    first = get(service, '/servers?limit=5')[1]['ETag']
+    assert get(service, '/servers?limit=5')[1]['ETag'] == first
+    assert get(service, '/servers?limit=6')[1]['ETag'] != first
+
+
+def test_reload_swaps_the_snapshot_and_changes_etags(service, data_file):
+    etag = get(service, '/health')[1]['ETag']
+    assert not service.reload_if_changed()
+
+    document = json.loads(data_file.read_text(encoding='utf-8'))
+    key = next(iter(document['servers']))
+    del document['servers'][key]
+    data_file.write_text(json.dumps(document), encoding='utf-8')
+    stat = os.stat(data_file)
+    os.utime(data_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    assert service.reload_if_changed()
+    status, headers, body = get(service, '/health', **{'if-none-match': etag})
+    assert status == 200
+    assert headers['ETag'] != etag
+    assert body['servers'] == len(document['servers'])
+    assert get(service, f'/servers/{key}')[0] == 404
+
+
+def test_touch_without_content_change_keeps_the_snapshot(service, data_file):
+    snapshot = service.snapshot
+    stat = os.stat(data_file)
+    os.utime(data_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert not service.reload_if_changed()
+    assert service.snapshot is snapshot
+
+
+def test_score_sort_defaults_to_most_popular_first(service):
+    _, _, body = get(service, f'/servers?sort=score&limit={MAX_PAGE_SIZE}')
+    levels = [item['popularity_indicators']['level'] for item in body['items']]
+    rank = {'high': 0, 'medium': 1, 'low': 2}
+    assert levels == sorted(levels, key=rank.__getitem__)
+    _, _, ascending = get(service, f'/servers?sort=score&order=asc&limit={MAX_PAGE_SIZE}')
+    assert ascending['items'][0]['popularity_indicators']['level'] == 'low'
+
+
+def test_pagination_and_filters(service, servers):
+    _, _, body = get(service, '/servers?category=Databases&offset=1&limit=2')
+    databases = sorted((key for key, server in servers.items() if server['category'] == 'Databases'),
+                       key=lambda key: (servers[key]['name'].casefold(), key))
+    assert body['total'] == len(databases)
+    assert [item['key'] for item in body['items']] == databases[1:3]
+
+
+@pytest.mark.parametrize('target', [
+    '/servers?limit=abc',
+    '/servers?offset=-1',
+    '/servers?sort=stars',
+    '/servers?order=sideways',
+    '/search',
+])
+def test_bad_parameters(service, target):
+    status, _, body = get(service, target)
+    assert status == 400
+    assert 'error' in body
+
+
+def test_errors(service):
+    assert get(service, '/servers/no-such-server')[0] == 404
+    assert get(service, '/nowhere')[0] == 404
+    status, headers, _ = service.handle('POST', '/servers', {})
+    assert status == 405
+    assert headers['Allow'] == 'GET, HEAD'
+
+
+def test_categories_and_search(service, servers):
+    _, _, body = get(service, '/categories')
+    assert sum(item['count'] for item in body['items']) == len(servers)
+    _, _, body = get(service, '/search?q=postgress&limit=1')
+    assert body['items'][0]['key'] == 'postgresql'
+
+
+def test_http_round_trip(service):
+    async def exchange():
+        server = await asyncio.start_server(partial(_serve_connection, service), '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b'GET /health HTTP/1.1\r\nHost: x\r\n\r\n')
+        head = await reader.readuntil(b'\r\n\r\n')
+        headers = dict(line.split(': ', 1) for line in head.decode('latin-1').split('\r\n')[1:] if line)
+        body = await reader.readexactly(int(headers['Content-Length']))
+
+        # Same connection, conditional request
+        writer.write(f'GET /health HTTP/1.1\r\nIf-None-Match: {headers["ETag"]}\r\n'
+                     'Connection: close\r\n\r\n'.encode('latin-1'))
+        second = await reader.read()
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return head, body, second
+
+    head, body, second = asyncio.run(exchange())
+    assert head.startswith(b'HTTP/1.1 200 OK')
+    assert json.loads(body)['status'] == 'ok'
+    assert second.startswith(b'HTTP/1.1 304 Not Modified')
+    assert second.endswith(b'\r\n\r\n')
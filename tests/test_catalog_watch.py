@@ -0,0 +1,150 @@
+import os
+import stat
+import textwrap
+import time
+
+import pytest
+
+from catalog_watch import FileWatcher, atomic_write, code_fingerprint, load_module_from, run_watch
+from comprehensive_mcp_collector import ComprehensiveMCPCollector
+
+
+def test_atomic_write_replaces_the_file(tmp_path):
+    path = tmp_path / 'out.json'
+    path.write_bytes(b'old')
+    atomic_write(str(path), b'new')
+    assert path.read_bytes() == b'new'
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+    assert os.listdir(tmp_path) == ['out.json']
+
+
+def test_atomic_write_keeps_the_old_file_on_failure(tmp_path):
+    path = tmp_path / 'out.json'
+    path.write_bytes(b'old')
+    with pytest.raises(TypeError):
+        atomic_write(str(path), 'not bytes')
+    assert path.read_bytes() == b'old'
+    assert os.listdir(tmp_path) == ['out.json']
+
+
+MODULE = '''
+LIMIT = 6
+
+
+class Collector:
+    SCALE = 2
+
+    def data(self):
+        return [1, 2, 3]
+
+    def render(self):
+        return LIMIT * self.SCALE
+
+    @staticmethod
+    def key(name):
+        return name.lower()
+'''
+
+
+def fingerprint_of(tmp_path, source):
+    path = tmp_path / 'collector_source.py'
+    path.write_text(textwrap.dedent(source), encoding='utf-8')
+    module = load_module_from(str(path), '_fingerprint_test')
+    return code_fingerprint(module.Collector, exclude=['data'])
+
+
+@pytest.mark.parametrize('edit', [
+    ('LIMIT = 6', 'LIMIT = 7'),
+    ('SCALE = 2', 'SCALE = 3'),
+    ('return LIMIT * self.SCALE', 'return LIMIT + self.SCALE'),
+    ('return name.lower()', 'return name.upper()'),
+])
+def test_code_and_constant_edits_change_the_fingerprint(tmp_path, edit):
+    assert fingerprint_of(tmp_path, MODULE) != fingerprint_of(tmp_path, MODULE.replace(*edit))
+
+
+@pytest.mark.parametrize('edit', [
+    ('return [1, 2, 3]', 'return [4, 5, 6]'),
+    ('LIMIT = 6', '# a comment\n\n\nLIMIT = 6'),
+    ('LIMIT = 6', 'LIMIT = (\n    6\n)'),
+])
+def test_data_and_layout_edits_keep_the_fingerprint(tmp_path, edit):
+    assert fingerprint_of(tmp_path, MODULE) == fingerprint_of(tmp_path, MODULE.replace(*edit))
+
+
+@pytest.mark.parametrize('use_inotify', [False, True])
+def test_file_watcher_sees_writes_and_renames(tmp_path, use_inotify):
+    path = tmp_path / 'watched.py'
+    path.write_text('a = 1\n')
+    other = tmp_path / 'other.py'
+    watcher = FileWatcher([str(path)], poll_interval=0.01, use_inotify=use_inotify)
+    try:
+        assert watcher.wait(timeout=0.05) == set()
+
+        # Unrelated files in the same directory are ignored
+        other.write_text('x')
+        assert watcher.wait(timeout=0.05) == set()
+
+        time.sleep(0.01)
+        path.write_text('a = 22\n')
+        assert watcher.wait(timeout=2) == {str(path)}
+
+        # Editors that save by renaming a temp file over the original
+        atomic_write(str(path), b'a = 333\n')
+        changed = set()
+        deadline = time.monotonic() + 2
+        while not changed and time.monotonic() < deadline:
+            changed = watcher.wait(timeout=0.1)
+        assert changed == {str(path)}
+    finally:
+        watcher.close()
+
+
+class ScriptedWatcher:
+    """Returns canned change sets, then stops the loop"""
+
+    def __init__(self, events):
+        self.events = list(events)
+        self.closed = False
+
+    def wait(self, timeout=None):
+        if not self.events:
+            raise KeyboardInterrupt
+        return self.events.pop(0)
+
+    def close(self):
+        self.closed = True
+
+
+def test_run_watch_debounces_bursts_and_survives_failures():
+    # One burst of three events, quiet, then a second burst whose rebuild fails
+    watcher = ScriptedWatcher([{'a'}, {'b'}, {'c'}, set(), {'d'}, set()])
+    calls = []
+
+    def rebuild(changed):
+        calls.append(set(changed))
+        if 'd' in changed:
+            raise ValueError('half-saved file')
+
+    run_watch(watcher, rebuild, debounce=0.01)
+    assert calls == [{'a', 'b', 'c'}, {'d'}]
+    assert watcher.closed
+
+
+def test_apply_source_changes_touches_only_edited_entries():
+    collector = ComprehensiveMCPCollector()
+    collector.load_comprehensive_server_list()
+    full_run = dict(collector.mcp_servers)
+
+    source = collector.source_server_list()
+    source[0] = dict(source[0], description='Edited description')
+    removed = source.pop(1)
+    affected = collector.apply_source_changes(source)
+
+    keys = list(full_run)
+    assert affected == {keys[0], keys[1]}
+    assert collector.mcp_servers[keys[0]]['description'] == 'Edited description'
+    assert keys[1] not in collector.mcp_servers
+    assert list(collector.mcp_servers) == [key for key in keys if key != keys[1]]
+    assert removed['name'] == full_run[keys[1]]['name']
+    assert collector.apply_source_changes(source) == set()
@@ -0,0 +1,112 @@
+import copy
+
+import pytest
+
+from consistency_check import (
+    DEFAULT_ARTIFACTS,
+    canonical_repository,
+    check_consistency,
+    declared_count_issues,
+    identity,
+    load_documents,
+)
+
+DOCUMENTS = {
+    'directory': {
+        'metadata': {'total_servers': 2, 'total_categories': 1},
+        'categories': [{'name': 'Development Tools', 'count': 2}],
+        'servers': {
+            'google_drive': {'name': 'Google Drive', 'category': 'Development Tools',
+                             'installation_instructions': 'npm install @mcp/server-gdrive',
+                             'repository_link': 'https://github.com/mcp/gdrive'},
+            'git': {'name': 'Git', 'category': 'Development Tools',
+                    'installation_instructions': 'pip install mcp-server-git',
+                    'repository_link': 'https://github.com/mcp/git'},
+        },
+    },
+    'database': {
+        'categories': [{'name': 'Files', 'count': 1, 'servers': ['gdrive']}],
+        'servers': {'gdrive': {'name': 'Google Drive', 'repository_link': 'https://www.github.com/MCP/gdrive.git/'}},
+    },
+    'installer': {
+        'servers': {
+            'google-drive': {'name': 'Google Drive', 'package': '@mcp/server-gdrive',
+                             'category': 'Development Tools', 'repository': 'https://github.com/mcp/gdrive'},
+            'git': {'name': 'Git', 'package': 'mcp-server-git', 'category': 'Development Tools',
+                    'repository': 'https://github.com/mcp/git'},
+        },
+    },
+    'vscode': {
+        'mcpServers': {
+            '// comment': {},
+            'drive': {'command': 'npx', 'args': ['-y', '@mcp/server-gdrive']},
+            'git': {'command': 'uvx', 'args': ['mcp-server-git']},
+        },
+    },
+}
+
+
+def test_identity_and_repository_normalization():
+    assert identity('google_drive') == identity('Google Drive') == identity('google-drive') == 'googledrive'
+    assert canonical_repository('https://www.github.com/MCP/gdrive.git/') == 'github.com/mcp/gdrive'
+    assert canonical_repository('') is None
+
+
+def test_consistent_artifacts_report_nothing():
+    report = check_consistency(copy.deepcopy(DOCUMENTS))
+    assert report == {kind: [] for kind in report}
+    assert set(report) == {'counts', 'coverage', 'duplicates', 'name', 'package', 'category', 'repository'}
+
+
+def test_field_mismatches_are_reported_per_server():
+    documents = copy.deepcopy(DOCUMENTS)
+    documents['installer']['servers']['git']['category'] = 'Version Control'
+    documents['installer']['servers']['google-drive']['package'] = '@mcp/server-google-drive'
+    report = check_consistency(documents)
+    assert report['category'] == ["git: directory='Development Tools', installer='Version Control'"]
+    assert report['package'] == ["google_drive: directory='@mcp/server-gdrive', "
+                                 "installer='@mcp/server-google-drive', vscode='@mcp/server-gdrive'"]
+
+
+def test_coverage_and_duplicates():
+    documents = copy.deepcopy(DOCUMENTS)
+    del documents['vscode']['mcpServers']['git']
+    documents['installer']['servers']['Git'] = dict(documents['installer']['servers']['git'])
+    documents['installer']['servers']['slack'] = {'name': 'Slack', 'package': 'slack-mcp'}
+    report = check_consistency(documents)
+    assert report['coverage'] == ['git: missing from vscode', 'slack: in installer but not in directory']
+    assert report['duplicates'] == ['git: listed 2 times in installer (git, Git)']
+
+
+def test_database_is_not_required_to_be_complete():
+    documents = copy.deepcopy(DOCUMENTS)
+    documents['database']['servers'] = {}
+    documents['database']['categories'] = []
+    assert check_consistency(documents)['coverage'] == []
+
+
+def test_declared_counts():
+    directory = copy.deepcopy(DOCUMENTS['directory'])
+    directory['metadata']['total_servers'] = 3
+    directory['categories'][0]['count'] = 1
+    assert declared_count_issues('directory', directory) == [
+        'directory: metadata.total_servers is 3, 2 servers listed',
+        "directory: category 'Development Tools' declares 1 servers, 2 listed",
+    ]
+
+
+def test_database_categories_are_membership_lists():
+    database = copy.deepcopy(DOCUMENTS['database'])
+    database['categories'].append({'name': 'Search', 'count': 1, 'servers': ['brave']})
+    database['categories'][0]['count'] = 2
+    assert declared_count_issues('database', database) == [
+        "database: category 'Files' declares 2 servers, 1 listed",
+        "database: category 'Search' lists unknown server(s) brave",
+    ]
+
+
+@pytest.mark.parametrize('artifact', list(DEFAULT_ARTIFACTS))
+def test_repository_artifacts_are_readable(artifact):
+    documents = load_documents({artifact: DEFAULT_ARTIFACTS[artifact]})
+    report = check_consistency(documents)
+    assert report['duplicates'] == []
@@ -0,0 +1,58 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from catalog_publish import canonical_json
+from comprehensive_mcp_collector import (
+    CRITICAL_DESCRIPTION_LENGTH,
+    CRITICAL_PAYLOAD_BUDGET,
+    CRITICAL_POPULAR_COUNT,
+    ComprehensiveMCPCollector,
+)
+
+CRITICAL_FILE = Path(__file__).resolve().parent.parent / 'data' / 'comprehensive_mcp_directory.critical.json'
+
+
+@pytest.fixture(scope='module')
+def collector():
+    collector = ComprehensiveMCPCollector()
+    collector.load_comprehensive_server_list()
+    return collector
+
+
+def test_critical_payload_fits_the_budget(collector):
+    payload = canonical_json(collector.build_critical_payload())
+    assert len(payload) <= CRITICAL_PAYLOAD_BUDGET
+
+
+def test_critical_payload_has_what_the_home_page_renders(collector):
+    export_data = collector.build_export_data()
+    payload = collector.build_critical_payload(export_data)
+    assert payload['metadata'] == export_data['metadata']
+    assert [c['name'] for c in payload['categories']] == [c['name'] for c in export_data['categories']]
+    assert all(set(c) == {'name', 'count', 'icon', 'color'} for c in payload['categories'])
+
+    popular = payload['popular_servers']
+    assert len(popular) == CRITICAL_POPULAR_COUNT
+    for server in popular:
+        full = collector.mcp_servers[server['key']]
+        assert server['level'] == full['popularity_indicators']['level'] == 'high'
+        assert len(server['description']) <= CRITICAL_DESCRIPTION_LENGTH + len('...')
+        assert full['description'].startswith(server['description'].rstrip('.'))
+
+
+def test_long_descriptions_are_truncated():
+    collector = ComprehensiveMCPCollector()
+    collector.load_comprehensive_server_list()
+    key = next(k for k, s in collector.mcp_servers.items() if s['popularity_indicators']['level'] == 'high')
+    collector.mcp_servers[key]['description'] = 'x' * 500
+    popular = collector.build_critical_payload()['popular_servers']
+    entry = next(s for s in popular if s['key'] == key)
+    assert entry['description'] == 'x' * CRITICAL_DESCRIPTION_LENGTH + '...'
+
+
+def test_published_critical_payload_matches_the_collector(collector):
+    artifacts = collector.render_artifacts()
+    assert CRITICAL_FILE.read_bytes() == artifacts['comprehensive_mcp_directory.critical.json']
+    assert json.loads(artifacts['comprehensive_mcp_directory.critical.json']) == collector.build_critical_payload()
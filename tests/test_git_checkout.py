@@ -0,0 +1,114 @@
+import shutil
+import subprocess
+
+import pytest
+
+from git_checkout import GitError, SharedCheckout, is_worktree, parse_repository
+
+requires_git = pytest.mark.skipif(shutil.which('git') is None, reason='git is not installed')
+
+
+@pytest.mark.parametrize('url, clone_url, cache_path, ref, subdir', [
+    ('https://github.com/modelcontextprotocol/servers/tree/main/src/fetch',
+     'https://github.com/modelcontextprotocol/servers.git', 'github.com/modelcontextprotocol/servers',
+     'main', 'src/fetch'),
+    ('https://github.com/Owner/Repo.git', 'https://github.com/Owner/Repo.git', 'github.com/owner/repo', None, None),
+    ('https://github.com/owner/repo/tree/dev/', 'https://github.com/owner/repo.git', 'github.com/owner/repo',
+     'dev', None),
+])
+def test_parse_repository(url, clone_url, cache_path, ref, subdir):
+    location = parse_repository(url)
+    assert location == (clone_url, cache_path, ref, subdir)
+
+
+@pytest.mark.parametrize('url', ['git@github.com:owner/repo.git', 'https://github.com/owner', 'not a url'])
+def test_unrecognized_urls(url):
+    assert parse_repository(url) is None
+
+
+def git(*args, cwd=None):
+    return subprocess.run(['git', *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def monorepo(tmp_path):
+    """Local repository with two servers under src/, served in place of github.com"""
+    origin = tmp_path / 'origin'
+    for name in ('fetch', 'git'):
+        (origin / 'src' / name).mkdir(parents=True)
+        (origin / 'src' / name / 'server.py').write_text(f'# {name}\n')
+    (origin / 'README.md').write_text('servers\n')
+    git('init', '--quiet', '--initial-branch=main', cwd=origin)
+    git('add', '.', cwd=origin)
+    git('-c', 'user.name=t', '-c', 'user.email=t@example.com', 'commit', '--quiet', '-m', 'init', cwd=origin)
+    return origin
+
+
+class LocalRunner:
+    """Runs git with the GitHub clone URL pointed at the local repository, recording each call"""
+
+    def __init__(self, origin):
+        self.origin = origin
+        self.calls = []
+
+    def __call__(self, cmd, phase, timeout):
+        cmd = [str(self.origin) if arg == 'https://github.com/example/servers.git' else arg for arg in cmd]
+        self.calls.append(cmd[1:])
+        return subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+
+    def count(self, command):
+        return sum(1 for call in self.calls if command in call[:3])
+
+
+@requires_git
+def test_servers_from_one_repository_share_a_clone(tmp_path, monorepo):
+    runner = LocalRunner(monorepo)
+    checkouts = SharedCheckout(tmp_path / 'servers', runner=runner)
+    head = git('rev-parse', 'HEAD', cwd=monorepo)
+
+    for name in ('fetch', 'git'):
+        location = parse_repository(f'https://github.com/example/servers/tree/main/src/{name}')
+        dest = tmp_path / 'servers' / name
+        assert checkouts.checkout(location, dest) == head
+        assert is_worktree(dest)
+        assert (dest / 'src' / name / 'server.py').exists()
+        # Sparse: the other server's directory is not checked out
+        other = 'git' if name == 'fetch' else 'fetch'
+        assert not (dest / 'src' / other).exists()
+
+    assert runner.count('clone') == 1
+    assert (tmp_path / 'servers' / '.repos' / 'github.com' / 'example' / 'servers' / '.git').is_dir()
+
+
+@requires_git
+def test_update_fetches_once_per_run(tmp_path, monorepo):
+    location = parse_repository('https://github.com/example/servers/tree/main/src/fetch')
+    dest = tmp_path / 'servers' / 'fetch'
+    SharedCheckout(tmp_path / 'servers', runner=LocalRunner(monorepo)).checkout(location, dest)
+
+    (monorepo / 'src' / 'fetch' / 'server.py').write_text('# fetch v2\n')
+    git('-c', 'user.name=t', '-c', 'user.email=t@example.com', 'commit', '--quiet', '-am', 'v2', cwd=monorepo)
+
+    runner = LocalRunner(monorepo)
+    checkouts = SharedCheckout(tmp_path / 'servers', runner=runner)
+    assert checkouts.checkout(location, dest) == git('rev-parse', 'HEAD', cwd=monorepo)
+    assert (dest / 'src' / 'fetch' / 'server.py').read_text() == '# fetch v2\n'
+    checkouts.checkout(location, tmp_path / 'servers' / 'fetch-copy')
+    assert runner.count('fetch') == 1
+    assert runner.count('clone') == 0
+
+
+def test_missing_bundle_is_an_error(tmp_path):
+    location = parse_repository('https://github.com/example/servers')
+    checkouts = SharedCheckout(tmp_path, bundle_for=lambda location: tmp_path / 'missing.bundle',
+                               runner=lambda *args, **kwargs: pytest.fail('git must not run'))
+    with pytest.raises(GitError, match='bundle'):
+        checkouts.checkout(location, tmp_path / 'servers')
+
+
+def test_git_failures_raise_git_error(tmp_path):
+    def failing(cmd, phase, timeout):
+        return subprocess.CompletedProcess(cmd, 128, '', 'fatal: repository not found\n')
+    location = parse_repository('https://github.com/example/servers')
+    with pytest.raises(GitError, match='repository not found'):
+        SharedCheckout(tmp_path, runner=failing).checkout(location, tmp_path / 'servers')
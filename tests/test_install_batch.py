@@ -0,0 +1,70 @@
+import subprocess
+
+import pytest
+
+from install_mcp_servers import BATCH_COMMANDS, InstallMethod
+
+
+class FakeNpm:
+    """npm install -g stand-in that fails the whole call if any package is bad"""
+
+    def __init__(self, bad=()):
+        self.bad = set(bad)
+        self.calls = []
+
+    def __call__(self, cmd, phase, timeout, env=None):
+        packages = cmd[len(BATCH_COMMANDS[InstallMethod.NPM]):]
+        self.calls.append(packages)
+        failed = self.bad.intersection(packages)
+        return subprocess.CompletedProcess(cmd, 1 if failed else 0, '', f'404 {sorted(failed)}' if failed else '')
+
+
+@pytest.fixture
+def npm_batch(installer):
+    return [(key, server) for key, server in installer.servers.items()
+            if server.installation_method == InstallMethod.NPM][:8]
+
+
+def test_successful_batch_is_one_call(installer, npm_batch, monkeypatch):
+    npm = FakeNpm()
+    monkeypatch.setattr(installer, '_run_command', npm)
+    outcome = installer.install_package_batch(InstallMethod.NPM, npm_batch)
+    assert outcome == {key: True for key, _ in npm_batch}
+    assert npm.calls == [[server.package for _, server in npm_batch]]
+
+
+def test_failing_package_is_isolated_by_bisection(installer, npm_batch, monkeypatch):
+    bad_key, bad = npm_batch[5]
+    npm = FakeNpm(bad=[bad.package])
+    monkeypatch.setattr(installer, '_run_command', npm)
+    outcome = installer.install_package_batch(InstallMethod.NPM, npm_batch)
+    assert outcome == {key: key != bad_key for key, _ in npm_batch}
+    # 8 -> 4 + 4 -> 2 + 2 -> 1 + 1: one failing call per level plus the healthy halves
+    assert len(npm.calls) == 7
+    assert [len(call) for call in npm.calls if bad.package in call] == [8, 4, 2, 1]
+
+
+def test_every_package_failing_is_reported_per_server(installer, npm_batch, monkeypatch):
+    npm = FakeNpm(bad=[server.package for _, server in npm_batch[:3]])
+    monkeypatch.setattr(installer, '_run_command', npm)
+    outcome = installer.install_package_batch(InstallMethod.NPM, npm_batch[:3])
+    assert outcome == {key: False for key, _ in npm_batch[:3]}
+    assert sorted(map(len, npm.calls)) == [1, 1, 1, 2, 3]
+
+
+def test_timeouts_count_as_failures(installer, npm_batch, monkeypatch):
+    def timeout(cmd, phase, timeout, env=None):
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    monkeypatch.setattr(installer, '_run_command', timeout)
+    key, _ = npm_batch[0]
+    assert installer.install_package_batch(InstallMethod.NPM, npm_batch[:1]) == {key: False}
+
+
+def test_install_batch_records_each_server(installer, npm_batch, monkeypatch):
+    bad_key, bad = npm_batch[2]
+    monkeypatch.setattr(installer, '_run_command', FakeNpm(bad=[bad.package]))
+    monkeypatch.setattr(installer.state, 'record_install', lambda key, server: None)
+    assert installer.install_batch(InstallMethod.NPM, npm_batch) is False
+    assert installer.results.failed_installs == [bad.name]
+    assert installer.results.success_count == len(npm_batch) - 1
+    assert installer.results.outcomes == {server.name: key != bad_key for key, server in npm_batch}
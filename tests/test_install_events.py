@@ -0,0 +1,136 @@
+import io
+import json
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from install_events import EventLog, ProgressDisplay, RingBuffer, _to_bytes
+
+
+def test_ring_buffer_keeps_the_tail():
+    buffer = RingBuffer(max_bytes=20)
+    for number in range(10):
+        buffer.append(f'line {number}\n')
+    assert buffer.text() == 'line 8\nline 9\n'
+    assert buffer.total_bytes == 70
+
+
+def test_ring_buffer_keeps_one_oversized_line():
+    buffer = RingBuffer(max_bytes=4)
+    buffer.append('x' * 10)
+    assert buffer.text() == 'x' * 10
+
+
+@pytest.mark.parametrize('value, unit, expected', [('12.5', 'MB', 12500000), ('2', 'KiB', 2048),
+                                                   ('1', 'GiB', 1024 ** 3), ('300', 'B', 300)])
+def test_units(value, unit, expected):
+    assert _to_bytes(value, unit) == expected
+
+
+def read_events(path):
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+
+
+def python(code):
+    return [sys.executable, '-c', code]
+
+
+@pytest.fixture
+def log(tmp_path):
+    log = EventLog(tmp_path / 'events.jsonl', display=ProgressDisplay(io.StringIO()))
+    log.start_session(2, jobs=1)
+    yield log
+    log.close()
+
+
+def test_run_streams_output_and_logs_events(log, tmp_path):
+    code = ("import sys\n"
+            "for i in range(5000): print('x' * 40)\n"
+            "print('Downloading pkg-1.0-py3-none-any.whl (1.5 MB)')\n"
+            "print('Downloading dep-2.0.tar.gz (512 kB)')\n"
+            "print('boom', file=sys.stderr); sys.exit(3)")
+    with log.server('fetch') as outcome:
+        result = log.run(python(code), phase='pip', timeout=30)
+        outcome['success'] = result.returncode == 0
+    log.end_session(succeeded=0)
+
+    assert result.returncode == 3
+    assert result.stderr == 'boom\n'
+    assert result.stdout.endswith('(512 kB)\n')
+    assert len(result.stdout.encode()) <= 64 * 1024
+    assert result.bytes_downloaded == 1500000 + 512000
+
+    events = read_events(tmp_path / 'events.jsonl')
+    assert [event['event'] for event in events] == [
+        'session_start', 'server_start', 'command_start', 'progress', 'command_end', 'server_end', 'session_end']
+    # Reported from a reader thread, still attributed to the installing server
+    progress = events[3]
+    assert progress['server'] == 'fetch' and progress['bytes_downloaded'] == 1500000
+    end = events[4]
+    assert end['server'] == 'fetch' and end['phase'] == 'pip'
+    assert end['returncode'] == 3
+    assert end['bytes_downloaded'] == 2012000
+    downloads = 'Downloading pkg-1.0-py3-none-any.whl (1.5 MB)\nDownloading dep-2.0.tar.gz (512 kB)\n'
+    assert end['output_bytes'] == 5000 * 41 + len(downloads) + len('boom\n')
+    assert end['stderr_tail'] == 'boom\n'
+    assert events[5]['success'] is False
+    assert 'server' not in events[6]
+
+
+def test_git_progress_is_cumulative(log):
+    code = ("import sys\n"
+            "for size in ('1.00 MiB', '2.50 MiB', '3.00 MiB'):\n"
+            "    print(f'Receiving objects:  50% (5/10), {size} | 1 MiB/s', file=sys.stderr)")
+    result = log.run(python(code), phase='git', timeout=30)
+    assert result.returncode == 0
+    assert result.bytes_downloaded == 3 * 1024 * 1024
+
+
+def test_timeout_kills_the_command(log, tmp_path):
+    with pytest.raises(subprocess.TimeoutExpired):
+        log.run(python('import time; time.sleep(30)'), phase='npm', timeout=0.3)
+    end = read_events(tmp_path / 'events.jsonl')[-1]
+    assert end['event'] == 'command_end'
+    assert end['timeout'] is True and end['returncode'] is None
+
+
+def test_events_belong_to_the_thread_s_server(log, tmp_path):
+    def install(name):
+        with log.server(name) as outcome:
+            log.run(python('print(1)'), phase='npm', timeout=30)
+            outcome['success'] = True
+
+    threads = [threading.Thread(target=install, args=(name,)) for name in ('a', 'b')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    events = read_events(tmp_path / 'events.jsonl')[1:]
+    assert len(events) == 8
+    for name in ('a', 'b'):
+        assert [event['event'] for event in events if event.get('server') == name] == [
+            'server_start', 'command_start', 'command_end', 'server_end']
+    assert log.display.done == 2 and log.display.running == {}
+
+
+class Terminal(io.StringIO):
+    def isatty(self):
+        return True
+
+
+def test_progress_line_only_on_a_terminal():
+    quiet = ProgressDisplay(io.StringIO())
+    quiet.running['fetch'] = 0.0
+    quiet.render()
+    assert quiet.stream.getvalue() == ''
+
+    display = ProgressDisplay(Terminal())
+    display.total, display.done = 5, 2
+    display.running.update({'fetch': 0.0, 'git': 1.0})
+    display.render()
+    assert display.stream.getvalue().startswith('\r\033[K[2/5] 進行中: fetch ')
+    display.clear()
+    assert display.stream.getvalue().endswith('\r\033[K')
@@ -0,0 +1,126 @@
+import threading
+import time
+
+import pytest
+
+from install_scheduler import (
+    DEFAULT_METHOD_LIMITS,
+    InstallResults,
+    InstallScheduler,
+    InstallTask,
+    ResourceMonitor,
+    parse_method_limits,
+)
+
+
+class Idle:
+    def throttle_reason(self):
+        return None
+
+
+class Busy:
+    def throttle_reason(self):
+        return 'load'
+
+
+class Tracker:
+    """Tasks that record how many of each method ran at once"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = {}
+        self.peak = {}
+        self.total_peak = 0
+
+    def task(self, key, method, result=True, seconds=0.02):
+        def run():
+            with self.lock:
+                self.active[method] = self.active.get(method, 0) + 1
+                self.peak[method] = max(self.peak.get(method, 0), self.active[method])
+                self.total_peak = max(self.total_peak, sum(self.active.values()))
+            time.sleep(seconds)
+            with self.lock:
+                self.active[method] -= 1
+            if isinstance(result, Exception):
+                raise result
+            return result
+        return InstallTask(key, method, run)
+
+
+def test_parse_method_limits():
+    assert parse_method_limits(None) == DEFAULT_METHOD_LIMITS
+    limits = parse_method_limits('npm=1, go=3')
+    assert limits == dict(DEFAULT_METHOD_LIMITS, npm=1, go=3)
+    for text in ('cargo=2', 'npm=0', 'npm=x', 'npm'):
+        with pytest.raises(ValueError):
+            parse_method_limits(text)
+
+
+def test_jobs_and_method_limits_are_respected():
+    tracker = Tracker()
+    tasks = ([tracker.task(f'go{i}', 'go') for i in range(5)]
+             + [tracker.task(f'npm{i}', 'npm') for i in range(6)])
+    scheduler = InstallScheduler(jobs=4, method_limits=dict(DEFAULT_METHOD_LIMITS, go=2, npm=3),
+                                 monitor=Idle())
+    outcome = scheduler.run(tasks)
+    assert outcome == {task.key: True for task in tasks}
+    assert tracker.peak['go'] == 2
+    assert tracker.peak['npm'] <= 3
+    assert tracker.total_peak == 4
+
+
+def test_full_method_does_not_block_other_methods():
+    tracker = Tracker()
+    tasks = [tracker.task(f'go{i}', 'go', seconds=0.05) for i in range(3)] + [tracker.task('npm', 'npm')]
+    scheduler = InstallScheduler(jobs=4, method_limits=dict(DEFAULT_METHOD_LIMITS, go=1), monitor=Idle())
+    started = time.perf_counter()
+    scheduler.run(tasks)
+    assert tracker.peak['go'] == 1
+    assert tracker.total_peak == 2
+    assert time.perf_counter() - started < 0.5
+
+
+def test_failures_and_exceptions_are_outcomes():
+    tracker = Tracker()
+    messages = []
+    tasks = [tracker.task('ok', 'pip'), tracker.task('bad', 'pip', result=False),
+             tracker.task('boom', 'pip', result=RuntimeError('exit 1'))]
+    outcome = InstallScheduler(jobs=2, monitor=Idle(), log=messages.append).run(tasks)
+    assert outcome == {'ok': True, 'bad': False, 'boom': False}
+    assert any('boom' in message and 'exit 1' in message for message in messages)
+
+
+def test_throttling_keeps_one_install_running():
+    tracker = Tracker()
+    messages = []
+    tasks = [tracker.task(f'npm{i}', 'npm', seconds=0.005) for i in range(3)]
+    outcome = InstallScheduler(jobs=4, monitor=Busy(), log=messages.append).run(tasks)
+    assert all(outcome.values()) and len(outcome) == 3
+    assert tracker.total_peak == 1
+    # The reason is logged once per throttled stretch, not on every poll
+    assert messages.count('暫緩啟動新安裝: load') <= len(tasks)
+
+
+def test_resource_monitor_thresholds(monkeypatch):
+    monitor = ResourceMonitor(max_load_per_cpu=1.0, min_available_mb=100)
+    monkeypatch.setattr(ResourceMonitor, 'load_average', staticmethod(lambda: None))
+    monkeypatch.setattr(ResourceMonitor, 'available_memory_mb', staticmethod(lambda: None))
+    assert monitor.throttle_reason() is None
+    monkeypatch.setattr(ResourceMonitor, 'available_memory_mb', staticmethod(lambda: 50.0))
+    assert '50 MB' in monitor.throttle_reason()
+    monkeypatch.setattr(ResourceMonitor, 'load_average', staticmethod(lambda: monitor.max_load + 1))
+    assert monitor.throttle_reason().startswith('系統負載')
+
+
+def test_install_results_are_thread_safe():
+    results = InstallResults()
+    threads = [threading.Thread(target=results.record, args=(f's{i}', i % 2 == 0, 0.1)) for i in range(50)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.record_skipped('cached')
+    assert results.success_count == 25
+    assert len(results.failed_installs) == 25
+    assert len(results.outcomes) == 51 and results.outcomes['cached']
+    assert results.install_log[-1] == '= cached'
@@ -0,0 +1,134 @@
+import json
+import random
+import subprocess
+
+import pytest
+
+from install_session import InstallSession, RetryPolicy, is_transient
+
+
+def result(returncode, stderr=''):
+    return subprocess.CompletedProcess([], returncode, '', stderr)
+
+
+@pytest.mark.parametrize('stderr', [
+    'npm ERR! code ETIMEDOUT',
+    'npm ERR! network socket hang up',
+    "ReadTimeoutError: HTTPSConnectionPool(host='pypi.org'): Read timed out.",
+    'fatal: unable to access: Could not resolve host: github.com',
+    'error: RPC failed; curl 56 GnuTLS recv error',
+    'go: github.com/x/y@v1: reading https://proxy.golang.org: 503 Service Unavailable',
+    'npm ERR! 429 Too Many Requests',
+])
+def test_transient_errors(stderr):
+    assert is_transient(stderr)
+
+
+@pytest.mark.parametrize('stderr', ['', 'npm ERR! 404 Not Found', 'ERROR: No matching distribution found',
+                                    'fatal: repository not found'])
+def test_permanent_errors(stderr):
+    assert not is_transient(stderr)
+
+
+def test_delay_is_full_jitter_capped_at_max_delay():
+    random.seed(1)
+    policy = RetryPolicy(base_delay=2.0, max_delay=10.0)
+    for attempt, ceiling in [(0, 2.0), (1, 4.0), (2, 8.0), (3, 10.0), (10, 10.0)]:
+        delays = [policy.delay(attempt) for _ in range(200)]
+        assert all(0 <= delay <= ceiling for delay in delays)
+        # Spread over the whole range, not clustered at the ceiling
+        assert min(delays) < ceiling * 0.1 and max(delays) > ceiling * 0.9
+
+
+class Calls:
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.count = 0
+
+    def __call__(self):
+        self.count += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def test_transient_failures_are_retried():
+    call = Calls(result(1, 'ECONNRESET'), subprocess.TimeoutExpired('npm', 1), result(0))
+    retries, sleeps = [], []
+    outcome = RetryPolicy(retries=3).run(call, on_retry=lambda *args: retries.append(args), sleep=sleeps.append)
+    assert outcome.returncode == 0
+    assert call.count == 3
+    assert [(attempt, reason) for attempt, _, reason in retries] == [(1, 'ECONNRESET'), (2, '超時')]
+    assert sleeps == [delay for _, delay, _ in retries]
+
+
+def test_permanent_failure_is_not_retried():
+    call = Calls(result(1, 'npm ERR! 404 Not Found'))
+    assert RetryPolicy().run(call, sleep=pytest.fail).returncode == 1
+    assert call.count == 1
+
+
+def test_retries_are_bounded():
+    call = Calls(*[result(1, 'ETIMEDOUT')] * 3)
+    assert RetryPolicy(retries=2).run(call, sleep=lambda delay: None).returncode == 1
+    assert call.count == 3
+
+    call = Calls(*[subprocess.TimeoutExpired('go', 1)] * 2)
+    with pytest.raises(subprocess.TimeoutExpired):
+        RetryPolicy(retries=1).run(call, sleep=lambda delay: None)
+
+
+def test_session_checkpoints(tmp_path):
+    path = tmp_path / 'install-session.json'
+    session = InstallSession(path)
+    assert session.pending() is None
+
+    session.begin(['fetch', 'git', 'slack', 'go'], {'batch': False})
+    session.mark('fetch', 'running')
+    session.mark('fetch', 'succeeded')
+    session.mark('git', 'skipped')
+    session.mark('slack', 'running')
+    session.mark('slack', 'failed', 'x' * 1000)
+    assert session.counts() == {'succeeded': 1, 'skipped': 1, 'failed': 1, 'pending': 1}
+
+    # An interrupted run leaves 'running' behind; it is resumed like a failure
+    session.mark('go', 'running')
+    reloaded = InstallSession(path)
+    assert reloaded.pending() == ['slack', 'go']
+    entry = reloaded.data['servers']['slack']
+    assert entry['attempts'] == 1 and len(entry['error']) == 500
+
+    reloaded.resume()
+    reloaded.mark('slack', 'running')
+    reloaded.mark('slack', 'succeeded')
+    data = json.loads(path.read_text(encoding='utf-8'))
+    assert data['resumed'] == 1
+    assert data['servers']['slack']['attempts'] == 2 and 'error' not in data['servers']['slack']
+
+
+def test_mark_without_a_session_is_ignored(tmp_path):
+    session = InstallSession(tmp_path / 'install-session.json')
+    session.mark('fetch', 'running')
+    assert not (tmp_path / 'install-session.json').exists()
+
+
+def test_resume_installs_only_unfinished_servers(installer, tmp_path, monkeypatch):
+    keys = list(installer.servers)[:4]
+    attempted = []
+
+    def install_server(key, server):
+        attempted.append(key)
+        success = key != keys[1] or len(attempted) > 4
+        installer.session.mark(key, 'succeeded' if success else 'failed')
+        installer.results.record(server.name, success)
+        return success
+    monkeypatch.setattr(installer, 'install_server', install_server)
+
+    installer.install_all(server_list=keys, jobs=1, compile_levels=None)
+    assert sorted(attempted) == sorted(keys)
+    assert installer.session.pending() == [keys[1]]
+
+    installer.install_all(server_list=installer.session.pending(), jobs=1, resume=True, compile_levels=None)
+    assert attempted[4:] == [keys[1]]
+    assert InstallSession(installer.session.path).pending() == []
@@ -0,0 +1,155 @@
+import json
+import os
+
+import pytest
+
+import install_state
+from install_mcp_servers import InstallMethod, MCPServer
+from install_state import InstalledState, npm_package_name, pip_distribution_name
+from python_envs import environment_paths
+
+
+def server(package, method=InstallMethod.NPM, repository='https://github.com/example/server'):
+    return MCPServer(name=package, package=package, installation_method=method, category='Tools',
+                     description='', repository=repository, requires_api_key=False, config_required=[])
+
+
+class NpmRoot:
+    """Global node_modules answered by a fake `npm root -g`, counting every probe"""
+
+    def __init__(self, path):
+        self.path = path
+        self.calls = []
+
+    def run(self, cmd, cwd=None):
+        self.calls.append(cmd)
+        return str(self.path) if cmd == ['npm', 'root', '-g'] else None
+
+
+@pytest.fixture
+def npm_root(tmp_path, monkeypatch):
+    root = NpmRoot(tmp_path / 'node_modules')
+    root.path.mkdir()
+    monkeypatch.setattr(install_state, '_run', root.run)
+    return root
+
+
+def install_npm(root, name, version, extra=''):
+    package_dir = root.path / name
+    package_dir.mkdir(parents=True, exist_ok=True)
+    (package_dir / 'package.json').write_text(json.dumps({'name': name, 'version': version}) + extra)
+    return package_dir / 'package.json'
+
+
+def new_state(tmp_path):
+    return InstalledState(tmp_path / 'installed.json', tmp_path / 'servers')
+
+
+def test_spec_names():
+    assert npm_package_name('@scope/pkg@1.2.3') == '@scope/pkg'
+    assert npm_package_name('@scope/pkg') == '@scope/pkg'
+    assert npm_package_name('pkg@latest') == 'pkg'
+    assert pip_distribution_name('mcp-server-git[extra]>=1.0') == 'mcp-server-git'
+    assert pip_distribution_name('mcp_server; python_version>"3.8"') == 'mcp_server'
+
+
+def test_recorded_install_survives_a_reload(tmp_path, npm_root):
+    marker = install_npm(npm_root, '@scope/pkg', '1.0.0')
+    state = new_state(tmp_path)
+    entry = state.record_install('pkg', server('@scope/pkg@1.0.0'))
+    assert entry['version'] == '1.0.0'
+    assert entry['marker'] == str(marker)
+    assert entry['sha256'] == install_state.file_sha256(marker)
+    state.save()
+
+    reloaded = new_state(tmp_path)
+    assert reloaded.entries == state.entries
+    assert reloaded.is_current('pkg', server('@scope/pkg@1.0.0'))
+
+
+def test_fast_path_runs_no_subprocess(tmp_path, npm_root):
+    install_npm(npm_root, 'pkg', '1.0.0')
+    state = new_state(tmp_path)
+    state.record_install('pkg', server('pkg'))
+    state.save()
+
+    npm_root.calls.clear()
+    assert new_state(tmp_path).is_current('pkg', server('pkg'))
+    assert npm_root.calls == []
+
+
+def test_config_change_requires_reinstall(tmp_path, npm_root):
+    install_npm(npm_root, 'pkg', '1.0.0')
+    state = new_state(tmp_path)
+    state.record_install('pkg', server('pkg'))
+    assert not state.is_current('pkg', server('pkg', repository='https://github.com/other/server'))
+    assert not state.is_current('other', server('pkg'))
+
+
+def test_touched_marker_with_same_content_is_current(tmp_path, npm_root):
+    marker = install_npm(npm_root, 'pkg', '1.0.0')
+    state = new_state(tmp_path)
+    entry = state.record_install('pkg', server('pkg'))
+    os.utime(marker, ns=(0, 0))
+    assert state.is_current('pkg', server('pkg'))
+    # The stat is refreshed, so the next check takes the fast path again
+    assert entry['stat'] == [marker.stat().st_size, 0]
+
+
+def test_changed_version_or_content_is_not_current(tmp_path, npm_root):
+    install_npm(npm_root, 'pkg', '1.0.0')
+    state = new_state(tmp_path)
+    state.record_install('pkg', server('pkg'))
+
+    install_npm(npm_root, 'pkg', '1.0.1')
+    assert not state.is_current('pkg', server('pkg'))
+
+    install_npm(npm_root, 'pkg', '1.0.0', extra='\n')
+    assert not state.is_current('pkg', server('pkg'))
+
+    (npm_root.path / 'pkg' / 'package.json').unlink()
+    assert not state.is_current('pkg', server('pkg'))
+
+
+def test_entries_without_sha256_are_upgraded(tmp_path, npm_root):
+    marker = install_npm(npm_root, 'pkg', '1.0.0')
+    state = new_state(tmp_path)
+    entry = state.record_install('pkg', server('pkg'))
+    del entry['sha256']
+    entry['stat'] = None
+    assert state.is_current('pkg', server('pkg'))
+    assert entry['sha256'] == install_state.file_sha256(marker)
+
+
+def test_pip_server_is_found_in_its_own_environment(tmp_path, monkeypatch):
+    monkeypatch.setattr(install_state, '_run', lambda cmd, cwd=None: None)
+    site_packages = environment_paths(tmp_path / 'servers' / 'git').site_packages
+    dist_info = site_packages / 'mcp_server_git-0.6.2.dist-info'
+    dist_info.mkdir(parents=True)
+    (dist_info / 'METADATA').write_text('Metadata-Version: 2.1\nName: mcp-server-git\nVersion: 0.6.2\n\nBody\n')
+
+    state = new_state(tmp_path)
+    entry = state.record_install('git', server('mcp-server-git>=0.6', InstallMethod.PIP))
+    assert entry['version'] == '0.6.2'
+    assert entry['path'] == str(dist_info)
+    assert state.is_current('git', server('mcp-server-git>=0.6', InstallMethod.PIP))
+
+    # Installed into the global interpreter by an older version: reinstall into the venv
+    entry['path'] = str(tmp_path / 'site-packages' / 'mcp_server_git-0.6.2.dist-info')
+    assert not state.is_current('git', server('mcp-server-git>=0.6', InstallMethod.PIP))
+
+
+def test_unlocatable_install_is_not_recorded(tmp_path, npm_root):
+    state = new_state(tmp_path)
+    state.entries['unity'] = {'spec_hash': 'old'}
+    assert state.record_install('unity', server('unity-mcp', InstallMethod.UNITY)) is None
+    assert 'unity' not in state.entries
+
+
+def test_probes_run_once(tmp_path, npm_root):
+    install_npm(npm_root, 'a', '1.0.0')
+    install_npm(npm_root, 'b', '1.0.0')
+    state = new_state(tmp_path)
+    state.record_install('a', server('a'))
+    state.record_install('b', server('b'))
+    assert npm_root.calls == [['npm', 'root', '-g']]
@@ -0,0 +1,157 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+import launch_commands
+from install_mcp_servers import InstallMethod, MCPServer
+from launch_commands import LaunchResolver, _read_shebang
+from python_envs import environment_paths
+
+
+def server(package, method):
+    return MCPServer(name=package, package=package, installation_method=method, category='Tools',
+                     description='', repository='https://github.com/example/server',
+                     requires_api_key=False, config_required=[])
+
+
+class FakeState:
+    """InstalledState stand-in with fixed install locations"""
+
+    def __init__(self, servers_dir, locations=None):
+        self.servers_dir = servers_dir
+        self.locations = locations or {}
+
+    def location(self, server_key, server):
+        return self.locations.get(server_key)
+
+
+@pytest.fixture
+def node(tmp_path, monkeypatch):
+    path = str(tmp_path / 'bin' / 'node')
+    monkeypatch.setattr(launch_commands, 'which', lambda name: path if name == 'node' else None)
+    return path
+
+
+def npm_package(root, name, bin_field, scripts):
+    package_dir = root / name
+    package_dir.mkdir(parents=True)
+    for script in scripts:
+        (package_dir / script).parent.mkdir(parents=True, exist_ok=True)
+        (package_dir / script).write_text('#!/usr/bin/env node\n')
+    (package_dir / 'package.json').write_text(json.dumps({'name': name, 'bin': bin_field}))
+    return package_dir
+
+
+def test_npm_bin_is_run_with_absolute_node(tmp_path, node):
+    package_dir = npm_package(tmp_path, '@scope/server-x', {'helper': 'dist/helper.js', 'server-x': 'dist/index.js'},
+                              ['dist/helper.js', 'dist/index.js'])
+    resolver = LaunchResolver(FakeState(tmp_path, {'x': package_dir}))
+    command, args = resolver.resolve('x', server('@scope/server-x@1.2', InstallMethod.NPM))
+    assert command == node
+    assert args == [str((package_dir / 'dist' / 'index.js').resolve())]
+
+
+def test_npm_string_bin_and_missing_script(tmp_path, node):
+    package_dir = npm_package(tmp_path, 'single', 'cli.js', ['cli.js'])
+    resolver = LaunchResolver(FakeState(tmp_path, {'single': package_dir, 'broken': npm_package(
+        tmp_path, 'broken', 'missing.js', [])}))
+    assert resolver.resolve('single', server('single', InstallMethod.NPM)) == (node, [str(package_dir / 'cli.js')])
+    assert resolver.resolve('broken', server('broken', InstallMethod.NPM)) is None
+    assert resolver.resolve('absent', server('absent', InstallMethod.NPM)) is None
+
+
+def test_npm_without_node_falls_back(tmp_path, monkeypatch):
+    monkeypatch.setattr(launch_commands, 'which', lambda name: None)
+    package_dir = npm_package(tmp_path, 'single', 'cli.js', ['cli.js'])
+    assert LaunchResolver(FakeState(tmp_path, {'s': package_dir})).resolve('s', server('single', InstallMethod.NPM)) is None
+
+
+def venv_dist_info(servers_dir, key, distribution, version, console_scripts=()):
+    env = environment_paths(servers_dir / key)
+    dist_info = env.site_packages / f'{distribution}-{version}.dist-info'
+    dist_info.mkdir(parents=True)
+    if console_scripts:
+        lines = ['[console_scripts]'] + [f'{name} = {distribution}:main' for name in console_scripts]
+        (dist_info / 'entry_points.txt').write_text('\n'.join(lines) + '\n')
+        env.scripts.mkdir(parents=True, exist_ok=True)
+        for name in console_scripts:
+            (env.scripts / name).write_text('#!python\n')
+    return env, dist_info
+
+
+def test_pip_console_script_prefers_the_package_name(tmp_path):
+    env, dist_info = venv_dist_info(tmp_path, 'git', 'mcp_server_git', '0.6.2', ['aaa-tool', 'mcp-server-git'])
+    resolver = LaunchResolver(FakeState(tmp_path, {'git': dist_info}))
+    assert resolver.resolve('git', server('mcp-server-git', InstallMethod.PIP)) == \
+        (str(env.python), [str(env.scripts / 'mcp-server-git')])
+
+
+def test_pip_without_console_script_runs_the_module(tmp_path):
+    env, dist_info = venv_dist_info(tmp_path, 'time', 'mcp_server_time', '1.0')
+    resolver = LaunchResolver(FakeState(tmp_path, {'time': dist_info}))
+    assert resolver.resolve('time', server('mcp-server-time>=1', InstallMethod.PIP)) == \
+        (str(env.python), ['-m', 'mcp_server_time'])
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='POSIX script layout')
+def test_legacy_global_pip_install_uses_record(tmp_path):
+    site_packages = tmp_path / 'lib' / 'site-packages'
+    dist_info = site_packages / 'mcp_server_fetch-1.0.dist-info'
+    dist_info.mkdir(parents=True)
+    (dist_info / 'entry_points.txt').write_text('[console_scripts]\nmcp-server-fetch = mcp_server_fetch:main\n')
+    (dist_info / 'RECORD').write_text('../../bin/mcp-server-fetch,,\nmcp_server_fetch/__init__.py,,\n')
+    (tmp_path / 'bin').mkdir()
+    (tmp_path / 'bin' / 'mcp-server-fetch').write_text(f'#!{sys.executable}\n')
+
+    resolver = LaunchResolver(FakeState(tmp_path / 'servers', {'fetch': dist_info}))
+    assert resolver.resolve('fetch', server('mcp-server-fetch', InstallMethod.PIP)) == \
+        (str(tmp_path / 'bin' / 'mcp-server-fetch'), [])
+
+    # Without the script, the interpreter from any installed script's shebang runs the module
+    (dist_info / 'entry_points.txt').unlink()
+    assert resolver.resolve('fetch', server('mcp-server-fetch', InstallMethod.PIP)) == \
+        (sys.executable, ['-m', 'mcp_server_fetch'])
+
+
+def test_go_binary(tmp_path):
+    binary = tmp_path / 'github-mcp-server'
+    binary.write_text('')
+    resolver = LaunchResolver(FakeState(tmp_path, {'github': binary, 'dir': tmp_path}))
+    assert resolver.resolve('github', server('github.com/x/github-mcp-server', InstallMethod.GO)) == (str(binary), [])
+    assert resolver.resolve('dir', server('github.com/x/dir', InstallMethod.GO)) is None
+
+
+def test_source_entry_points(tmp_path, node):
+    resolver = LaunchResolver(FakeState(tmp_path))
+    (tmp_path / 'js').mkdir()
+    (tmp_path / 'js' / 'package.json').write_text('{}')
+    assert resolver.resolve_source(tmp_path / 'js') == (node, [str(tmp_path / 'js' / 'index.js')])
+    (tmp_path / 'py').mkdir()
+    (tmp_path / 'py' / 'main.py').write_text('')
+    assert resolver.resolve_source(tmp_path / 'py') == ('python', [str(tmp_path / 'py' / 'main.py')])
+    assert resolver.resolve_source(tmp_path) is None
+
+
+def test_read_shebang(tmp_path):
+    script = tmp_path / 'script'
+    script.write_text(f'#!{sys.executable} -E\n')
+    assert _read_shebang(script) == sys.executable
+    for line in ('#!/usr/bin/env python3', '#!/bin/sh', 'print(1)'):
+        script.write_text(line + '\n')
+        assert _read_shebang(script) is None
+    assert _read_shebang(tmp_path / 'missing') is None
+
+
+def test_vscode_config_uses_resolved_commands(installer, monkeypatch):
+    key, npm = next((key, server) for key, server in installer.servers.items()
+                    if server.installation_method == InstallMethod.NPM)
+    monkeypatch.setattr(installer.launchers, 'resolve', lambda server_key, server: ('/opt/node', ['/opt/x.js']))
+    config = installer._generate_server_config(key, npm)
+    assert (config['command'], config['args']) == ('/opt/node', ['/opt/x.js'])
+
+    monkeypatch.setattr(installer.launchers, 'resolve', lambda server_key, server: None)
+    config = installer._generate_server_config(key, npm)
+    assert (config['command'], config['args']) == ('npx', [npm.package])
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+import mcp_nav
+from catalog_binary import write_binary_catalog
+from trigram_index import TrigramIndex
+
+
+@pytest.fixture
+def json_only(tmp_path, directory):
+    (tmp_path / 'comprehensive_mcp_directory.json').write_text(json.dumps(directory), encoding='utf-8')
+    return tmp_path
+
+
+@pytest.fixture
+def exported(json_only, servers):
+    write_binary_catalog(servers, str(json_only / 'comprehensive_mcp_directory.mcpb'))
+    TrigramIndex.build(servers).save(str(json_only / 'comprehensive_mcp_directory.trigram.json'))
+    return json_only
+
+
+def run(capsys, data_dir, *argv):
+    status = mcp_nav.main(['--data-dir', str(data_dir), *argv])
+    return status, capsys.readouterr()
+
+
+@pytest.mark.parametrize('layout', ['json_only', 'exported'])
+def test_search(request, capsys, layout):
+    status, out = run(capsys, request.getfixturevalue(layout), 'search', 'postgress', '--keys', '-n', '1')
+    assert status == 0
+    assert out.out.split() == ['postgresql']
+
+
+def test_search_without_matches(capsys, exported):
+    status, out = run(capsys, exported, 'search', 'zzzzzzzz')
+    assert status == 1
+    assert out.out == ''
+
+
+def test_show(capsys, exported, servers):
+    status, out = run(capsys, exported, 'show', 'postgresql', '--json')
+    assert status == 0
+    assert json.loads(out.out) == servers['postgresql']
+
+    status, out = run(capsys, exported, 'show', 'no-such-server')
+    assert status == 1
+    assert 'Unknown server' in out.err
+
+
+def test_binary_and_json_readers_agree(capsys, exported):
+    commands = (['stats'], ['list-category'], ['list-category', 'Databases'])
+    with_binary = [run(capsys, exported, *argv) for argv in commands]
+    (exported / 'comprehensive_mcp_directory.mcpb').unlink()
+    without_binary = [run(capsys, exported, *argv) for argv in commands]
+    assert with_binary == without_binary
+
+
+def test_unknown_category(capsys, exported):
+    status, out = run(capsys, exported, 'list-category', 'No Such Category')
+    assert status == 1
+    assert 'Unknown or empty category' in out.err
+
+
+def test_missing_catalog(capsys, tmp_path):
+    status, out = run(capsys, tmp_path, 'stats')
+    assert status == 2
+    assert 'Catalog not found' in out.err
+
+
+@pytest.mark.parametrize('position', ['before', 'after'])
+def test_profile_flags_around_the_subcommand(capsys, exported, tmp_path, position):
+    profile = ['--profile', '--profile-output', str(tmp_path / 'nav')]
+    argv = ['--data-dir', str(exported)]
+    argv += profile + ['search', 'github', '--keys'] if position == 'before' \
+        else ['search', 'github', '--keys'] + profile
+    assert mcp_nav.main(argv) == 0
+    assert 'github' in capsys.readouterr().out
+    assert (tmp_path / 'nav.pstats').exists()
@@ -0,0 +1,155 @@
+import base64
+import errno
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+import offline_cache
+from install_mcp_servers import InstallMethod, MCPServer
+from offline_cache import PackageCache, cacache_content_path, go_module_zip
+
+
+def server(package, method):
+    return MCPServer(name=package, package=package, installation_method=method, category='Tools',
+                     description='', repository='https://github.com/example/server',
+                     requires_api_key=False, config_required=[])
+
+
+def test_cacache_content_path():
+    digest = hashlib.sha512(b'tarball').digest()
+    integrity = 'sha512-' + base64.b64encode(digest).decode()
+    hex_digest = digest.hex()
+    assert cacache_content_path(integrity) == \
+        f'content-v2/sha512/{hex_digest[:2]}/{hex_digest[2:4]}/{hex_digest[4:]}'
+    # Only the first of several hashes is used
+    assert cacache_content_path(integrity + ' sha1-AAAA') == cacache_content_path(integrity)
+    for bad in ('', '   ', 'sha512-not base64!', 'sha512-'):
+        assert cacache_content_path(bad) is None
+
+
+def test_go_module_zip_escapes_capitals():
+    assert go_module_zip('github.com/BurntSushi/toml', 'v1.3.2') == 'github.com/!burnt!sushi/toml/@v/v1.3.2.zip'
+    assert go_module_zip('golang.org/x/sys', 'v0.1.0') == 'golang.org/x/sys/@v/v0.1.0.zip'
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PackageCache(tmp_path / 'cache')
+
+
+def test_store_deduplicates_and_links(cache):
+    with cache.staging('test-') as staging:
+        first = os.path.join(staging, 'a.whl')
+        second = os.path.join(staging, 'b.whl')
+        for path in (first, second):
+            with open(path, 'wb') as f:
+                f.write(b'wheel')
+        digest = cache.store(Path(first), cache.wheelhouse / 'a.whl')
+        assert cache.store(Path(second), cache.wheelhouse / 'b.whl') == digest
+        assert os.listdir(staging) == []
+
+    blob = cache.blob_path(digest)
+    assert digest == hashlib.sha256(b'wheel').hexdigest()
+    assert blob.read_bytes() == b'wheel'
+    assert os.stat(blob).st_nlink == 3
+    assert sorted(os.listdir(cache.wheelhouse)) == ['a.whl', 'b.whl']
+
+
+def test_store_falls_back_to_copying_across_filesystems(cache, tmp_path, monkeypatch):
+    source = tmp_path / 'other-fs.bundle'
+    source.write_bytes(b'bundle')
+    real_replace = os.replace
+
+    def replace(src, dst):
+        if str(src) == str(source):
+            raise OSError(errno.EXDEV, 'Invalid cross-device link')
+        return real_replace(src, dst)
+    monkeypatch.setattr(offline_cache.os, 'replace', replace)
+
+    digest = cache.store(source, cache.bundles_dir / 'repo.bundle')
+    assert not source.exists()
+    assert cache.blob_path(digest).read_bytes() == b'bundle'
+    assert os.listdir(cache.blob_path(digest).parent) == [digest]
+
+
+def test_verify_reports_what_is_missing(cache):
+    npm = server('@scope/pkg', InstallMethod.NPM)
+    assert '尚未預取' in cache.verify('pkg', npm)
+
+    tarball = 'npm/_cacache/content-v2/sha512/ab/cd/ef'
+    cache._record('pkg', npm, [], [tarball])
+    assert '1 個檔案' in cache.verify('pkg', npm)
+    (cache.root / tarball).parent.mkdir(parents=True)
+    (cache.root / tarball).write_bytes(b'tgz')
+    assert cache.verify('pkg', npm) is None
+
+    assert '配置已變更' in cache.verify('pkg', server('@scope/other', InstallMethod.NPM))
+
+
+def test_manifest_round_trip(cache):
+    cache._record('pkg', server('pkg', InstallMethod.NPM), ['b', 'a', 'a'], [])
+    cache.save()
+    reloaded = PackageCache(cache.root)
+    assert reloaded.manifest['servers']['pkg']['blobs'] == ['a', 'b']
+    (cache.root / 'manifest.json').write_text('{"format": "other"}')
+    assert PackageCache(cache.root).manifest['servers'] == {}
+
+
+def test_npm_tarballs_from_the_hidden_lockfile(cache, tmp_path):
+    integrity = 'sha512-' + base64.b64encode(hashlib.sha512(b'dep').digest()).decode()
+    modules = tmp_path / 'prefix' / 'lib' / 'node_modules'
+    modules.mkdir(parents=True)
+    (modules / '.package-lock.json').write_text(json.dumps({'packages': {
+        'node_modules/pkg': {'integrity': integrity},
+        'node_modules/linked': {'link': True},
+    }}))
+    assert cache._npm_tarballs(tmp_path / 'prefix') == [f'npm/_cacache/{cacache_content_path(integrity)}']
+
+
+def test_go_module_zips_follow_replacements(cache, tmp_path, monkeypatch):
+    output = '\n'.join([
+        '/tmp/bin/server: go1.22.0',
+        '\tpath\tgithub.com/Example/server',
+        '\tmod\tgithub.com/Example/server\tv1.0.0\th1:abc=',
+        '\tdep\tgolang.org/x/sys\tv0.1.0\th1:def=',
+        '\tdep\tgithub.com/old/lib\tv1.0.0',
+        '\t=>\tgithub.com/new/lib\tv1.2.0\th1:ghi=',
+        '\tdep\tgithub.com/local/lib\tv0.0.0',
+        '\t=>\t../lib\t(devel)',
+    ])
+    monkeypatch.setattr(offline_cache, '_capture', lambda cmd, env=None: (True, output, ''))
+    assert cache._go_module_zips(tmp_path / 'server') == [
+        'go/mod/cache/download/github.com/!example/server/@v/v1.0.0.zip',
+        'go/mod/cache/download/golang.org/x/sys/@v/v0.1.0.zip',
+        'go/mod/cache/download/github.com/new/lib/@v/v1.2.0.zip',
+    ]
+
+
+def test_pip_prefetch_stores_downloads(cache, monkeypatch):
+    def download(cmd, env=None):
+        dest = cmd[cmd.index('--dest') + 1]
+        for name in ('pkg-1.0-py3-none-any.whl', 'dep-2.0.tar.gz'):
+            with open(os.path.join(dest, name), 'w') as f:
+                f.write(name)
+        return True, ''
+    monkeypatch.setattr(offline_cache, '_run', download)
+
+    pip = server('pkg', InstallMethod.PIP)
+    ok, message = cache.prefetch('pkg', pip)
+    assert ok, message
+    assert sorted(os.listdir(cache.wheelhouse)) == ['dep-2.0.tar.gz', 'pkg-1.0-py3-none-any.whl']
+    assert len(cache.manifest['servers']['pkg']['blobs']) == 2
+    assert cache.verify('pkg', pip) is None
+    # Staging directories live under the cache root and are removed afterwards
+    assert sorted(os.listdir(cache.root)) == ['blobs', 'pip']
+
+
+def test_offline_options(cache):
+    assert cache.npm_options() == ['--offline', '--cache', str(cache.npm_cache)]
+    assert cache.pip_options() == ['--no-index', '--find-links', str(cache.wheelhouse)]
+    env = cache.go_env()
+    assert env['GOPROXY'] == f"file://{cache.go_modcache / 'cache' / 'download'}"
+    assert env['GOSUMDB'] == 'off'
@@ -0,0 +1,166 @@
+import argparse
+import io
+import pstats
+import sys
+import tracemalloc
+
+import pytest
+
+import profile_hooks
+from profiling import MemoryProfiler, _format_bytes, add_profile_arguments, collapse_pstats, run_profiled
+
+
+def test_disabled_profiler_is_a_no_op():
+    profiler = MemoryProfiler(enabled=False)
+    with profiler.stage('load'):
+        data = [0] * 1000
+    assert profiler.stages == []
+    assert not tracemalloc.is_tracing()
+    out = io.StringIO()
+    profiler.report(out)
+    assert out.getvalue() == ''
+    assert len(data) == 1000
+
+
+def test_stages_record_peak_and_net_memory():
+    profiler = MemoryProfiler(enabled=True)
+    kept = []
+    with profiler.stage('transient'):
+        scratch = bytearray(4 * 1024 * 1024)
+        del scratch
+    with profiler.stage('kept'):
+        kept.append(bytearray(2 * 1024 * 1024))
+
+    transient, held = profiler.stages
+    assert transient.name == 'transient'
+    assert transient.peak >= 4 * 1024 * 1024
+    assert transient.net < 1024 * 1024
+    assert held.net >= 2 * 1024 * 1024
+    assert held.top and held.top[0].size_diff >= 2 * 1024 * 1024
+    assert 'test_profiling.py' in held.top[0].traceback[0].filename
+
+    out = io.StringIO()
+    profiler.report(out)
+    report = out.getvalue()
+    assert 'MEMORY PROFILE' in report
+    assert '[kept] top allocation growth:' in report
+    assert 'Largest live allocation sites' in report
+    # The profiler started tracing, so the report stops it again
+    assert not tracemalloc.is_tracing()
+
+
+def test_stage_is_recorded_when_the_block_raises():
+    profiler = MemoryProfiler(enabled=True)
+    try:
+        with profiler.stage('broken'):
+            raise ValueError
+    except ValueError:
+        pass
+    profiler.stop()
+    assert [stage.name for stage in profiler.stages] == ['broken']
+
+
+def test_format_bytes():
+    assert _format_bytes(512) == '512 B'
+    assert _format_bytes(-2048) == '-2.0 KiB'
+    assert _format_bytes(3 * 1024 * 1024) == '3.0 MiB'
+    assert _format_bytes(5 * 1024 ** 3) == '5.0 GiB'
+
+
+def fibonacci(n):
+    return n if n < 2 else fibonacci(n - 1) + fibonacci(n - 2)
+
+
+def busy():
+    return fibonacci(18)
+
+
+def test_run_profiled_without_profile_flag_just_runs():
+    assert run_profiled(busy, argv=['--profile-top', '5']) == busy()
+    assert run_profiled(busy, argv=[]) == busy()
+
+
+def test_deterministic_profile_writes_pstats_and_collapsed_stacks(tmp_path, capsys):
+    prefix = str(tmp_path / 'out' / 'run')
+    assert run_profiled(busy, argv=['--profile', '--profile-output', prefix]) == busy()
+
+    stats = pstats.Stats(prefix + '.pstats')
+    assert any(name == 'fibonacci' for _, _, name in stats.stats)
+    lines = (tmp_path / 'out' / 'run.collapsed').read_text().splitlines()
+    stacks = dict(line.rsplit(' ', 1) for line in lines)
+    assert all(int(micros) > 0 for micros in stacks.values())
+    # Recursion is cut at the first repeated frame
+    label = f'fibonacci (test_profiling.py:{fibonacci.__code__.co_firstlineno})'
+    assert any(stack.endswith(label) for stack in stacks)
+    assert not any(stack.count('fibonacci') > 1 for stack in stacks)
+    assert 'pstats:' in capsys.readouterr().err
+
+
+def test_sampling_profile_writes_sampled_stacks(tmp_path):
+    prefix = str(tmp_path / 'run')
+
+    def slow():
+        return fibonacci(25)
+
+    run_profiled(slow, argv=['--profile', '--profile-mode', 'sampling', '--profile-interval', '1',
+                             '--profile-output', prefix])
+    lines = (tmp_path / 'run.sampled.collapsed').read_text().splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(' ', 1)
+        assert stack.startswith('MainThread;slow (test_profiling.py:')
+        assert int(count) > 0
+
+
+def test_collapsed_time_adds_up():
+    import cProfile
+    profiler = cProfile.Profile()
+    profiler.runcall(busy)
+    stats = pstats.Stats(profiler)
+    total = sum(collapse_pstats(stats).values())
+    cumulative = max(entry[3] for entry in stats.stats.values()) * 1e6
+    assert total == pytest.approx(cumulative, rel=0.05)
+
+
+def test_profile_arguments_are_registered_on_the_parser():
+    parser = argparse.ArgumentParser()
+    add_profile_arguments(parser)
+    args = parser.parse_args(['--profile', '--profile-mode', 'both', '--profile-top', '3'])
+    assert (args.profile, args.profile_mode, args.profile_top) == (True, 'both', 3)
+
+
+@pytest.fixture
+def hooks(monkeypatch):
+    """profile_hooks with a fresh module lookup and a settable command line"""
+    profile_hooks._profiling.cache_clear()
+    yield lambda *argv: monkeypatch.setattr('sys.argv', ['install_mcp_servers.py', *argv])
+    profile_hooks._profiling.cache_clear()
+
+
+def test_installer_hooks_stay_out_of_the_way_without_profile(hooks):
+    hooks('--jobs', '4')
+    parser = argparse.ArgumentParser()
+    profile_hooks.add_profile_arguments(parser)
+    assert '--profile' not in parser.format_help()
+    assert profile_hooks.run_profiled(busy) == busy()
+
+
+def test_installer_hooks_use_the_shared_profiler(hooks, tmp_path):
+    prefix = str(tmp_path / 'installer')
+    hooks('--profile', '--profile-output', prefix)
+    parser = argparse.ArgumentParser()
+    profile_hooks.add_profile_arguments(parser)
+    assert parser.parse_args(['--profile', '--profile-output', prefix]).profile
+    assert profile_hooks.run_profiled(busy) == busy()
+    assert (tmp_path / 'installer.pstats').exists()
+
+
+def test_installer_hooks_ignore_profile_without_the_shared_module(hooks, monkeypatch, capsys):
+    monkeypatch.setitem(sys.modules, 'profiling', None)
+    hooks('--profile', '--profile-top', '5')
+    parser = argparse.ArgumentParser()
+    profile_hooks.add_profile_arguments(parser)
+    assert parser.parse_args(['--profile', '--profile-top', '5']).profile
+    assert '--profile' not in parser.format_help()
+    assert profile_hooks.run_profiled(busy) == busy()
+    assert '已忽略 --profile 參數' in capsys.readouterr().err
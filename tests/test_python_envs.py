@@ -0,0 +1,144 @@
+import os
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from python_envs import DEFAULT_OPTIMIZE_LEVELS, ServerEnvironments, environment_paths, parse_optimize_levels
+
+pytestmark = pytest.mark.skipif(os.name == 'nt', reason='POSIX virtual environment layout')
+
+
+def make_wheel(directory, name, version, files, entry_points=None):
+    """Minimal wheel with the given {archive path: text} files"""
+    dist_info = f'{name}-{version}.dist-info'
+    files = dict(files)
+    files[f'{dist_info}/METADATA'] = f'Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n'
+    files[f'{dist_info}/WHEEL'] = 'Wheel-Version: 1.0\nRoot-Is-Purelib: true\nTag: py3-none-any\n'
+    if entry_points:
+        files[f'{dist_info}/entry_points.txt'] = entry_points
+    path = directory / f'{name}-{version}-py3-none-any.whl'
+    with zipfile.ZipFile(path, 'w') as archive:
+        for archive_path, text in sorted(files.items()):
+            archive.writestr(archive_path, text)
+    return path
+
+
+WHEELS = {
+    'mcp_server_demo': ('1.0', {
+        'mcp_server_demo/__init__.py': 'from shared_dep import VALUE\n\ndef main():\n    print("demo", VALUE)\n',
+        'mcp_server_demo-1.0.data/scripts/demo-tool': '#!python\nprint("tool")\n',
+        'mcp_server_demo-1.0.data/data/share/demo.txt': 'shared data\n',
+    }, '[console_scripts]\nmcp-server-demo = mcp_server_demo:main\n'),
+    'shared_dep': ('2.0', {'shared_dep/__init__.py': 'VALUE = 42\n'}, None),
+}
+
+
+class Runner:
+    """Answers `pip wheel` with prebuilt wheels and runs everything else for real"""
+
+    def __init__(self, fail_wheel=False):
+        self.fail_wheel = fail_wheel
+        self.calls = []
+
+    def __call__(self, cmd, phase, timeout):
+        self.calls.append((phase, cmd))
+        if cmd[1:4] == ['-m', 'pip', 'wheel']:
+            if self.fail_wheel:
+                return subprocess.CompletedProcess(cmd, 1, '', 'ERROR: No matching distribution found')
+            dest = Path(cmd[cmd.index('--wheel-dir') + 1])
+            for name, (version, files, entry_points) in WHEELS.items():
+                make_wheel(dest, name, version, files, entry_points)
+            return subprocess.CompletedProcess(cmd, 0, '', '')
+        return subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+
+
+@pytest.fixture
+def envs(tmp_path):
+    return ServerEnvironments(tmp_path / 'servers', tmp_path / 'wheels', runner=Runner())
+
+
+def test_server_gets_its_own_working_environment(envs):
+    ok, message = envs.install('demo', 'mcp-server-demo')
+    assert ok, message
+    paths = envs.paths('demo')
+    assert paths == environment_paths(envs.servers_dir / 'demo')
+
+    output = subprocess.run([str(paths.scripts / 'mcp-server-demo')], capture_output=True, text=True, check=True)
+    assert output.stdout == 'demo 42\n'
+    tool = paths.scripts / 'demo-tool'
+    assert tool.read_text().startswith(f'#!{paths.python}\n')
+    assert subprocess.run([str(tool)], capture_output=True, text=True, check=True).stdout == 'tool\n'
+    assert (paths.root / 'share' / 'demo.txt').read_text() == 'shared data\n'
+    assert (paths.site_packages / 'shared_dep-2.0.dist-info' / 'METADATA').exists()
+    # No pip in the environment
+    assert not list(paths.site_packages.glob('pip*'))
+
+
+def test_environments_share_unpacked_files(envs):
+    assert envs.install('one', 'mcp-server-demo')[0]
+    assert envs.install('two', 'mcp-server-demo')[0]
+    one = envs.paths('one').site_packages / 'shared_dep' / '__init__.py'
+    two = envs.paths('two').site_packages / 'shared_dep' / '__init__.py'
+    assert os.path.samefile(one, two)
+    assert len(list(envs.unpacked_dir.glob('*/*'))) == len(WHEELS)
+
+
+def test_failed_resolution_keeps_the_existing_environment(envs):
+    assert envs.install('demo', 'mcp-server-demo')[0]
+    envs.runner.fail_wheel = True
+    ok, message = envs.install('demo', 'mcp-server-demo==9')
+    assert not ok and 'No matching distribution' in message
+    assert (envs.paths('demo').scripts / 'mcp-server-demo').exists()
+
+
+def test_install_uses_the_offline_source_options(envs):
+    envs.install('demo', 'mcp-server-demo', ['--no-index', '--find-links', '/cache/wheelhouse'])
+    phase, cmd = envs.runner.calls[0]
+    assert phase == 'pip'
+    assert cmd[-4:] == ['--no-index', '--find-links', '/cache/wheelhouse', 'mcp-server-demo']
+    assert [phase for phase, _ in envs.runner.calls] == ['pip', 'venv']
+
+
+def test_parse_optimize_levels():
+    assert parse_optimize_levels(None) == DEFAULT_OPTIMIZE_LEVELS == [0]
+    assert parse_optimize_levels('0, 2,0') == [0, 2]
+    for text in ('3', '0,x', '-1'):
+        with pytest.raises(ValueError):
+            parse_optimize_levels(text)
+
+
+def test_compile_writes_bytecode_for_each_level(envs):
+    assert envs.install('demo', 'mcp-server-demo')[0]
+    ok, message = envs.compile('demo', [0, 2], workers=2)
+    assert ok, message
+    cache = envs.paths('demo').site_packages / 'shared_dep' / '__pycache__'
+    tag = sys.implementation.cache_tag
+    assert sorted(os.listdir(cache)) == sorted([f'__init__.{tag}.pyc', f'__init__.{tag}.opt-2.pyc'])
+    compile_calls = [cmd for phase, cmd in envs.runner.calls if phase == 'compile']
+    assert compile_calls[0][0] == str(envs.paths('demo').python)
+    assert compile_calls[1][1:3] == ['-O', '-O']
+
+
+def test_compile_reports_files_that_do_not_compile(envs):
+    assert envs.install('demo', 'mcp-server-demo')[0]
+    (envs.paths('demo').site_packages / 'template.py').write_text('def {{ name }}():\n')
+    ok, message = envs.compile('demo')
+    assert not ok
+    assert '等級 0' in message
+    # Everything else is still compiled
+    assert list((envs.paths('demo').site_packages / 'shared_dep' / '__pycache__').glob('*.pyc'))
+
+
+def test_install_all_precompiles_new_python_servers(installer, monkeypatch):
+    pip = [(key, server) for key, server in installer.servers.items()
+           if server.installation_method.value == 'pip'][:2]
+    (fresh_key, fresh), (cached_key, cached) = pip
+    installer.results.record(fresh.name, True)
+    installer.results.record_skipped(cached.name)
+    compiled = []
+    monkeypatch.setattr(installer.envs, 'compile', lambda key, levels: compiled.append((key, levels)) or (True, ''))
+    installer.precompile_environments(pip, [0, 1])
+    assert compiled == [(fresh_key, [0, 1])]
@@ -0,0 +1,101 @@
+import json
+import os
+
+import pytest
+
+from toolchain_probe import probe_toolchain
+
+pytestmark = pytest.mark.skipif(os.name == 'nt', reason='fake tools are shell scripts')
+
+
+@pytest.fixture
+def bin_dir(tmp_path, monkeypatch):
+    directory = tmp_path / 'bin'
+    directory.mkdir()
+    monkeypatch.setenv('PATH', str(directory))
+    return directory
+
+
+def tool(bin_dir, name, output, status=0):
+    """Fake executable that prints ``output`` and logs each run to <name>.runs"""
+    script = bin_dir / name
+    script.write_text(f'#!/bin/sh\necho run >> "{bin_dir}/{name}.runs"\necho "{output}"\nexit {status}\n')
+    script.chmod(0o755)
+    return script
+
+
+def runs(bin_dir, name):
+    path = bin_dir / f'{name}.runs'
+    return len(path.read_text().splitlines()) if path.exists() else 0
+
+
+TOOLS = {'Node.js': ['node', '--version'], 'Git': ['git', '--version'], 'Go': ['go', 'version']}
+
+
+def test_unchanged_tools_are_not_probed_again(bin_dir, tmp_path):
+    tool(bin_dir, 'node', 'v20.11.0')
+    tool(bin_dir, 'git', 'git version 2.43.0')
+    cache = tmp_path / 'toolchain.json'
+
+    first = probe_toolchain(TOOLS, cache)
+    assert list(first) == list(TOOLS)
+    assert first['Node.js'].version == 'v20.11.0' and not first['Node.js'].cached
+    assert first['Node.js'].path == str(bin_dir / 'node')
+    assert first['Go'].version is None and first['Go'].path is None
+
+    second = probe_toolchain(TOOLS, cache)
+    assert second['Node.js'].cached and second['Git'].cached
+    assert second['Git'].version == 'git version 2.43.0'
+    assert runs(bin_dir, 'node') == runs(bin_dir, 'git') == 1
+
+
+def test_only_changed_tools_are_probed_again(bin_dir, tmp_path):
+    tool(bin_dir, 'node', 'v20.11.0')
+    tool(bin_dir, 'git', 'git version 2.43.0')
+    cache = tmp_path / 'toolchain.json'
+    probe_toolchain(TOOLS, cache)
+
+    upgraded = tool(bin_dir, 'node', 'v22.1.0 (upgraded)')
+    os.utime(upgraded, ns=(1, 1))
+    result = probe_toolchain(TOOLS, cache)
+    assert result['Node.js'].version == 'v22.1.0 (upgraded)' and not result['Node.js'].cached
+    assert result['Git'].cached
+    assert runs(bin_dir, 'git') == 1
+
+    (bin_dir / 'git').unlink()
+    assert probe_toolchain(TOOLS, cache)['Git'].version is None
+
+
+def test_path_change_invalidates_the_cache(bin_dir, tmp_path, monkeypatch):
+    tool(bin_dir, 'node', 'v20.11.0')
+    cache = tmp_path / 'toolchain.json'
+    probe_toolchain(TOOLS, cache)
+    monkeypatch.setenv('PATH', f'{bin_dir}{os.pathsep}{tmp_path / "other"}')
+    assert not probe_toolchain(TOOLS, cache)['Node.js'].cached
+    assert runs(bin_dir, 'node') == 2
+
+
+def test_failed_probes_are_not_cached(bin_dir, tmp_path):
+    tool(bin_dir, 'go', 'go: broken install', status=2)
+    cache = tmp_path / 'toolchain.json'
+    assert probe_toolchain(TOOLS, cache)['Go'].version is None
+    assert 'Go' not in json.loads(cache.read_text())['tools']
+    probe_toolchain(TOOLS, cache)
+    assert runs(bin_dir, 'go') == 2
+
+
+def test_refresh_and_disabled_cache(bin_dir, tmp_path):
+    tool(bin_dir, 'node', 'v20.11.0')
+    cache = tmp_path / 'toolchain.json'
+    probe_toolchain(TOOLS, cache)
+    assert not probe_toolchain(TOOLS, cache, refresh=True)['Node.js'].cached
+    assert not probe_toolchain(TOOLS, None)['Node.js'].cached
+    assert runs(bin_dir, 'node') == 3
+
+
+def test_unreadable_cache_is_ignored(bin_dir, tmp_path):
+    tool(bin_dir, 'node', 'v20.11.0')
+    cache = tmp_path / 'toolchain.json'
+    cache.write_text('{"format": "mcp-toolchain", "version": 99, "tools": {}}')
+    assert probe_toolchain(TOOLS, cache)['Node.js'].version == 'v20.11.0'
+    assert json.loads(cache.read_text())['version'] == 1
@@ -0,0 +1,133 @@
+import random
+
+import pytest
+
+from trigram_index import (FIELD_DESCRIPTION, FIELD_NAME, TrigramIndex, _Pattern, edit_distance,
+                           max_distance_for, trigrams)
+
+
+def levenshtein(a, b):
+    """Textbook dynamic-programming edit distance, the reference for the bit-parallel kernel"""
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def random_word(rng, alphabet='abcde', max_length=12):
+    return ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, max_length)))
+
+
+def test_edit_distance_matches_dynamic_programming():
+    rng = random.Random(20240526)
+    for _ in range(2000):
+        a, b = random_word(rng), random_word(rng)
+        assert edit_distance(a, b) == levenshtein(a, b), (a, b)
+
+
+def test_edit_distance_beyond_a_machine_word():
+    rng = random.Random(7)
+    for _ in range(50):
+        a = random_word(rng, max_length=150)
+        b = random_word(rng, max_length=150)
+        assert edit_distance(a, b) == levenshtein(a, b)
+
+
+def test_prefix_distance_is_the_best_over_all_prefixes():
+    rng = random.Random(11)
+    for _ in range(500):
+        term = random_word(rng, max_length=8) or 'a'
+        text = random_word(rng, max_length=14)
+        _, best_prefix = _Pattern(term).distances(text)
+        assert best_prefix == min(levenshtein(term, text[:i]) for i in range(len(text) + 1))
+
+
+def test_known_distances():
+    assert edit_distance('postgress', 'postgres') == 1
+    assert edit_distance('kitten', 'sitting') == 3
+    assert edit_distance('', 'abc') == 3
+    assert edit_distance('same', 'same') == 0
+
+
+def test_trigrams_are_padded_and_distinct():
+    assert trigrams('aaa') == ['  a', ' aa', 'aaa', 'aa ']
+
+
+def test_typo_budget_grows_with_length():
+    assert [max_distance_for(term) for term in ('git', 'slack', 'github', 'postgresql')] == [0, 1, 2, 2]
+
+
+@pytest.fixture(scope='module')
+def index(servers):
+    return TrigramIndex.build(servers)
+
+
+def brute_force_terms(index, term, bound):
+    """Every vocabulary term within reach of ``term``, found without the trigram filter"""
+    prefix_bound = bound - 1 if len(term) >= 3 else -1
+    matches = {}
+    for term_id, candidate in enumerate(index.terms):
+        distance = levenshtein(term, candidate)
+        if abs(len(candidate) - len(term)) <= bound and distance <= bound:
+            matches[term_id] = (distance, 0)
+        elif prefix_bound >= 0 and len(candidate) > len(term):
+            prefix = min(levenshtein(term, candidate[:i]) for i in range(len(candidate) + 1))
+            if prefix <= prefix_bound:
+                matches[term_id] = (prefix, 1)
+    return matches
+
+
+def test_trigram_filter_loses_no_candidates(index):
+    rng = random.Random(3)
+    queries = []
+    for term in rng.sample(index.terms, 60):
+        chars = list(term)
+        for _ in range(rng.randint(0, 2)):
+            if chars:
+                chars[rng.randrange(len(chars))] = rng.choice('abcdefghijklmnopqrstuvwxyz')
+        queries.append(''.join(chars))
+    for query in queries:
+        bound = max_distance_for(query)
+        assert index.match_terms(query) == brute_force_terms(index, query, bound), query
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('postgress', 'postgresql'),
+    ('git hub', 'github'),
+    ('slak', 'slack'),
+    ('filesystem', 'filesystem'),
+])
+def test_typo_tolerant_search(index, query, expected):
+    hits = index.search(query, limit=3)
+    assert hits and hits[0].key == expected
+
+
+def test_name_matches_rank_above_description_matches(index):
+    hits = index.search('database', limit=20)
+    fields = [hit.field for hit in hits]
+    assert fields == sorted(fields)
+    assert {FIELD_NAME, FIELD_DESCRIPTION} >= set(fields)
+
+
+def test_limit_and_empty_queries(index):
+    assert len(index.search('server', limit=4)) <= 4
+    assert index.search('', limit=5) == []
+    assert index.search('???') == []
+    assert index.search('github', limit=0) == []
+
+
+def test_save_and_load_give_the_same_results(index, tmp_path):
+    path = tmp_path / 'trigram.json'
+    index.save(str(path))
+    loaded = TrigramIndex.load(str(path))
+    for query in ('postgress', 'git hub', 'browser automation', 'memory'):
+        assert loaded.search(query) == index.search(query)
+
+
+def test_rejects_other_formats():
+    with pytest.raises(ValueError):
+        TrigramIndex.from_dict({'format': 'other'})
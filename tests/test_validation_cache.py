@@ -0,0 +1,130 @@
+import json
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+import data_validation
+from catalog_columnar import encode_columnar
+from validation_cache import ValidationCache
+
+DATA_FILE = Path(__file__).resolve().parent.parent / 'data' / 'comprehensive_mcp_directory.json'
+
+
+class Counting:
+    """check_record/summarize pair that counts how often it runs"""
+
+    def __init__(self):
+        self.checked = []
+        self.summaries = 0
+
+    def check_record(self, key, server):
+        self.checked.append(key)
+        return {'name': server['name'], 'ok': bool(server.get('description'))}
+
+    def summarize(self, document, results):
+        self.summaries += 1
+        return {'total': len(results), 'bad': sorted(k for k, r in results.items() if not r['ok'])}
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / 'directory.json'
+    path.write_text(json.dumps({'servers': {
+        'a': {'name': 'A', 'description': 'first'},
+        'b': {'name': 'B', 'description': ''},
+        'c': {'name': 'C', 'description': 'third'},
+    }}))
+    return path
+
+
+def validate(cache, data_file, counting, ruleset='rules:1'):
+    return cache.validate(str(data_file), ruleset, counting.check_record, counting.summarize)
+
+
+def test_unchanged_file_returns_the_stored_report(tmp_path, data_file):
+    counting = Counting()
+    report, stats = validate(ValidationCache(str(tmp_path / 'cache.json')), data_file, counting)
+    assert report == {'total': 3, 'bad': ['b']}
+    assert (stats.file_hit, stats.records_checked, stats.records_reused) == (False, 3, 0)
+
+    # A new instance reads the cache back from disk
+    counting = Counting()
+    again, stats = validate(ValidationCache(str(tmp_path / 'cache.json')), data_file, counting)
+    assert again == report
+    assert stats.file_hit and stats.records_reused == 3
+    assert counting.checked == [] and counting.summaries == 0
+
+
+def test_changed_file_rechecks_only_changed_records(tmp_path, data_file):
+    cache = ValidationCache(str(tmp_path / 'cache.json'))
+    validate(cache, data_file, Counting())
+
+    document = json.loads(data_file.read_text())
+    document['servers']['b']['description'] = 'fixed'
+    document['servers']['d'] = {'name': 'D', 'description': ''}
+    data_file.write_text(json.dumps(document, indent=2))
+
+    counting = Counting()
+    report, stats = validate(cache, data_file, counting)
+    assert sorted(counting.checked) == ['b', 'd']
+    assert (stats.file_hit, stats.records_checked, stats.records_reused) == (False, 2, 2)
+    assert report == {'total': 4, 'bad': ['d']}
+
+
+def test_ruleset_change_invalidates_everything(tmp_path, data_file):
+    cache = ValidationCache(str(tmp_path / 'cache.json'))
+    validate(cache, data_file, Counting())
+    counting = Counting()
+    _, stats = validate(cache, data_file, counting, ruleset='rules:2')
+    assert stats.records_checked == 3 and not stats.file_hit
+
+
+def test_disabled_cache_never_writes(tmp_path, data_file):
+    cache = ValidationCache(str(tmp_path / 'cache.json'), enabled=False)
+    validate(cache, data_file, Counting())
+    _, stats = validate(cache, data_file, Counting())
+    assert stats.records_checked == 3
+    assert not (tmp_path / 'cache.json').exists()
+
+
+def test_incompatible_cache_file_is_ignored(tmp_path, data_file):
+    (tmp_path / 'cache.json').write_text('{"format": "something-else", "entries": {"x": 1}}')
+    _, stats = validate(ValidationCache(str(tmp_path / 'cache.json')), data_file, Counting())
+    assert stats.records_checked == 3
+
+
+def test_stages_wrap_load_and_field_checks(tmp_path, data_file):
+    seen = []
+
+    @contextmanager
+    def stage(name):
+        seen.append(name)
+        yield
+
+    cache = ValidationCache(str(tmp_path / 'cache.json'))
+    counting = Counting()
+    cache.validate(str(data_file), 'rules:1', counting.check_record, counting.summarize, stage=stage)
+    assert seen == ['load', 'field checks']
+    cache.validate(str(data_file), 'rules:1', counting.check_record, counting.summarize, stage=stage)
+    assert seen == ['load', 'field checks', 'load']
+
+
+def test_cached_report_matches_a_fresh_validation(tmp_path, capsys):
+    fresh = data_validation.validate_mcp_data(data_file=str(DATA_FILE))
+    cache = ValidationCache(str(tmp_path / 'cache.json'))
+    data_validation.validate_mcp_data(data_file=str(DATA_FILE), cache=cache)
+    cached = data_validation.validate_mcp_data(data_file=str(DATA_FILE), cache=cache)
+    assert cached == fresh
+    assert 'unchanged)' in capsys.readouterr().out
+
+
+def test_columnar_export_validates_like_the_row_export(tmp_path, directory):
+    columnar = tmp_path / 'columnar.json'
+    columnar.write_text(json.dumps(dict(directory, servers=encode_columnar(directory['servers']))))
+    cache = ValidationCache(enabled=False)
+    rows, _ = cache.validate(str(DATA_FILE), data_validation.RULESET,
+                             data_validation._check_record, data_validation._summarize)
+    columns, _ = cache.validate(str(columnar), data_validation.RULESET,
+                                data_validation._check_record, data_validation._summarize)
+    assert columns == rows